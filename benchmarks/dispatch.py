@@ -0,0 +1,68 @@
+"""
+Compares the per-command parsing overhead of the CLI's command parsers.
+
+  rebuild   - a new ArgumentParser per command (the original behaviour)
+  argparse  - one shared ArgumentParser, with shlex tokenizing
+  fast      - the table-driven parser in src.command_parser
+
+Usage:
+    python -m benchmarks.dispatch [--rounds 2000]
+"""
+from argparse import ArgumentParser
+from shlex import split as shlex_split
+from time import perf_counter_ns
+
+from src import cli
+from src.command_parser import parse_fast
+
+COMMANDS = [
+    "ls -R",
+    "ls --sort --limit 10",
+    "pwd -R",
+    "cd logs",
+    "mkdir a/b/c",
+    "touch logs/app.log --content started",
+    "write logs/app.log --content 'one more line' --overwrite",
+    "read logs/app.log --offset 4",
+    "size logs",
+    "del tmp -R",
+]
+
+PARSERS = {
+    'rebuild': lambda command: cli.build_parser().parse_args(shlex_split(command)),
+    'argparse': cli.parse_arguments,
+    'fast': parse_fast,
+}
+
+
+def run(rounds: int) -> dict:
+    """
+    Parses every command in COMMANDS rounds times with each parser.
+
+    Returns:
+        dict: Mean microseconds per command, keyed by parser name.
+    """
+    results = {}
+    for name, parse in PARSERS.items():
+        count = rounds // 20 if name == 'rebuild' else rounds  # Rebuilding is slow; sample it less
+        start = perf_counter_ns()
+        for _ in range(max(1, count)):
+            for command in COMMANDS:
+                parse(command)
+        results[name] = (perf_counter_ns() - start) / (max(1, count) * len(COMMANDS)) / 1000
+    return results
+
+
+def main(argv: list = None) -> None:
+    parser = ArgumentParser(description="Per-command overhead of the CLI command parsers")
+    parser.add_argument('--rounds', type=int, default=2000, help='Passes over the command mix')
+    args = parser.parse_args(argv)
+
+    results = run(args.rounds)
+    for name, per_command in results.items():
+        speedup = results['argparse'] / per_command
+        print(f"{name:<9} {per_command:8.2f} us/command  ({speedup:5.1f}x vs argparse)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Reports the memory cost of tree nodes in bytes per node, for the object and
+array engines, and of sessions.
+
+Usage:
+    python -m benchmarks.memory [-n COUNT]
+"""
+import gc
+import tracemalloc
+from argparse import ArgumentParser
+
+from src.file_system.directory import Directory
+from src.file_system.file import File
+from src.file_system.filesystem import FileSystem
+from src.file_system.inode_table import KIND_DIRECTORY, KIND_FILE, InodeTable
+
+
+def measure(factory, count: int) -> float:
+    """
+    Adds count nodes built by factory to a fresh directory and returns the
+    traced allocation growth per node, including names and child index entries.
+
+    Args:
+        factory (callable): Builds a node from its index.
+        count (int): Number of nodes to create.
+
+    Returns:
+        float: Bytes allocated per node.
+    """
+    gc.collect()
+    tracemalloc.start()
+    root = Directory()
+    before, _ = tracemalloc.get_traced_memory()
+    for i in range(count):
+        root.add_child(factory(i))
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+def measure_table(kind: int, count: int) -> float:
+    """
+    Like measure(), for nodes of the given kind added to an InodeTable
+    (the array engine), including interned names and lookup entries.
+    """
+    gc.collect()
+    tracemalloc.start()
+    table = InodeTable()
+    root = table.allocate(KIND_DIRECTORY, "~")
+    before, _ = tracemalloc.get_traced_memory()
+    prefix = "file" if kind == KIND_FILE else "dir"
+    for i in range(count):
+        table.link(root, table.allocate(kind, f"{prefix}_{i}", '' if kind == KIND_FILE else None))
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+def measure_sessions(count: int) -> float:
+    """
+    Opens count sessions over one tree and returns the traced allocation growth per session.
+    """
+    fs = FileSystem()
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    sessions = [fs.open_session() for _ in range(count)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del sessions
+    return (after - before) / count
+
+
+def main():
+    parser = ArgumentParser(description="Report bytes per node for files and directories")
+    parser.add_argument('-n', '--count', type=int, default=100_000, help='Number of nodes to create per measurement')
+    args = parser.parse_args()
+
+    results = {
+        'File': measure(lambda i: File(f"file_{i}"), args.count),
+        'Directory': measure(lambda i: Directory(f"dir_{i}"), args.count),
+        'File (array)': measure_table(KIND_FILE, args.count),
+        'Directory (array)': measure_table(KIND_DIRECTORY, args.count),
+    }
+    for entity_type, per_node in results.items():
+        print(f"{entity_type:<18} {per_node:8.1f} bytes/node  ({args.count} nodes)")
+    print(f"{'Session':<18} {measure_sessions(args.count):8.1f} bytes/session  ({args.count} sessions)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Measures round-trip latency and pipelined throughput of the file system server.
+
+A server is started in a background thread on a Unix socket (or on the
+given TCP address) and a client times read/write requests one by one, then
+sends the same requests pipelined.
+
+Usage:
+    python -m benchmarks.server [--ops 10000] [--address 127.0.0.1:7070]
+"""
+import asyncio
+import os
+import tempfile
+import threading
+from argparse import ArgumentParser
+from time import perf_counter, perf_counter_ns
+
+from benchmarks.suite import summarize
+from src.client import Client
+from src.file_system.filesystem import FileSystem
+from src.server import FileSystemServer
+
+
+def start_server(fs: FileSystem, address: str):
+    """
+    Starts a server on its own event loop thread.
+
+    Returns:
+        (AbstractEventLoop, AbstractServer): The loop and the listening server.
+    """
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(FileSystemServer(fs).start(address))
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop, server
+
+
+def run(address: str, ops: int) -> dict:
+    """
+    Times sequential and pipelined requests against a fresh server.
+
+    Returns:
+        dict: Summaries keyed by "sequential/<op>" and "pipelined".
+    """
+    fs = FileSystem()
+    fs.mkdir("bench")
+    fs.touch("bench/f", content="x" * 100)
+    loop, server = start_server(fs, address)
+    results = {}
+    try:
+        with Client(address) as client:
+            for operation, arguments in (("read", {"path": "bench/f"}), ("write", {"path": "bench/f", "content": "y"})):
+                latencies = []
+                for _ in range(ops):
+                    start = perf_counter_ns()
+                    client.call(operation, **arguments)
+                    latencies.append(perf_counter_ns() - start)
+                results[f"sequential/{operation}"] = summarize(latencies)
+
+            requests = [("read", {"path": "bench/f", "length": 10})] * ops
+            start = perf_counter()
+            client.pipeline(requests)
+            elapsed = perf_counter() - start
+            results["pipelined"] = {'ops': ops, 'ops_per_sec': ops / elapsed}
+    finally:
+        loop.call_soon_threadsafe(server.close)
+    return results
+
+
+def main(argv: list = None) -> None:
+    parser = ArgumentParser(description="Latency and pipelined throughput of the file system server")
+    parser.add_argument('--ops', type=int, default=10_000, help='Requests per measurement')
+    parser.add_argument('--address', type=str, default=None, help='host:port to use instead of a temporary Unix socket')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        address = args.address or os.path.join(tmp, "bench.sock")
+        results = run(address, args.ops)
+
+    for key, summary in results.items():
+        latency = f"  p50 {summary['p50_us']:8.1f} us  p99 {summary['p99_us']:8.1f} us" if 'p50_us' in summary else ""
+        print(f"{key:<18} {summary['ops_per_sec']:>12,.0f} ops/s{latency}")
+
+
+if __name__ == "__main__":
+    main()
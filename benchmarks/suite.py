@@ -0,0 +1,281 @@
+"""
+Times the core FileSystem operations across tree widths and depths.
+
+Each scenario builds a tree, then times every operation individually and
+reports ops/sec with p50/p99 latencies. Scenarios are run several times and
+the latencies of every run are pooled, so operations timed once per tree
+(ls -R, del -R) still get a few samples. As with timeit, the cyclic garbage
+collector is off while a scenario runs: a full collection over a tree of a
+million nodes would otherwise land in a few timed calls and dominate ops/sec.
+
+Results can be written as JSON and compared against a stored baseline; the
+run fails if any ops/sec figure drops more than the tolerance below it.
+A fixed calibration workload is timed before every run of a scenario and
+stored with its results, and baseline figures are scaled by the ratio of
+the two calibrations before comparing. This absorbs most of the drift of a
+shared or throttled machine, within a run as well as between runs, but only
+roughly a different machine: regenerate the baseline (--save-baseline) on
+the machine that runs the gate. Operations with fewer than MIN_GATED_OPS samples
+are reported but never gated, as single timings are mostly noise, and a
+regression only fails the run if it reproduces when its scenario is run
+again (see confirm).
+
+Usage:
+    python -m benchmarks.suite [--widths 1000 10000 100000 1000000] [--depths 10 100 1000]
+                               [--repeat 3] [--output results.json] [--baseline benchmarks/baseline.json]
+                               [--tolerance 0.25] [--save-baseline]
+"""
+import gc
+import json
+import random
+import sys
+from argparse import ArgumentParser
+from time import perf_counter_ns
+
+from src.file_system.filesystem import FileSystem
+from src.file_system.path_resolver import PathResolver
+
+DEFAULT_WIDTHS = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+DEFAULT_DEPTHS = [10, 100, 1000]
+DEFAULT_BASELINE = "benchmarks/baseline.json"
+DEFAULT_REPEAT = 3  # Runs of every scenario, pooled
+SAMPLE_OPS = 1000  # Timed operations per scenario for depth runs and per-path ops
+LISTINGS = 5  # Timed ls -R calls per run
+MIN_GATED_OPS = 10  # Results with fewer samples are not compared against the baseline
+CALIBRATION_ROUNDS = 2  # Rounds of the calibration workload timed before each run of a scenario
+
+
+def summarize(latencies_ns: list) -> dict:
+    """
+    Reduces per-operation latencies to ops/sec and percentiles.
+
+    Args:
+        latencies_ns (list): Latency of each operation in nanoseconds.
+
+    Returns:
+        dict: ops, ops_per_sec, p50_us and p99_us.
+    """
+    ordered = sorted(latencies_ns)
+    total = sum(ordered) or 1
+    percentile = lambda p: ordered[min(len(ordered) - 1, int(p * len(ordered)))] / 1000
+    return {
+        'ops': len(ordered),
+        'ops_per_sec': len(ordered) * 1e9 / total,
+        'p50_us': percentile(0.50),
+        'p99_us': percentile(0.99),
+    }
+
+
+def timed(operation, arguments) -> list:
+    """
+    Calls operation once per argument and returns each call's latency in nanoseconds.
+    """
+    latencies = []
+    for argument in arguments:
+        start = perf_counter_ns()
+        operation(argument)
+        latencies.append(perf_counter_ns() - start)
+    return latencies
+
+
+def calibrate(rounds: int = CALIBRATION_ROUNDS) -> dict:
+    """
+    Times a fixed workload of string formatting and dictionary operations,
+    the bulk of what the file system does, as a measure of this machine
+    and interpreter. Like the scenarios, it reports the mean over its rounds,
+    so a brief burst of speed does not raise what is expected of them.
+
+    Returns:
+        dict: ops and ops_per_sec of the workload.
+    """
+    keys = 100_000
+    start = perf_counter_ns()
+    for _ in range(rounds):
+        index = {}
+        for i in range(keys):
+            index[f"entry_{i}"] = i
+        for i in range(keys):
+            index.get(f"entry_{i}")
+    elapsed = perf_counter_ns() - start
+    return {'ops': 2 * keys * rounds, 'ops_per_sec': 2 * keys * rounds * 1e9 / elapsed}
+
+
+def run_scenario(shape: str, scale: int) -> dict:
+    """
+    Runs every operation against one tree shape.
+
+    "width" puts scale entries in a single directory; "depth" nests scale
+    directories and works on SAMPLE_OPS entries at the bottom.
+
+    Args:
+        shape (str): "width" or "depth".
+        scale (int): Directory width or tree depth.
+
+    Returns:
+        dict: Latencies in nanoseconds keyed by operation name.
+    """
+    fs = FileSystem()
+    if shape == "width":
+        base, count = "~/t", scale
+        fs.mkdir("t")
+    else:
+        base, count = "~/" + "/".join(f"d{i}" for i in range(scale)), SAMPLE_OPS
+        fs.mkdir(base[2:])
+
+    dirs = [f"{base}/dir_{i}" for i in range(count)]
+    files = [f"{base}/file_{i}" for i in range(count)]
+    sample = random.sample(files, min(count, SAMPLE_OPS))
+
+    fs.cd("~")
+    results = {
+        'mkdir': timed(lambda path: fs.mkdir(path[2:]), dirs),
+        'touch': timed(fs.touch, files),
+        'write': timed(lambda path: fs.write(path, content="record\n"), sample),
+        'read': timed(fs.read, sample),
+        'resolve': timed(lambda path: PathResolver.resolve(fs, path), sample),
+    }
+    fs.cd(base)
+    results['ls -R'] = timed(lambda _: sum(1 for _ in fs.iter_ls(recurse=True)), range(LISTINGS))
+    fs.cd("~")
+    results['del -R'] = timed(lambda path: fs.del_(path, recurse=True), ["~/t" if shape == "width" else "~/d0"])
+    fs.reclaim()
+    return results
+
+
+def measure(shape: str, scale: int, repeat: int = DEFAULT_REPEAT) -> dict:
+    """
+    Runs one scenario repeat times on a fresh tree and pools the latencies.
+
+    Returns:
+        dict: Summaries keyed by "operation/shape=scale", each with the mean
+            calibration ops/sec measured before its runs (see calibrate).
+    """
+    pooled, calibrations = {}, []
+    for _ in range(repeat):
+        gc.collect()  # The trees of earlier runs are cyclic
+        gc.disable()
+        try:
+            calibrations.append(calibrate()['ops_per_sec'])
+            timings = run_scenario(shape, scale)
+        finally:
+            gc.enable()
+        for operation, latencies in timings.items():
+            pooled.setdefault(operation, []).extend(latencies)
+    calibration = sum(calibrations) / len(calibrations)
+    results = {}
+    for operation, latencies in pooled.items():
+        key = f"{operation}/{shape}={scale}"
+        summary = results[key] = summarize(latencies)
+        summary['calibration'] = calibration
+        print(f"{key:<24} {summary['ops_per_sec']:>14,.0f} ops/s  "
+              f"p50 {summary['p50_us']:>10.1f}us  p99 {summary['p99_us']:>10.1f}us  "
+              f"({summary['ops']} ops)", flush=True)
+    return results
+
+
+def run(widths: list, depths: list, repeat: int = DEFAULT_REPEAT) -> dict:
+    """
+    Runs all scenarios (see measure).
+
+    Returns:
+        dict: Summaries keyed by "operation/shape=scale".
+    """
+    results = {}
+    for shape, scales in (("width", widths), ("depth", depths)):
+        for scale in scales:
+            results.update(measure(shape, scale, repeat))
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Finds results whose throughput regressed past the baseline.
+
+    Each baseline figure is first scaled by the ratio of the calibrations
+    stored with the two results, when both have one. Results with fewer
+    than MIN_GATED_OPS samples, in either run, are skipped.
+
+    Args:
+        results (dict): Current summaries.
+        baseline (dict): Stored summaries.
+        tolerance (float): Allowed fractional drop in ops/sec, e.g. 0.25.
+
+    Returns:
+        list: (key, expected ops/sec, current ops/sec) for each regression.
+    """
+    regressions = []
+    for key, summary in results.items():
+        expected = baseline.get(key)
+        if expected is None or min(summary['ops'], expected['ops']) < MIN_GATED_OPS:
+            continue
+        floor = expected['ops_per_sec']
+        if 'calibration' in summary and 'calibration' in expected:
+            floor *= summary['calibration'] / expected['calibration']
+        if summary['ops_per_sec'] < floor * (1 - tolerance):
+            regressions.append((key, floor, summary['ops_per_sec']))
+    return regressions
+
+
+def confirm(regressions: list, baseline: dict, tolerance: float, repeat: int = DEFAULT_REPEAT) -> list:
+    """
+    Runs the scenarios of regressed results again and keeps the regressions
+    that reproduce, so that a burst of load on the machine does not fail the run.
+
+    Args:
+        regressions (list): What compare returned.
+        baseline (dict): Stored summaries.
+        tolerance (float): Allowed fractional drop in ops/sec.
+        repeat (int, optional): Runs of every scenario, pooled.
+
+    Returns:
+        list: The regressions found again, with the figures of the second run.
+    """
+    flagged = {key for key, _, _ in regressions}
+    rerun = {}
+    for scenario in sorted({key.split('/', 1)[1] for key in flagged}):
+        shape, scale = scenario.split('=')
+        rerun.update(measure(shape, int(scale), repeat))
+    return [regression for regression in compare(rerun, baseline, tolerance) if regression[0] in flagged]
+
+
+def main(argv: list = None) -> int:
+    parser = ArgumentParser(description="FileSystem benchmark suite")
+    parser.add_argument('--widths', type=int, nargs='*', default=DEFAULT_WIDTHS, help='Directory widths to test')
+    parser.add_argument('--depths', type=int, nargs='*', default=DEFAULT_DEPTHS, help='Tree depths to test')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Runs of every scenario, pooled')
+    parser.add_argument('--output', type=str, default=None, help='Write results to this JSON file')
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE, help='Baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed fractional ops/sec drop')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline')
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * max(args.depths or [0])))
+    results = run(args.widths, args.depths, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as output:
+            json.dump(results, output, indent=2)
+        return 0
+
+    try:
+        with open(args.baseline) as stored:
+            baseline = json.load(stored)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}; skipping regression check")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} result(s) below the baseline; running their scenarios again to confirm", flush=True)
+        regressions = confirm(regressions, baseline, args.tolerance, args.repeat)
+    for key, expected, actual in regressions:
+        print(f"REGRESSION {key}: {actual:,.0f} ops/s vs {expected:,.0f} ops/s expected from the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""
+Stress-tests ConcurrentFileSystem from a thread pool and reports throughput.
+
+Two workloads run at each thread count:
+  disjoint  - every worker appends to and reads files, and adds directories, in its own subtree
+  shared    - every worker appends to its own file in one shared directory
+
+Afterwards every file size, directory size and file content is checked
+against what the workers wrote, so lost updates or torn appends fail the
+run. On a free-threaded CPython build the disjoint workload scales with the
+thread count; with the GIL it shows the cost of the locking instead.
+
+Usage:
+    python -m benchmarks.threads [--threads 1 2 4 8] [--ops 2000]
+"""
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from src.file_system.concurrent_filesystem import ConcurrentFileSystem
+
+DEFAULT_THREADS = [1, 2, 4, 8]
+FILES_PER_WORKER = 8
+PAYLOAD = "x" * 16
+
+
+def _disjoint_worker(fs: ConcurrentFileSystem, worker: int, ops: int) -> None:
+    base = f"~/w{worker}"
+    for i in range(ops):
+        path = f"{base}/f{i % FILES_PER_WORKER}"
+        fs.write(path, PAYLOAD)
+        fs.read(path)
+        if i % 64 == 0:
+            fs.size(base)
+            fs.mkdir(f"{base}/d{i}")
+
+
+def _shared_worker(fs: ConcurrentFileSystem, worker: int, ops: int) -> None:
+    path = f"~/shared/f{worker}"
+    for _ in range(ops):
+        fs.write(path, PAYLOAD)
+        fs.read(path)
+
+
+def _disjoint_setup(fs: ConcurrentFileSystem, workers: int) -> None:
+    for worker in range(workers):
+        fs.mkdir(f"w{worker}")
+        fs.touch(*(f"w{worker}/f{i}" for i in range(FILES_PER_WORKER)))
+
+
+def _shared_setup(fs: ConcurrentFileSystem, workers: int) -> None:
+    fs.mkdir("shared")
+    fs.touch(*(f"shared/f{worker}" for worker in range(workers)))
+
+
+def _disjoint_check(fs: ConcurrentFileSystem, workers: int, ops: int) -> list:
+    errors = []
+    per_file = [ops // FILES_PER_WORKER + (1 if i < ops % FILES_PER_WORKER else 0) for i in range(FILES_PER_WORKER)]
+    for worker in range(workers):
+        for i, writes in enumerate(per_file):
+            expected = PAYLOAD * writes
+            if fs.read(f"w{worker}/f{i}") != expected:
+                errors.append(f"w{worker}/f{i}: content mismatch")
+        if fs.size(f"w{worker}") != len(PAYLOAD) * ops:
+            errors.append(f"w{worker}: size {fs.size(f'w{worker}')} != {len(PAYLOAD) * ops}")
+    return errors
+
+
+def _shared_check(fs: ConcurrentFileSystem, workers: int, ops: int) -> list:
+    errors = []
+    for worker in range(workers):
+        if fs.read(f"shared/f{worker}") != PAYLOAD * ops:
+            errors.append(f"shared/f{worker}: content mismatch")
+    if fs.size("shared") != len(PAYLOAD) * ops * workers:
+        errors.append(f"shared: size {fs.size('shared')} != {len(PAYLOAD) * ops * workers}")
+    return errors
+
+
+WORKLOADS = {
+    'disjoint': (_disjoint_setup, _disjoint_worker, _disjoint_check),
+    'shared': (_shared_setup, _shared_worker, _shared_check),
+}
+
+
+def run_workload(name: str, workers: int, ops: int) -> dict:
+    """
+    Runs one workload with the given number of threads and verifies the result.
+
+    Args:
+        name (str): "disjoint" or "shared".
+        workers (int): Number of threads.
+        ops (int): Write/read pairs per thread.
+
+    Returns:
+        dict: threads, ops, ops_per_sec and the list of consistency errors.
+    """
+    setup, worker, check = WORKLOADS[name]
+    fs = ConcurrentFileSystem()
+    setup(fs, workers)
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in [pool.submit(worker, fs, index, ops) for index in range(workers)]:
+            future.result()
+    elapsed = perf_counter() - start
+    errors = check(fs, workers, ops)
+    if fs.get_size() != sum(fs.size(f"~/{child}") for child in _top_level(fs)):
+        errors.append("root size does not match its children")
+    total = 2 * ops * workers  # One write and one read per iteration
+    return {'threads': workers, 'ops': total, 'ops_per_sec': total / (elapsed or 1e-9), 'errors': errors}
+
+
+def _top_level(fs: ConcurrentFileSystem) -> list:
+    return [child.name for child in fs.root.iter_children()]
+
+
+def run(threads: list, ops: int) -> dict:
+    """
+    Runs every workload at every thread count and prints a table.
+
+    Returns:
+        dict: Results keyed by "<workload>/threads=<n>".
+    """
+    results = {}
+    for name in WORKLOADS:
+        for workers in threads:
+            result = run_workload(name, workers, ops)
+            results[f"{name}/threads={workers}"] = result
+            status = "ok" if not result['errors'] else f"{len(result['errors'])} ERRORS"
+            print(f"{name:<9} threads={workers:<3} {result['ops_per_sec']:>12,.0f} ops/s  {status}")
+    return results
+
+
+def main(argv: list = None) -> int:
+    parser = ArgumentParser(description="Multi-threaded throughput and consistency check for ConcurrentFileSystem")
+    parser.add_argument('--threads', type=int, nargs='+', default=DEFAULT_THREADS, help='Thread counts to run')
+    parser.add_argument('--ops', type=int, default=2000, help='Write/read pairs per thread')
+    args = parser.parse_args(argv)
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    results = run(args.threads, args.ops)
+    failed = [key for key, result in results.items() if result['errors']]
+    for key in failed:
+        for error in results[key]['errors']:
+            print(f"{key}: {error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
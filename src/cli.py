@@ -1,25 +1,54 @@
+import os
+import sys
+from contextlib import redirect_stdout
+from io import StringIO
+from time import perf_counter_ns
 from argparse import ArgumentError, ArgumentParser
 from shlex import split as shlex_split
 from src.file_system.filesystem import FileSystem
-from src.file_system.exceptions import FileSystemError
+from src.file_system.array_filesystem import ArrayFileSystem
+from src.file_system.journal import Journal
+from src.file_system.exceptions import FileSystemError, RemoteError
 from src.file_system.constants import COLOR_RED, COLOR_RESET
+from src.client import Client
+from src.command_parser import parse_fast
+from src.server import serve
 
-def parse_arguments(command: str = None):
-    """
-    Parses CLI arguments using argparse.
+_parser = None  # Built on first use and shared by every parse
 
-    Args:
-        command (str, optional): The command string to parse. If None, uses sys.argv.
+# Engine name -> file system class; both read and write the same images
+ENGINES = {
+    'object': FileSystem,
+    'array': ArrayFileSystem,
+}
+
+def build_parser() -> ArgumentParser:
+    """
+    Builds the argument parser with every command's subparser.
 
     Returns:
-        Namespace: Parsed arguments.
+        ArgumentParser: The parser.
     """
     parser = ArgumentParser(description="File System CLI")
+    parser.add_argument('--image', type=str, default=None, help='Load the file system from this image and save changes back to it')
+    parser.add_argument('--journal', type=str, default=None, help='Record changes in this write-ahead journal instead of rewriting the image')
+    parser.add_argument('--checkpoint-every', type=int, default=1000, help='Fold the journal into the image after this many operations')
+    parser.add_argument('--serve', type=str, default=None, metavar='ADDRESS', help='Serve the file system on host:port or a Unix socket path')
+    parser.add_argument('--connect', type=str, default=None, metavar='ADDRESS', help='Run commands on the server at host:port or a Unix socket path')
+    parser.add_argument('--script', type=str, default=None, metavar='FILE', help='Run the commands in FILE, one per line, then report timings')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='object', help='Storage engine for the tree (default: object)')
+    parser.add_argument('--search-budget', type=int, default=None, metavar='POSTINGS', help='Index file contents for grep, keeping up to this many postings')
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
 
     # ls command
     parser_ls = subparsers.add_parser('ls', help='List directory contents')
     parser_ls.add_argument('-R', '--recurse', action='store_true', help='Recursively list subdirectories')
+    parser_ls.add_argument('-s', '--sort', action='store_true', help='List entries in name order')
+    parser_ls.add_argument('--prefix', type=str, default=None, help='Only list entries whose name starts with this prefix')
+    parser_ls.add_argument('--after', type=str, default=None, help='Only list entries named after this one (for paging)')
+    parser_ls.add_argument('--limit', type=int, default=None, help='Maximum number of entries to list')
+    parser_ls.add_argument('--max-depth', type=int, default=None, help='Deepest level to list with -R')
+    parser_ls.add_argument('--max-entries', type=int, default=None, help='Stop listing after this many entries in total')
 
     # pwd command
     parser_pwd = subparsers.add_parser('pwd', help='Print present working directory')
@@ -37,6 +66,8 @@ def parse_arguments(command: str = None):
     # read command
     parser_read = subparsers.add_parser('read', help='Read file content')
     parser_read.add_argument('filename', type=str, help='Name of the file to read')
+    parser_read.add_argument('--offset', type=int, default=0, help='Offset to start reading from')
+    parser_read.add_argument('--length', type=int, default=None, help='Maximum number of characters to read')
 
     # mkdir command
     parser_mkdir = subparsers.add_parser('mkdir', help='Create one or more directories')
@@ -85,10 +116,58 @@ def parse_arguments(command: str = None):
         help='Name of the file or directory to get the size of'
     )
 
+    # du command
+    parser_du = subparsers.add_parser('du', help='Show the size of every entry in a directory')
+    parser_du.add_argument(
+        'path',
+        type=str,
+        nargs='?',
+        default='.',
+        help='Directory to report on (default: the current directory)'
+    )
+
+    # find command
+    parser_find = subparsers.add_parser('find', help='Find files and directories by name')
+    parser_find.add_argument(
+        'path',
+        type=str,
+        nargs='?',
+        default='.',
+        help='Directory to search (default: the current directory)'
+    )
+    parser_find.add_argument('-name', '--name', type=str, required=True, help='Name or glob pattern (*, ?, [...]) to match')
+
+    # grep command
+    parser_grep = subparsers.add_parser('grep', help='List the files whose content matches a query')
+    parser_grep.add_argument('query', type=str, help='Words that must all occur; "quoted phrases" and word* prefixes are allowed')
+    parser_grep.add_argument(
+        'path',
+        type=str,
+        nargs='?',
+        default='.',
+        help='Directory to search (default: the current directory)'
+    )
+
+    return parser
+
+def parse_arguments(command: str = None):
+    """
+    Parses CLI arguments using argparse. The parser is built once and reused.
+
+    Args:
+        command (str, optional): The command string to parse. If None, uses sys.argv.
+
+    Returns:
+        Namespace: Parsed arguments.
+    """
+    global _parser
+    if _parser is None:
+        _parser = build_parser()
+
     if command is not None:
-        args = parser.parse_args(shlex_split(command))  # Use shlex.split for consistent parsing
+        args = _parser.parse_args(shlex_split(command))  # Use shlex.split for consistent parsing
     else:
-        args = parser.parse_args()  # Use sys.argv for default behavior
+        args = _parser.parse_args()  # Use sys.argv for default behavior
 
     return args
 
@@ -105,48 +184,73 @@ def validate_touch_args(args):
     if len(args.files) > 1 and args.content:
         raise ArgumentError(None, "The --content option can only be used with a single file.")
 
-def execute_command(fs: FileSystem, args):
-    try:
-        if args.command == 'ls':
-            print(fs.ls(recurse=args.recurse))
-
-        elif args.command == 'pwd':
-            print(fs.pwd(recurse=args.recurse))
-
-        elif args.command == 'cd':
-            fs.cd(args.directory)  # No output, just execute the command
-
-        elif args.command == 'read':
-            content, _ = fs.read(args.filename)
-            return content
+def _run_ls(fs: FileSystem, args):
+    lines = fs.iter_ls(recurse=args.recurse, sort=args.sort, prefix=args.prefix, after=args.after,
+                       limit=args.limit, max_depth=args.max_depth, max_entries=args.max_entries)
+    sys.stdout.writelines(lines)  # Stream lines as the tree is walked
 
-        elif args.command == 'mkdir':
-            for directory in args.directories:
-                fs.mkdir(directory)  # No output, just execute the command
+def _run_read(fs: FileSystem, args):
+    for chunk in fs.read_chunks(args.filename, offset=args.offset, length=args.length):
+        sys.stdout.write(chunk)  # Stream the content instead of building one string
+    print()
 
-        elif args.command == 'touch':
-            if len(args.files) > 1 and args.content:
-                fs.root.raise_error(FileSystemError("The --content option can only be used with a single file."))
-            for file in args.files:
-                fs.touch(file, content=args.content)
+def _run_mkdir(fs: FileSystem, args):
+    for directory in args.directories:
+        fs.mkdir(directory)  # No output, just execute the command
 
-        elif args.command == 'write':
-            fs.write(args.file, content=args.content, overwrite=args.overwrite)
-
-        elif args.command == 'del':
-            fs.del_(args.name, recurse=args.recurse)
+def _run_touch(fs: FileSystem, args):
+    if len(args.files) > 1 and args.content:
+        fs.root.raise_error(FileSystemError("The --content option can only be used with a single file."))
+    for file in args.files:
+        fs.touch(file, content=args.content)
+
+# Command name -> handler(fs, args)
+COMMAND_HANDLERS = {
+    'ls': _run_ls,
+    'pwd': lambda fs, args: print(fs.pwd(recurse=args.recurse)),
+    'cd': lambda fs, args: fs.cd(args.directory),  # No output, just execute the command
+    'read': _run_read,
+    'mkdir': _run_mkdir,
+    'touch': _run_touch,
+    'write': lambda fs, args: fs.write(args.file, content=args.content, overwrite=args.overwrite),
+    'del': lambda fs, args: fs.del_(args.name, recurse=args.recurse),
+    'size': lambda fs, args: print(fs.size(args.name)),
+    'du': lambda fs, args: print(format_usage(fs.du(args.path))),
+    'find': lambda fs, args: sys.stdout.writelines(f"{path}\n" for path in fs.find(args.name, args.path)),
+    'grep': lambda fs, args: sys.stdout.writelines(f"{path}\n" for path in fs.search(args.query, args.path)),
+}
+
+def format_usage(usage: list) -> str:
+    """
+    Formats du() output as one "size<TAB>name" line per entry, like du(1).
+    """
+    return "\n".join(f"{size}\t{name}" for name, size in usage)
 
-        elif args.command == 'size':
-            print(fs.size(args.name))
-            
-        else:
-            return False # Unknown command
+def execute_command(fs: FileSystem, args):
+    handler = COMMAND_HANDLERS.get(args.command)
+    if handler is None:
+        return False  # Unknown command
+    try:
+        handler(fs, args)
     except FileSystemError as e:
         print(e) # Print the exception message
     except Exception as e:
         fs.root.raise_error(FileSystemError(f"Unknown error: {e}")) # Raise the error to the root directory
     finally:
         return True
+
+def parse_command(command: str):
+    """
+    Parses one interactive or batch command. Commands covered by the fast
+    table-driven parser skip argparse; --help and malformed commands fall back to it.
+
+    Args:
+        command (str): The command line.
+
+    Returns:
+        Namespace: Parsed arguments.
+    """
+    return parse_fast(command) or parse_arguments(command)
         
 
 def interactive_mode(fs: FileSystem, parser: ArgumentParser):
@@ -154,7 +258,7 @@ def interactive_mode(fs: FileSystem, parser: ArgumentParser):
     print("Type 'exit' to quit.")
 
     while True:
-        command = input(f"{fs.current.name}> ").strip()
+        command = input(f"{fs.pwd(recurse=False).strip()}> ").strip()
         if command.lower() == "exit":
             print("Goodbye!")
             break
@@ -163,7 +267,7 @@ def interactive_mode(fs: FileSystem, parser: ArgumentParser):
             continue
 
         try:
-            args = parse_arguments(command)  # Use the same parsing logic as non-interactive mode
+            args = parse_command(command)
             if not execute_command(fs, args):
                 print(f"Unknown or incomplete command '{command}'")
         except SystemExit:
@@ -173,16 +277,229 @@ def interactive_mode(fs: FileSystem, parser: ArgumentParser):
             print(f"Error: {e}")
 
 
+def to_request(args):
+    """
+    Converts parsed command arguments to a server request.
+
+    Args:
+        args: The parsed arguments.
+
+    Returns:
+        (str, dict) | None: The operation name and its arguments, or None for an unknown command.
+    """
+    if args.command == 'ls':
+        return 'ls', {'recurse': args.recurse, 'sort': args.sort, 'prefix': args.prefix, 'after': args.after,
+                      'limit': args.limit, 'max_depth': args.max_depth, 'max_entries': args.max_entries}
+    elif args.command == 'pwd':
+        return 'pwd', {'recurse': args.recurse}
+    elif args.command == 'cd':
+        return 'cd', {'path': args.directory}
+    elif args.command == 'read':
+        return 'read', {'path': args.filename, 'offset': args.offset, 'length': args.length}
+    elif args.command == 'mkdir':
+        return 'mkdir', {'paths': args.directories}
+    elif args.command == 'touch':
+        return 'touch', {'paths': args.files, 'content': args.content}
+    elif args.command == 'write':
+        return 'write', {'path': args.file, 'content': args.content, 'overwrite': args.overwrite}
+    elif args.command == 'del':
+        return 'del', {'path': args.name, 'recurse': args.recurse}
+    elif args.command == 'size':
+        return 'size', {'path': args.name}
+    elif args.command == 'du':
+        return 'du', {'path': args.path}
+    elif args.command == 'find':
+        return 'find', {'pattern': args.name, 'path': args.path}
+    elif args.command == 'grep':
+        return 'grep', {'query': args.query, 'path': args.path}
+    return None
+
+def execute_remote(client: Client, args) -> bool:
+    """
+    Runs a parsed command on a file system server and prints its output.
+
+    Returns:
+        bool: False for an unknown command.
+    """
+    request = to_request(args)
+    if request is None:
+        return False
+    if args.command == 'touch' and len(args.files) > 1 and args.content:
+        print(f"{COLOR_RED}[FileSystemError] The --content option can only be used with a single file.{COLOR_RESET}")
+        return True
+
+    operation, arguments = request
+    try:
+        output = client.call(operation, **arguments)
+    except RemoteError as e:
+        print(f"{COLOR_RED}{e}{COLOR_RESET}")
+        return True
+
+    if args.command == 'ls':
+        sys.stdout.write(output)
+    elif output or args.command == 'read':
+        print(output)
+    return True
+
+def remote_interactive_mode(client: Client):
+    print("Connected to the file system server. Type 'exit' to quit.")
+
+    while True:
+        command = input(f"{client.call('pwd', recurse=True)}> ").strip()
+        if command.lower() == "exit":
+            print("Goodbye!")
+            break
+
+        if not command:
+            continue
+
+        try:
+            args = parse_command(command)
+            if not execute_remote(client, args):
+                print(f"Unknown or incomplete command '{command}'")
+        except SystemExit:
+            print(f"Invalid command syntax: '{command}'")
+
+
+def batch_mode(lines, execute, report=None) -> dict:
+    """
+    Runs commands non-interactively, one per line, e.g. from a script or a pipe.
+
+    The parser is built once, output is collected and written in a single
+    flush at the end, and a timing report is written to report.
+    Blank lines and lines starting with '#' are skipped; 'exit' stops the run.
+
+    Args:
+        lines (Iterable[str]): The commands.
+        execute (callable): Runs one parsed command, e.g. execute_command bound to a file system.
+        report (TextIO, optional): Where to write the timing report. Defaults to stderr.
+
+    Returns:
+        dict: Timings: commands, total_ns, parse_ns, execute_ns and per_command
+        (command name -> [count, nanoseconds]).
+    """
+    stats = {'commands': 0, 'total_ns': 0, 'parse_ns': 0, 'execute_ns': 0, 'per_command': {}}
+    per_command = stats['per_command']
+    output = StringIO()
+    started = perf_counter_ns()
+    with redirect_stdout(output):
+        for line in lines:
+            command = line.strip()
+            if not command or command.startswith('#'):
+                continue
+            if command.lower() == "exit":
+                break
+
+            parse_start = perf_counter_ns()
+            try:
+                args = parse_command(command)
+            except SystemExit:
+                print(f"Invalid command syntax: '{command}'")
+                continue
+            execute_start = perf_counter_ns()
+            if args.command is None or not execute(args):
+                print(f"Unknown or incomplete command '{command}'")
+                continue  # Only commands that ran are timed
+            done = perf_counter_ns()
+
+            stats['commands'] += 1
+            stats['parse_ns'] += execute_start - parse_start
+            stats['execute_ns'] += done - execute_start
+            timing = per_command.setdefault(args.command, [0, 0])
+            timing[0] += 1
+            timing[1] += done - parse_start
+    stats['total_ns'] = perf_counter_ns() - started
+
+    sys.stdout.write(output.getvalue())  # One flush for the whole run
+    sys.stdout.flush()
+    print_batch_report(stats, report or sys.stderr)
+    return stats
+
+def print_batch_report(stats: dict, out) -> None:
+    """
+    Writes the timing report of a batch run.
+    """
+    commands = stats['commands']
+    mean = stats['total_ns'] / commands / 1000 if commands else 0
+    out.write(f"Ran {commands} commands in {stats['total_ns'] / 1e6:.1f} ms ({mean:.1f} us/command; "
+              f"parse {stats['parse_ns'] / 1e6:.1f} ms, execute {stats['execute_ns'] / 1e6:.1f} ms)\n")
+    for name, (count, elapsed) in sorted(stats['per_command'].items()):
+        out.write(f"  {name:<8} {count:>8} x {elapsed / count / 1000:10.1f} us\n")
+
+
+MUTATING_COMMANDS = {'mkdir', 'touch', 'write', 'del'}
+
+def script_lines(args):
+    """
+    Returns the commands to run in batch mode: the --script file, or stdin when
+    commands are piped in and none was given on the command line. Returns None otherwise.
+    """
+    if args.script:
+        with open(args.script) as script:
+            return script.readlines()
+    if not args.command and not sys.stdin.isatty():
+        return sys.stdin
+    return None
+
 def main():
-    fs = FileSystem()
     args = parse_arguments()
+    lines = script_lines(args)
+    if args.connect:
+        # Thin client: the server owns the tree, so no local state is loaded or saved
+        with Client(args.connect) as client:
+            if lines is not None:
+                batch_mode(lines, lambda command_args: execute_remote(client, command_args))
+            elif args.command:
+                execute_remote(client, args)
+            else:
+                remote_interactive_mode(client)
+        return
+
+    engine = ENGINES[args.engine]
+    for option, value in (('--journal', args.journal), ('--search-budget', args.search_budget)):
+        if value is not None and engine is not FileSystem:
+            print(f"{COLOR_RED}[FileSystemError] {option} is not supported by the {args.engine} engine{COLOR_RESET}")
+            return
+    options = {'search_budget': args.search_budget} if args.search_budget is not None else {}
+    if args.image and os.path.exists(args.image):
+        fs = engine.load(args.image, **options)
+    else:
+        fs = engine(**options)
+
+    journal = None
+    if args.journal:
+        journal = Journal(args.journal)
+        fs.attach_journal(journal, checkpoint_path=args.image, checkpoint_every=args.checkpoint_every if args.image else None)
 
     FileSystemError.__str__ = lambda self: f"{COLOR_RED}[{self.__class__.__name__}] {self.reason}{COLOR_RESET}"
 
-    if args.command:
+    if args.serve:
+        print(f"Serving the file system on {args.serve}")
+        try:
+            serve(fs, args.serve)
+        except FileSystemError as e:
+            print(e)
+            return
+        if args.image and journal:
+            fs.checkpoint(args.image)
+        elif args.image:
+            fs.save(args.image)
+    elif lines is None and args.command:
         execute_command(fs, args)
+        if args.image and not journal and args.command in MUTATING_COMMANDS:
+            fs.save(args.image)
     else:
-        interactive_mode(fs, parse_arguments)
+        if lines is not None:
+            batch_mode(lines, lambda command_args: execute_command(fs, command_args))
+        else:
+            interactive_mode(fs, parse_arguments)
+        if args.image and journal:
+            fs.checkpoint(args.image)
+        elif args.image:
+            fs.save(args.image)
+
+    if journal:
+        journal.close()
 
 if __name__ == "__main__":
     main()
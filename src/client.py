@@ -0,0 +1,101 @@
+"""
+Blocking client for the file system server (see src.server).
+"""
+import socket
+
+from src.file_system.exceptions import RemoteError
+from src.protocol import FRAME, STATUS_OK, encode_request, decode_response, parse_address
+
+
+class Client:
+    """
+    One connection to a file system server, with its own working directory.
+
+    Example:
+        with Client("/tmp/fs.sock") as client:
+            client.call("mkdir", paths=["logs"])
+            print(client.call("ls", recurse=True))
+    """
+    PIPELINE_WINDOW = 256  # Requests in flight before responses are read
+
+    def __init__(self, address: str, timeout: float = None):
+        """
+        Args:
+            address (str): "host:port" for TCP, or a Unix socket path.
+            timeout (float, optional): Socket timeout in seconds.
+        """
+        target = parse_address(address)
+        if isinstance(target, tuple):
+            self._sock = socket.create_connection(target, timeout=timeout)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(timeout)
+            self._sock.connect(target)
+        self._reader = self._sock.makefile('rb')
+
+    def call(self, operation: str, **arguments) -> str:
+        """
+        Runs one operation on the server.
+
+        Args:
+            operation (str): Operation name, e.g. "read".
+            **arguments: Keyword arguments of the operation.
+
+        Returns:
+            str: The output of the operation.
+
+        Raises:
+            RemoteError: If the server reports an error.
+        """
+        self._sock.sendall(encode_request(operation, **arguments))
+        status, text = self._receive()
+        if status != STATUS_OK:
+            raise RemoteError(text)
+        return text
+
+    def pipeline(self, requests) -> list:
+        """
+        Sends many requests without waiting for each response.
+
+        Args:
+            requests (Iterable[tuple[str, dict]]): (operation, arguments) pairs.
+
+        Returns:
+            list[tuple[int, str]]: (status, text) for each request, in order.
+        """
+        results = []
+        window = []
+        for operation, arguments in requests:
+            window.append(encode_request(operation, **arguments))
+            if len(window) == self.PIPELINE_WINDOW:
+                results.extend(self._exchange(window))
+                window = []
+        if window:
+            results.extend(self._exchange(window))
+        return results
+
+    def _exchange(self, frames: list) -> list:
+        # Bounding the window keeps both sides' socket buffers from filling up and blocking each other
+        self._sock.sendall(b"".join(frames))
+        return [self._receive() for _ in frames]
+
+    def _receive(self) -> tuple[int, str]:
+        header = self._reader.read(FRAME.size)
+        if len(header) < FRAME.size:
+            raise ConnectionError("server closed the connection")
+        (length,) = FRAME.unpack(header)
+        payload = self._reader.read(length)
+        if len(payload) < length:
+            raise ConnectionError("server closed the connection")
+        return decode_response(payload)
+
+    def close(self) -> None:
+        self._reader.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,115 @@
+"""
+Fast parser for interactive and batch commands.
+
+Commands are split once and looked up in COMMANDS, which lists each
+command's positional arguments and options. The result is the same
+Namespace that argparse produces for the command (see cli.build_parser).
+Anything the table does not cover, such as --help, abbreviated or combined
+options, or a malformed command, returns None so the caller can fall back
+to argparse, which also reports the error.
+"""
+from argparse import Namespace
+from shlex import split as shlex_split
+
+FLAG = 'flag'
+ONE = 'one'    # Exactly one positional value
+MANY = 'many'  # One or more positional values
+OPTIONAL = 'optional'  # Zero or one positional value, defaulting to defaults[dest]
+
+_QUOTING = frozenset('\'"\\')
+
+# Command name -> (positionals as (dest, arity), options as {token: (dest, type)}, defaults)
+_RECURSE = {'-R': ('recurse', FLAG), '--recurse': ('recurse', FLAG)}
+COMMANDS = {
+    'ls': ([], {**_RECURSE, '-s': ('sort', FLAG), '--sort': ('sort', FLAG), '--prefix': ('prefix', str),
+                '--after': ('after', str), '--limit': ('limit', int), '--max-depth': ('max_depth', int),
+                '--max-entries': ('max_entries', int)},
+           {'recurse': False, 'sort': False, 'prefix': None, 'after': None, 'limit': None, 'max_depth': None,
+            'max_entries': None}),
+    'pwd': ([], _RECURSE, {'recurse': False}),
+    'cd': ([('directory', ONE)], {}, {}),
+    'del': ([('name', ONE)], _RECURSE, {'recurse': False}),
+    'read': ([('filename', ONE)], {'--offset': ('offset', int), '--length': ('length', int)},
+             {'offset': 0, 'length': None}),
+    'mkdir': ([('directories', MANY)], {}, {}),
+    'touch': ([('files', MANY)], {'--content': ('content', str)}, {'content': ''}),
+    'write': ([('file', ONE)], {'--content': ('content', str), '--overwrite': ('overwrite', FLAG)},
+              {'content': None, 'overwrite': False}),
+    'size': ([('name', ONE)], {}, {}),
+    'du': ([('path', OPTIONAL)], {}, {'path': '.'}),
+    'find': ([('path', OPTIONAL)], {'-name': ('name', str), '--name': ('name', str)}, {'path': '.', 'name': None}),
+    'grep': ([('query', ONE), ('path', OPTIONAL)], {}, {'path': '.'}),
+}
+_REQUIRED = {'write': ('content',), 'find': ('name',)}
+
+
+def tokenize(command: str) -> list:
+    """
+    Splits a command into words, using shlex only when it contains quotes or escapes.
+    """
+    if _QUOTING.isdisjoint(command):
+        return command.split()
+    return shlex_split(command)
+
+
+def parse_fast(command: str) -> Namespace | None:
+    """
+    Parses a command without argparse.
+
+    Args:
+        command (str): The command line, e.g. "write a.txt --content hi".
+
+    Returns:
+        Namespace | None: The parsed arguments, or None if the command needs argparse.
+    """
+    try:
+        words = tokenize(command)
+    except ValueError:
+        return None  # Unbalanced quotes
+    if not words:
+        return None
+    spec = COMMANDS.get(words[0])
+    if spec is None:
+        return None
+    positionals, options, defaults = spec
+
+    values = dict(defaults)
+    values['command'] = words[0]
+    rest = []
+    index, count = 1, len(words)
+    while index < count:
+        word = words[index]
+        if word[0] == '-' and len(word) > 1:
+            option = options.get(word)
+            if option is None:
+                return None  # --help, --opt=value, -Rs, abbreviations, unknown options
+            dest, kind = option
+            if kind is FLAG:
+                values[dest] = True
+            else:
+                index += 1
+                if index == count or words[index].startswith('-'):
+                    return None
+                try:
+                    values[dest] = kind(words[index])
+                except ValueError:
+                    return None
+        else:
+            rest.append(word)
+        index += 1
+
+    for dest, arity in positionals:
+        if not rest:
+            if arity is OPTIONAL:
+                continue
+            return None
+        if arity is MANY:
+            values[dest], rest = rest, []
+        else:
+            values[dest] = rest.pop(0)
+    if rest:
+        return None
+    for dest in _REQUIRED.get(words[0], ()):
+        if values[dest] is None:
+            return None
+    return Namespace(**values)
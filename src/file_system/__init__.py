@@ -2,7 +2,10 @@ from .constants import PATH_DELIMITER, PREFIX_DIRECTORY, PREFIX_FILE, ROOT, TREE
 from .directory import Directory
 from .file import File
 from .filesystem import FileSystem
+from .concurrent_filesystem import ConcurrentFileSystem
+from .array_filesystem import ArrayFileSystem
 from .node import FSNode
+from .session import Session
 from .path_resolver import PathResolver
 from .validation import validate_name
 from .exceptions import FileSystemError, DuplicateNameError, NotADirectoryError, NotFoundError, NotADirectoryError
@@ -24,7 +27,10 @@ __all__ = [
     "Directory",
     "File",
     "FileSystem",
+    "ConcurrentFileSystem",
+    "ArrayFileSystem",
     "FSNode",
+    "Session",
     "PathResolver",
     "FileSystemError",
     "DuplicateNameError",
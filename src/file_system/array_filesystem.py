@@ -0,0 +1,494 @@
+import re
+import shutil
+import tempfile
+from collections import deque
+from fnmatch import translate
+from itertools import islice
+from time import time_ns
+from weakref import WeakSet
+
+from src.file_system.constants import (
+    PATH_DELIMITER,
+    PREFIX_DIRECTORY,
+    PREFIX_FILE,
+    ROOT
+)
+from src.file_system.exceptions import DuplicateNameError, FileSystemError, NotADirectoryError, NotFoundError
+from src.file_system.file import File
+from src.file_system.image import ENCODING, ERRORS, HEADER, MAGIC, NODE, VERSION, Image, atomic_output
+from src.file_system.inode_table import KIND_DIRECTORY, KIND_FILE, NONE, InodeTable
+from src.file_system.session import Session
+from src.file_system.text_index import matches, parse_query, tokenize
+from src.file_system.tree_renderer import iter_tree_lines
+from src.file_system.validation import validate_name
+
+ROOT_INODE = 0
+
+
+class ArrayFileSystem:
+    """
+    A FileSystem whose tree is stored in an InodeTable instead of node objects.
+
+    It offers the same operations with the same output and errors, and
+    reads and writes the same images, so either engine can open a tree
+    saved by the other. Paths resolve through the table's child lookup,
+    sizes roll up along the parent column, and listings and images walk
+    the sibling columns.
+
+    Sessions hold an inode as their working directory. Deleting a subtree
+    moves the sessions inside it to the parent of the deleted node, as its
+    inodes are reused. Snapshots, journaling, quotas, deduplication, cold
+    compression and host import are only available on FileSystem.
+    """
+    concurrent = False
+
+    def __init__(self, table: InodeTable = None):
+        """
+        Initializes the file system with a root directory.
+
+        Args:
+            table (InodeTable, optional): An existing table whose inode 0 is the root (see load).
+        """
+        if table is None:
+            table = InodeTable()
+            table.allocate(KIND_DIRECTORY, ROOT)
+        self.table = table
+        self.root = ROOT_INODE
+        self.session = Session(self.root)  # Used by operations called without a session
+        self.sessions = WeakSet([self.session])
+
+    @property
+    def current(self) -> int:
+        """
+        The working directory inode of the default session.
+        """
+        return self.session.cwd
+
+    @current.setter
+    def current(self, inode: int) -> None:
+        self.session.cwd = inode
+
+    def open_session(self, cwd: int = None) -> Session:
+        """
+        Creates a session over this tree with its own working directory.
+
+        Args:
+            cwd (int, optional): The initial working directory inode. Defaults to the root.
+
+        Returns:
+            Session: The new session.
+        """
+        session = Session(self.root if cwd is None else cwd)
+        self.sessions.add(session)
+        return session
+
+    def get_size(self) -> int:
+        """
+        Returns the total size of the file system.
+        """
+        return self.table.size[self.root]
+
+    def _name(self, inode: int) -> str:
+        return self.table.name_of(inode)
+
+    def _label(self, inode: int) -> str:
+        """
+        Returns the display name of a node, as str() does for node objects.
+        """
+        if self.table.kind[inode] == KIND_FILE:
+            return f"{PREFIX_FILE} {self._name(inode)}"
+        return (f"{PREFIX_DIRECTORY} " if self.table.parent[inode] != NONE else "") + self._name(inode)
+
+    def _resolve(self, path: str, session: Session = None) -> int:
+        """
+        Resolves a path to an inode, like PathResolver.resolve.
+
+        Raises:
+            NotFoundError: If the path does not exist.
+            NotADirectoryError: If a path component is not a directory.
+        """
+        table = self.table
+        current = self.root if path.startswith(ROOT) else (session or self.session).cwd
+        parts = path.split(PATH_DELIMITER)
+        for part in parts:
+            if part == "." or part == "":
+                continue
+            elif part == "..":
+                if table.parent[current] == NONE:
+                    raise NotFoundError(name="..", directory=ROOT)
+                current = table.parent[current]
+            elif part == ROOT:
+                current = self.root
+            else:
+                child = table.find(current, part)
+                if child == NONE:
+                    raise NotFoundError(name=part, directory=self._name(current))
+                if table.kind[child] == KIND_DIRECTORY:
+                    current = child
+                elif part == parts[-1]:
+                    return child
+                else:
+                    raise NotADirectoryError(name=part, directory=self._name(current))
+        return current
+
+    def _resolve_parent(self, path: str, session: Session = None) -> tuple[int, str]:
+        parts = path.split(PATH_DELIMITER)
+        parent_path = PATH_DELIMITER.join(parts[:-1])
+        parent = self._resolve(parent_path, session)
+        if self.table.kind[parent] != KIND_DIRECTORY:
+            raise NotADirectoryError(name=self._name(parent), directory=parent_path)
+        return parent, parts[-1]
+
+    def _resolve_file(self, path: str, session: Session = None) -> int:
+        target = self._resolve(path, session)
+        if self.table.kind[target] != KIND_FILE:
+            raise FileSystemError(f"Cannot read: '{path}' is not a valid file.")
+        return target
+
+    def ls(self, recurse: bool = False, sort: bool = False, prefix: str = None, after: str = None, limit: int = None,
+           max_depth: int = None, max_entries: int = None, session: Session = None) -> str:
+        """
+        Lists the contents of the current directory. Takes the same arguments as FileSystem.ls().
+        """
+        return "".join(self.iter_ls(recurse=recurse, sort=sort, prefix=prefix, after=after, limit=limit,
+                                    max_depth=max_depth, max_entries=max_entries, session=session))
+
+    def iter_ls(self, recurse: bool = False, sort: bool = False, prefix: str = None, after: str = None, limit: int = None,
+                max_depth: int = None, max_entries: int = None, session: Session = None):
+        """
+        Streams the listing of the current directory line by line, like iter_tree_lines.
+
+        Returns:
+            Iterator[str]: Newline-terminated lines of the listing.
+        """
+        table = self.table
+        return iter_tree_lines((session or self.session).cwd, recurse=recurse, sort=sort, name_prefix=prefix,
+                               after=after, limit=limit, max_depth=max_depth, max_entries=max_entries,
+                               expand=self._iter_children, label=self._label,
+                               is_directory=lambda inode: table.kind[inode] == KIND_DIRECTORY,
+                               is_root=lambda inode: table.parent[inode] == NONE)
+
+    def _iter_children(self, directory: int, sort: bool = False, name_prefix: str = None, after: str = None,
+                       limit: int = None):
+        """
+        Iterates over child inodes like Directory.iter_children. Name-ordered
+        iteration goes through the table's ordered index of the directory, so
+        it costs as much as the children yielded once that index is built.
+        """
+        table = self.table
+        if not (sort or name_prefix or after is not None):
+            children = table.children(directory)
+        else:
+            ordered = table.ordered(directory)
+            children = map(ordered.get, ordered.iselect(name_prefix, after))
+        return children if limit is None else islice(children, limit)
+
+    def mkdir(self, *paths: str, session: Session = None) -> None:
+        """
+        Creates one or more directories, including parent directories if necessary.
+
+        Raises:
+            NotADirectoryError: If a path component is not a directory.
+            InvalidNameError: If a new directory name is invalid.
+        """
+        table = self.table
+        session = session or self.session
+        for path in paths:
+            current = session.cwd
+            for component in path.split(PATH_DELIMITER):
+                if not component:
+                    continue
+                if component == ROOT:
+                    current = self.root
+                    continue
+
+                child = table.find(current, component)
+                if child == NONE:
+                    validate_name("Directory", component)
+                    child = table.allocate(KIND_DIRECTORY, component)
+                    table.link(current, child)
+                elif table.kind[child] != KIND_DIRECTORY:
+                    raise NotADirectoryError(name=component, directory=self._name(current))
+                current = child
+
+    def read(self, path: str, offset: int = 0, length: int = None, session: Session = None) -> str:
+        """
+        Reads the content of a file, or a range of it.
+
+        Raises:
+            NotFoundError: If the file does not exist.
+            FileSystemError: If the path is not a file or the range is invalid.
+        """
+        target = self._resolve_file(path, session)
+        if offset == 0 and length is None:
+            return self.table.content(target)
+        self._validate_range(target, offset, length)
+        return self.table.content_store(target).read_range(offset, length)
+
+    def read_chunks(self, path: str, offset: int = 0, length: int = None, chunk_size: int = File.DEFAULT_CHUNK_SIZE,
+                    session: Session = None):
+        """
+        Streams the content of a file, or a range of it, in pieces of at most chunk_size.
+
+        Returns:
+            Iterator[str]: The content pieces, in order.
+        """
+        target = self._resolve_file(path, session)
+        self._validate_range(target, offset, length)
+        if chunk_size <= 0:
+            raise FileSystemError(f"Invalid chunk size {chunk_size} for '{self._name(target)}'.")
+        return self.table.content_store(target).iter_range(offset, length, chunk_size)
+
+    def _validate_range(self, inode: int, offset: int, length: int) -> None:
+        if offset < 0 or (length is not None and length < 0):
+            raise FileSystemError(f"Invalid range (offset={offset}, length={length}) for '{self._name(inode)}'.")
+
+    def touch(self, *paths: str, content: str = '', session: Session = None) -> None:
+        """
+        Creates one or more files, or overwrites the content of existing ones.
+
+        Raises:
+            NotADirectoryError: If a path component is not a directory.
+            DuplicateNameError: If a directory with the same name exists.
+        """
+        if not paths:
+            raise FileSystemError("touch: missing file operand")
+
+        table = self.table
+        for path in paths:
+            parent, file_name = self._resolve_parent(path, session)
+            existing = table.find(parent, file_name)
+            if existing != NONE:
+                if table.kind[existing] != KIND_FILE:
+                    raise DuplicateNameError(name=file_name, directory=self._name(parent))
+                self._set_content(existing, content)
+            else:
+                validate_name("File", file_name)
+                table.link(parent, table.allocate(KIND_FILE, file_name, content))
+
+    def _set_content(self, inode: int, content: str) -> None:
+        table = self.table
+        table.grow(inode, len(content) - table.size[inode])
+        table.contents[inode] = content
+        table.mtime[inode] = time_ns()
+
+    def pwd(self, recurse, session: Session = None) -> str:
+        cwd = (session or self.session).cwd
+        return self.table.path(cwd) if recurse else self._label(cwd)
+
+    def write(self, path: str, content: str, overwrite: bool = False, session: Session = None) -> None:
+        """
+        Writes to a file, appending unless overwrite is set.
+
+        Raises:
+            NotFoundError: If the file does not exist.
+            NotADirectoryError: If the path points to a directory instead of a file.
+        """
+        target = self._resolve(path, session)
+        if self.table.kind[target] != KIND_FILE:
+            raise NotADirectoryError(name=self._name(target), directory=self._name(self.current))
+        if overwrite:
+            self._set_content(target, content)
+        else:
+            self.table.append_content(target, content)
+            self.table.mtime[target] = time_ns()
+
+    def del_(self, path: str, recurse: bool = False, session: Session = None) -> None:
+        """
+        Deletes a file, or a directory with recurse.
+
+        Raises:
+            NotFoundError: If the path does not exist.
+            FileSystemError: If path is a directory and recurse is not set.
+        """
+        table = self.table
+        target = self._resolve(path, session)
+        if table.kind[target] == KIND_DIRECTORY and not recurse:
+            raise FileSystemError(f"Cannot delete: '{path}' is a directory. Use -R to delete directories.")
+
+        if target == self.root:
+            for child in list(table.children(target)):
+                self._delete(child)
+        else:
+            self._delete(target)
+
+    def _delete(self, inode: int) -> None:
+        table = self.table
+        parent = table.parent[inode]
+        if table.kind[inode] == KIND_DIRECTORY:
+            for session in self.sessions:
+                node = session.cwd
+                while node != NONE and node != inode:
+                    node = table.parent[node]
+                if node == inode:
+                    session.cwd = parent  # Its inodes are about to be reused
+        table.unlink(inode)
+        table.free(inode)
+
+    def cd(self, path: str, session: Session = None) -> bool:
+        """
+        Changes the working directory.
+
+        Raises:
+            NotFoundError: If the path does not exist.
+            NotADirectoryError: If the target is not a directory.
+        """
+        session = session or self.session
+        target = self._resolve(path, session)
+        if self.table.kind[target] != KIND_DIRECTORY:
+            raise NotADirectoryError(name=self._name(target), directory=self._name(session.cwd))
+        session.cwd = target
+        return True
+
+    def size(self, path: str, session: Session = None) -> int:
+        """
+        Returns the size of a file or directory, read from the size column.
+        """
+        return self.table.size[self._resolve(path, session)]
+
+    def du(self, path: str = '.', session: Session = None) -> list[tuple[str, int]]:
+        """
+        Reports the size of every child of a directory, like FileSystem.du.
+        """
+        table = self.table
+        target = self._resolve(path, session)
+        if table.kind[target] != KIND_DIRECTORY:
+            return [(self._name(target), table.size[target])]
+        usage = [(self._name(child) + (PATH_DELIMITER if table.kind[child] == KIND_DIRECTORY else ''), table.size[child])
+                 for child in self._iter_children(target, sort=True)]
+        usage.append((path, table.size[target]))
+        return usage
+
+    def find(self, pattern: str, path: str = '.', session: Session = None) -> list[str]:
+        """
+        Finds nodes by name like FileSystem.find. The table keeps no name index,
+        so the subtree is walked, matching each distinct name id once.
+        """
+        table = self.table
+        start = self._resolve(path, session)
+        if table.kind[start] != KIND_DIRECTORY:
+            raise NotADirectoryError(name=self._name(start), directory=path)
+        matches = re.compile(translate(pattern)).match
+        verdicts = {}  # Name id -> whether the name matches
+        found = []
+        candidates = [start] if start != self.root else []
+        stack = [start]
+        while stack:
+            children = list(table.children(stack.pop()))
+            candidates.extend(children)
+            stack.extend(child for child in children if table.kind[child] == KIND_DIRECTORY)
+        for inode in candidates:
+            name_id = table.name[inode]
+            hit = verdicts.get(name_id)
+            if hit is None:
+                hit = verdicts[name_id] = matches(table.name_of(inode)) is not None
+            if hit:
+                found.append(table.path(inode))
+        found.sort()
+        return found
+
+    def search(self, query: str, path: str = '.', session: Session = None) -> list[str]:
+        """
+        Finds files by content like FileSystem.search. The table keeps no content
+        index, so every file below path is read.
+        """
+        clauses = parse_query(query)
+        if not clauses:
+            raise FileSystemError(f"search: no words to search for in '{query}'")
+        table = self.table
+        start = self._resolve(path, session)
+        if table.kind[start] != KIND_DIRECTORY:
+            raise NotADirectoryError(name=self._name(start), directory=path)
+        found = []
+        stack = [start]
+        while stack:
+            for child in table.children(stack.pop()):
+                if table.kind[child] == KIND_DIRECTORY:
+                    stack.append(child)
+                elif matches(clauses, tokenize(table.content(child))):
+                    found.append(table.path(child))
+        found.sort()
+        return found
+
+    def snapshot(self):
+        raise FileSystemError("snapshot: not supported by the array engine")
+
+    def attach_journal(self, journal, checkpoint_path: str = None, checkpoint_every: int = None) -> int:
+        raise FileSystemError("journal: not supported by the array engine")
+
+    def save(self, path: str) -> None:
+        """
+        Writes the tree as an image (see file_system.image), walking the columns
+        breadth first so the children of every directory are contiguous.
+
+        Args:
+            path (str): Destination path.
+        """
+        table = self.table
+        kind, size, ctime, mtime, count = table.kind, table.size, table.ctime, table.mtime, table.count
+        records = bytearray()
+        names = bytearray()
+        with tempfile.TemporaryFile() as content, atomic_output(path) as output:
+            content_length = 0
+            next_index = 1
+            queue = deque([self.root])
+            while queue:
+                inode = queue.popleft()
+                name = self._name(inode).encode(ENCODING, ERRORS)
+                name_off = len(names)
+                names += name
+                if kind[inode] == KIND_DIRECTORY:
+                    record = (KIND_DIRECTORY, len(name), next_index, name_off, count[inode], 0, 0, size[inode],
+                              ctime[inode], mtime[inode])
+                    queue.extend(table.children(inode))
+                    next_index += count[inode]
+                else:
+                    data = table.content(inode).encode(ENCODING, ERRORS)
+                    content.write(data)
+                    record = (KIND_FILE, len(name), 0, name_off, 0, content_length, len(data), size[inode],
+                              ctime[inode], mtime[inode])
+                    content_length += len(data)
+                records += NODE.pack(*record)
+
+            node_count = len(records) // NODE.size
+            names_offset = HEADER.size + len(records)
+            output.write(HEADER.pack(MAGIC, VERSION, 0, node_count, names_offset, names_offset + len(names), 0))
+            output.write(records)
+            output.write(names)
+            content.seek(0)
+            shutil.copyfileobj(content, output)
+
+    @classmethod
+    def load(cls, path: str) -> "ArrayFileSystem":
+        """
+        Loads a tree from an image. Records are numbered breadth first and the
+        children of each directory are contiguous, so record i becomes inode i
+        and every column is filled in one pass, with the recorded sizes.
+
+        Args:
+            path (str): Path of the image file.
+
+        Returns:
+            ArrayFileSystem: The loaded file system.
+
+        Raises:
+            FileSystemError: If the file is not a valid image.
+        """
+        image = Image(path)
+        table = InodeTable()
+        try:
+            parents = [NONE]
+            for index in range(image.node_count):
+                kind, name_len, first_child, name_off, child_count, content_off, content_len, size, ctime, mtime = \
+                    image.record(index)
+                parent = parents[index]
+                name = image.name(name_off, name_len) if parent != NONE else ROOT
+                content = image.content(content_off, content_len) if kind == KIND_FILE else None
+                table.append_loaded(kind, name, parent, first_child if child_count else NONE, child_count, size,
+                                    ctime, mtime, content)
+                if kind == KIND_DIRECTORY:
+                    parents.extend([index] * child_count)
+        finally:
+            image.close()
+        return cls(table)
+
@@ -0,0 +1,156 @@
+from collections import deque
+from threading import Lock
+
+from src.file_system.content import ChunkedContent
+
+
+class BlobStore:
+    """
+    Content-addressed, refcounted pool of file contents.
+
+    Files whose contents are equal share one string (a blob) instead of each
+    holding a copy. Blobs are keyed by the content itself: a str caches its
+    hash, so a lookup hashes the content at most once and a hit is confirmed
+    by comparing it, which keeps hash collisions from ever merging different
+    contents. A blob is dropped when the last store referencing it lets go.
+
+    Sizes are in characters, the unit of File.size.
+
+    Stores that are garbage collected only queue their release: a finalizer
+    can run while this thread holds the lock, so the queue is drained by the
+    next call that takes it instead.
+    """
+    __slots__ = ('_blobs', '_lock', '_released', 'references', 'logical_size', 'stored_size')
+
+    def __init__(self):
+        self._blobs = {}  # content -> [shared content, reference count]
+        self._lock = Lock()
+        self._released = deque()  # Blobs of collected stores, awaiting release
+        self.references = 0
+        self.logical_size = 0  # Total size of every reference, as if nothing were shared
+        self.stored_size = 0  # Total size of the distinct blobs
+
+    def __len__(self):
+        with self._lock:
+            self._drain()
+            return len(self._blobs)
+
+    def acquire(self, content: str) -> str:
+        """
+        Adds a reference to the blob equal to content, creating it if needed.
+
+        Args:
+            content (str): The content to share.
+
+        Returns:
+            str: The shared blob, equal to content.
+        """
+        with self._lock:
+            self._drain()
+            entry = self._blobs.get(content)
+            if entry is None:
+                entry = self._blobs[content] = [content, 0]
+                self.stored_size += len(content)
+            entry[1] += 1
+            self.references += 1
+            self.logical_size += len(content)
+            return entry[0]
+
+    def release(self, blob: str) -> None:
+        """
+        Drops a reference taken by acquire, removing the blob after the last one.
+
+        Args:
+            blob (str): The blob returned by acquire.
+        """
+        with self._lock:
+            self._drain()
+            self._drop(blob)
+
+    def _drop(self, blob: str) -> None:
+        entry = self._blobs[blob]
+        entry[1] -= 1
+        self.references -= 1
+        self.logical_size -= len(blob)
+        if not entry[1]:
+            del self._blobs[blob]
+            self.stored_size -= len(blob)
+
+    def _drain(self) -> None:
+        released = self._released
+        while released:
+            self._drop(released.popleft())
+
+    def new_content(self, content: str = '') -> "SharedContent":
+        """
+        Returns a content store for a new file, sharing content through this pool.
+        """
+        return SharedContent(self, content)
+
+    def stats(self) -> dict:
+        """
+        Reports how much storage sharing saves.
+
+        Returns:
+            dict: blobs, references, logical_size, stored_size, saved (logical_size - stored_size)
+                and dedup_ratio (logical_size / stored_size, 1.0 when empty).
+        """
+        with self._lock:
+            self._drain()
+            logical, stored = self.logical_size, self.stored_size
+            return {
+                'blobs': len(self._blobs),
+                'references': self.references,
+                'logical_size': logical,
+                'stored_size': stored,
+                'saved': logical - stored,
+                'dedup_ratio': logical / stored if stored else 1.0,
+            }
+
+
+class SharedContent(ChunkedContent):
+    """
+    ChunkedContent whose whole-content values come from a BlobStore.
+
+    Replacing the content shares it through the pool. Blobs are immutable
+    strings, so writes copy on write: an append leaves the blob untouched,
+    adds its own chunk and releases the blob, since the content no longer
+    matches it. Copies made for snapshots share the blob and add a reference.
+    """
+    __slots__ = ('_pool', '_blob')
+
+    def __init__(self, pool: BlobStore, content: str = ''):
+        """
+        Args:
+            pool (BlobStore): The pool to share contents through.
+            content (str, optional): Initial content. Defaults to an empty string.
+        """
+        self._pool = pool
+        self._blob = pool.acquire(content) if content else None
+        super().__init__(self._blob or '')
+
+    def __del__(self):
+        if self._blob is not None:
+            self._pool._released.append(self._blob)  # Never takes the lock (see BlobStore)
+
+    def copy(self) -> "SharedContent":
+        clone = SharedContent.__new__(SharedContent)
+        clone._chunks = self._chunks[:]
+        clone._offsets = self._offsets[:]
+        clone._length = self._length
+        clone._pool = self._pool
+        clone._blob = self._pool.acquire(self._blob) if self._blob is not None else None
+        return clone
+
+    def append(self, data: str) -> None:
+        if data and self._blob is not None:
+            self._pool.release(self._blob)
+            self._blob = None
+        super().append(data)
+
+    def replace(self, content: str) -> None:
+        previous = self._blob
+        self._blob = self._pool.acquire(content) if content else None
+        if previous is not None:
+            self._pool.release(previous)
+        super().replace(self._blob or '')
@@ -0,0 +1,294 @@
+"""
+Compression of cold file content.
+
+A ColdTier sweeps the tree for files that have not been read or written
+for a while and compresses their content with zlib, in place: the file
+keeps its ColdContent store, which only holds the compressed bytes and
+the exact length, so sizes never need the content back.
+
+Reading a cold file decompresses it into a bounded LRU owned by the tier,
+so repeated reads of the same file do not pay zlib again, while the file
+itself stays compressed. Writing thaws it for good, until a later sweep
+finds it idle again. The LRU is bounded by the tier's budget, counted in
+characters of decompressed content.
+"""
+import zlib
+from collections import OrderedDict, deque
+from threading import Lock
+from time import perf_counter_ns, time_ns
+
+from src.file_system.content import ChunkedContent
+from src.file_system.directory import Directory
+from src.file_system.file import File
+
+DEFAULT_BUDGET = 64 * 1024 * 1024  # Characters of decompressed content kept in the LRU
+DEFAULT_IDLE = 300.0  # Seconds without a read or write before a file is cold
+MIN_SIZE = 4096  # Smaller contents gain too little to be worth a decompression
+LEVEL = 6
+ENCODING = 'utf-8'
+ERRORS = 'surrogatepass'  # Any str round-trips, including surrogate-escaped bytes
+
+
+class ColdTier:
+    """
+    Compresses idle file contents and caches decompressed ones under a budget.
+    """
+    __slots__ = ('_budget', 'idle', '_cache', '_cached_size', '_lock', '_collected', 'files', 'raw_bytes',
+                 'packed_bytes', 'compressions', 'decompressions', 'decompress_ns', 'hits')
+
+    def __init__(self, budget: int = DEFAULT_BUDGET, idle: float = DEFAULT_IDLE):
+        """
+        Args:
+            budget (int, optional): Characters of decompressed content to keep cached.
+            idle (float, optional): Seconds without a read or write after which a file is compressed.
+        """
+        self._budget = budget
+        self.idle = idle
+        self._cache = OrderedDict()  # ColdContent -> decompressed content, least recently used first
+        self._cached_size = 0
+        self._lock = Lock()
+        self._collected = deque()  # (raw, packed) of collected cold stores, counted out under the lock later
+        self.files = 0  # Files currently compressed
+        self.raw_bytes = 0  # Encoded size of their content
+        self.packed_bytes = 0  # Compressed size of their content
+        self.compressions = 0
+        self.decompressions = 0
+        self.decompress_ns = 0
+        self.hits = 0
+
+    @property
+    def budget(self) -> int:
+        """
+        Characters of decompressed content kept cached. Lowering it evicts at once.
+        """
+        return self._budget
+
+    @budget.setter
+    def budget(self, budget: int) -> None:
+        with self._lock:
+            self._budget = budget
+            self._evict()
+
+    def sweep(self, directory: Directory, idle: float = None, lock_of=None) -> int:
+        """
+        Compresses every file under directory that has been idle long enough.
+
+        Directories and files still waiting to be loaded from an image are
+        skipped, as their content is not in memory, and so are contents
+        shared through a BlobStore.
+
+        Args:
+            directory (Directory): The directory to sweep.
+            idle (float, optional): Seconds without a read or write, or None for the tier's default.
+            lock_of (callable, optional): Returns the RWLock to hold exclusively while a directory's files are compressed.
+
+        Returns:
+            int: The number of files compressed.
+        """
+        cutoff = time_ns() - int((self.idle if idle is None else idle) * 1e9)
+        compressed = 0
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            lock = lock_of(current) if lock_of is not None else None
+            if lock is not None:
+                lock.acquire(True)
+            try:
+                for child in current.iter_children():
+                    if getattr(child, '_image', None) is not None:
+                        continue
+                    if isinstance(child, Directory):
+                        stack.append(child)
+                    elif max(child.rtime, child.mtime) < cutoff and self.freeze(child):
+                        compressed += 1
+            finally:
+                if lock is not None:
+                    lock.release(True)
+        return compressed
+
+    def freeze(self, file: File) -> bool:
+        """
+        Compresses the content of one file.
+
+        Returns:
+            bool: True if the file was compressed, False if it is too small or not eligible.
+        """
+        store = file._store
+        if len(store) < MIN_SIZE:
+            return False
+        if type(store) is ChunkedContent:
+            store = file._store = ColdContent(self, store)
+        elif type(store) is not ColdContent or store._packed is not None:
+            return False
+        store.freeze()
+        return True
+
+    def content(self, store: "ColdContent") -> str:
+        """
+        Returns the decompressed content of a cold store, through the LRU.
+        """
+        with self._lock:
+            cache = self._cache
+            content = cache.get(store)
+            if content is not None:
+                cache.move_to_end(store)
+                self.hits += 1
+                return content
+
+        start = perf_counter_ns()
+        content = store.decompress()
+        elapsed = perf_counter_ns() - start
+
+        with self._lock:
+            self.decompressions += 1
+            self.decompress_ns += elapsed
+            if len(content) <= self._budget and store not in self._cache:
+                self._cache[store] = content
+                self._cached_size += len(content)
+                self._evict()
+        return content
+
+    def _evict(self) -> None:
+        cache = self._cache
+        while self._cached_size > self._budget and cache:
+            _, content = cache.popitem(last=False)
+            self._cached_size -= len(content)
+
+    def _packed(self, raw: int, packed: int, compressed: bool = True) -> None:
+        with self._lock:
+            self._drain()
+            self.files += 1
+            self.raw_bytes += raw
+            self.packed_bytes += packed
+            self.compressions += compressed
+
+    def _unpacked(self, store: "ColdContent", raw: int, packed: int) -> None:
+        with self._lock:
+            self._drain()
+            self._count_out(raw, packed)
+            content = self._cache.pop(store, None)
+            if content is not None:
+                self._cached_size -= len(content)
+
+    def _count_out(self, raw: int, packed: int) -> None:
+        self.files -= 1
+        self.raw_bytes -= raw
+        self.packed_bytes -= packed
+
+    def _drain(self) -> None:
+        collected = self._collected
+        while collected:
+            self._count_out(*collected.popleft())
+
+    def stats(self) -> dict:
+        """
+        Reports the state of the tier.
+
+        Returns:
+            dict: files, raw_bytes, packed_bytes, compression_ratio (raw / packed), compressions,
+                decompressions, mean_decompress_us, cache_hits, cached_size and budget.
+        """
+        with self._lock:
+            self._drain()
+            return {
+                'files': self.files,
+                'raw_bytes': self.raw_bytes,
+                'packed_bytes': self.packed_bytes,
+                'compression_ratio': self.raw_bytes / self.packed_bytes if self.packed_bytes else 1.0,
+                'compressions': self.compressions,
+                'decompressions': self.decompressions,
+                'mean_decompress_us': self.decompress_ns / self.decompressions / 1000 if self.decompressions else 0.0,
+                'cache_hits': self.hits,
+                'cached_size': self._cached_size,
+                'budget': self._budget,
+            }
+
+
+class ColdContent(ChunkedContent):
+    """
+    ChunkedContent that can be compressed in place.
+
+    While cold, _chunks is None and _packed holds the zlib-compressed
+    content; the length stays exact. Reads go through the tier's LRU and
+    leave the store cold; appends and replacements thaw it first.
+    """
+    __slots__ = ('_tier', '_packed', '_raw_bytes')
+
+    def __init__(self, tier: ColdTier, store: ChunkedContent):
+        """
+        Args:
+            tier (ColdTier): The tier that compressed the content.
+            store (ChunkedContent): The warm store to take the content from.
+        """
+        self._tier = tier
+        self._packed = None
+        self._raw_bytes = 0
+        self._chunks = store._chunks
+        self._offsets = store._offsets
+        self._length = store._length
+
+    def __del__(self):
+        # A finalizer may run while this thread holds the tier's lock, so it only queues the update
+        if self._packed is not None:
+            self._tier._collected.append((self._raw_bytes, len(self._packed)))
+
+    def freeze(self) -> None:
+        """
+        Compresses the content and drops the chunks.
+        """
+        raw = self.getvalue().encode(ENCODING, ERRORS)
+        self._packed = zlib.compress(raw, LEVEL)
+        self._raw_bytes = len(raw)
+        self._chunks = self._offsets = None
+        self._tier._packed(len(raw), len(self._packed))
+
+    def decompress(self) -> str:
+        packed = self._packed
+        if packed is None:  # Thawed in the meantime
+            return super().getvalue()
+        return zlib.decompress(packed).decode(ENCODING, ERRORS)
+
+    def thaw(self) -> None:
+        """
+        Restores the content as a single chunk, so it can be changed.
+        """
+        packed = self._packed
+        if packed is None:
+            return
+        content = self._tier.content(self)
+        self._tier._unpacked(self, self._raw_bytes, len(packed))
+        self._chunks = [content] if content else []
+        self._offsets = [0] if content else []
+        self._packed = None
+
+    def copy(self) -> "ColdContent":
+        clone = ColdContent.__new__(ColdContent)
+        clone._tier = self._tier
+        clone._length = self._length
+        clone._raw_bytes = self._raw_bytes
+        clone._packed = self._packed
+        if self._packed is None:
+            clone._chunks = self._chunks[:]
+            clone._offsets = self._offsets[:]
+        else:
+            clone._chunks = clone._offsets = None
+            self._tier._packed(self._raw_bytes, len(self._packed), compressed=False)  # Shares the bytes
+        return clone
+
+    def append(self, data: str) -> None:
+        self.thaw()
+        super().append(data)
+
+    def replace(self, content: str) -> None:
+        self.thaw()
+        super().replace(content)
+
+    def getvalue(self) -> str:
+        if self._packed is not None:
+            return self._tier.content(self)
+        return super().getvalue()
+
+    def iter_range(self, offset: int = 0, length: int = None, chunk_size: int = None):
+        if self._packed is not None:
+            return ChunkedContent(self._tier.content(self)).iter_range(offset, length, chunk_size)
+        return super().iter_range(offset, length, chunk_size)
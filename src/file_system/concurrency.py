@@ -0,0 +1,120 @@
+from threading import Condition, Lock
+
+
+class RWLock:
+    """
+    A reader/writer lock: any number of readers, or a single writer.
+
+    Writers are preferred, so once a writer is waiting new readers queue
+    behind it and a steady stream of readers cannot starve it. The lock is
+    not reentrant.
+    """
+    __slots__ = ('_cond', '_readers', '_writer', '_writers_waiting')
+
+    def __init__(self):
+        self._cond = Condition(Lock())
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    def acquire(self, exclusive: bool = False) -> None:
+        """
+        Blocks until the lock is held.
+
+        Args:
+            exclusive (bool): True to take the write lock, False for a shared read lock.
+        """
+        with self._cond:
+            if exclusive:
+                self._writers_waiting += 1
+                while self._writer or self._readers:
+                    self._cond.wait()
+                self._writers_waiting -= 1
+                self._writer = True
+            else:
+                while self._writer or self._writers_waiting:
+                    self._cond.wait()
+                self._readers += 1
+
+    def release(self, exclusive: bool = False) -> None:
+        """
+        Releases a lock taken with the same exclusive flag.
+
+        Args:
+            exclusive (bool): True to release the write lock, False for a read lock.
+        """
+        with self._cond:
+            if exclusive:
+                self._writer = False
+                self._cond.notify_all()
+            else:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+
+class SizeLocks:
+    """
+    Striped locks guarding the cached _size of nodes.
+
+    Size propagation walks upwards while directory locks are only taken
+    downwards, so ancestors are updated under these instead: each stripe is
+    held for a single addition and never together with another lock.
+    """
+    __slots__ = ('locks', 'mask')
+
+    def __init__(self, stripes: int = 64):
+        """
+        Args:
+            stripes (int, optional): Number of locks, a power of two. Defaults to 64.
+        """
+        self.locks = [Lock() for _ in range(stripes)]
+        self.mask = stripes - 1
+
+    def add(self, node, delta: int, limit: int = None) -> bool:
+        """
+        Adds delta to the cached size of node, unless that would take it over limit.
+
+        Returns:
+            bool: True if the size was changed.
+        """
+        with self.locks[hash(node) & self.mask]:
+            if limit is not None and node._size + delta > limit:
+                return False
+            node._size += delta
+            return True
+
+
+_create_lock = Lock()
+_load_lock = Lock()
+
+
+def lock_for(directory) -> RWLock:
+    """
+    Returns the lock of a directory, creating it on first use so
+    directories that are never shared between threads do not pay for one.
+
+    Args:
+        directory (Directory): The directory.
+
+    Returns:
+        RWLock: Its reader/writer lock.
+    """
+    lock = directory._lock
+    if lock is None:
+        with _create_lock:
+            lock = directory._lock
+            if lock is None:
+                lock = directory._lock = RWLock()
+    return lock
+
+
+def ensure_loaded(directory) -> None:
+    """
+    Creates the children of a lazily loaded directory (see file_system.image)
+    once, so readers sharing its lock never load them twice.
+    """
+    if not directory.children_loaded:
+        with _load_lock:
+            if not directory.children_loaded:
+                directory.children  # First access loads the children
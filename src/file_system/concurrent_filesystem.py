@@ -0,0 +1,327 @@
+from threading import Lock
+from src.file_system.constants import PATH_DELIMITER, ROOT
+from src.file_system.exceptions import FileSystemError, NotADirectoryError, NotFoundError, DuplicateNameError
+from src.file_system.directory import Directory
+from src.file_system.file import File
+from src.file_system.filesystem import FileSystem
+from src.file_system.path_resolver import PathResolver
+from src.file_system.tree_renderer import iter_tree_lines
+from src.file_system.concurrency import SizeLocks, lock_for, ensure_loaded
+from src.file_system.session import Session
+from src.file_system import journal as wal
+from src.file_system import host_tree
+from src.file_system import cold_tier
+from src.file_system.name_index import NameIndex
+from src.file_system.text_index import TextIndex
+
+
+class ConcurrentFileSystem(FileSystem):
+    """
+    A FileSystem that can be shared between threads.
+
+    Every directory has a reader/writer lock. Paths are resolved hand-over-hand
+    (see PathResolver.hold) and an operation then holds only the lock of the
+    directory it reads or changes: reads share it, while mkdir, touch, write
+    and del_ take it exclusively. Operations on disjoint subtrees therefore
+    run in parallel, and readers of a directory only wait for its writers.
+    Ancestor sizes are updated under striped locks owned by the tree's ledger (see SizeLocks).
+
+    Threads share the default working directory unless each passes its own
+    session (see FileSystem.open_session). The path cache is not used,
+    and snapshots and journaling are not supported, as both change nodes
+    outside the directory being locked.
+    """
+    concurrent = True
+
+    def __init__(self, deferred_sizes: bool = False, dedup: bool = False, cold_budget: int = None,
+                 cold_idle: float = cold_tier.DEFAULT_IDLE, search_budget: int = None):
+        """
+        Initializes the file system with a root directory.
+
+        Args:
+            deferred_sizes (bool, optional): If True, turn on deferred size accounting (see set_deferred_sizes).
+            dedup (bool, optional): If True, files with equal contents share one copy (see content_stats).
+            cold_budget (int, optional): If set, turn on compression of idle files (see compress_cold).
+            cold_idle (float, optional): Seconds without a read or write after which a file is compressed.
+            search_budget (int, optional): If set, index file contents for search (see FileSystem.search).
+        """
+        super().__init__(path_cache_size=0, deferred_sizes=deferred_sizes, dedup=dedup, cold_budget=cold_budget,
+                         cold_idle=cold_idle, search_budget=search_budget)
+        self._reclaim_lock = Lock()
+        self._names_lock = Lock()
+        self.ledger.size_locks = SizeLocks()  # Only this tree propagates sizes under locks
+
+    def snapshot(self):
+        self.current.raise_error(FileSystemError, "snapshot: not supported by a concurrent file system")
+
+    def attach_journal(self, journal: wal.Journal, checkpoint_path: str = None, checkpoint_every: int = None) -> int:
+        self.current.raise_error(FileSystemError, "journal: not supported by a concurrent file system")
+
+    def iter_ls(self, recurse: bool = False, sort: bool = False, prefix: str = None, after: str = None, limit: int = None,
+                max_depth: int = None, max_entries: int = None, session: Session = None):
+        """
+        Streams the listing of the current directory line by line. Takes the same arguments as ls().
+
+        The children of each directory are collected under its read lock when
+        it is reached, so every directory is listed as of a single moment.
+
+        Returns:
+            Iterator[str]: Newline-terminated lines of the listing.
+        """
+        return iter_tree_lines((session or self.session).cwd, recurse=recurse, sort=sort, name_prefix=prefix, after=after, limit=limit,
+                               max_depth=max_depth, max_entries=max_entries, expand=_locked_children)
+
+    def mkdir(self, *paths: str, session: Session = None) -> None:
+        """
+        Creates one or more directories, including parent directories if necessary.
+
+        Write locks are taken hand-over-hand along each path, so a directory
+        cannot be detached between finding and extending it.
+
+        Args:
+            *paths (str): One or more directory paths to create. Paths can be nested (e.g., "a/b/c").
+            session (Session, optional): Session whose working directory relative paths start from.
+
+        Raises:
+            NotADirectoryError: If a path component is not a directory.
+        """
+        self.reclaim(self.RECLAIM_BUDGET)
+        for path in paths:
+            current = self.root if path.startswith(ROOT) else (session or self.session).cwd
+            lock = lock_for(current)
+            lock.acquire(True)
+            try:
+                for component in path.split(PATH_DELIMITER):
+                    if not component:
+                        continue
+                    if component == ROOT:
+                        lock.release(True)
+                        current, lock = self.root, lock_for(self.root)
+                        lock.acquire(True)
+                        continue
+
+                    child = current.find_child(component)
+                    if child is None:
+                        child = Directory(component)
+                        current.add_child(child)
+                    elif not isinstance(child, Directory):
+                        current.raise_error(NotADirectoryError, name=component, directory=current.name)
+                    next_lock = lock_for(child)
+                    next_lock.acquire(True)
+                    lock.release(True)
+                    current, lock = child, next_lock
+            finally:
+                lock.release(True)
+
+    def read(self, path: str, offset: int = 0, length: int = None, session: Session = None) -> str:
+        with PathResolver.hold(self, path, session=session) as (directory, name):
+            target = self._file_in(directory, name, path)
+            if offset == 0 and length is None:
+                return target.read()[0]
+            return target.read_range(offset, length)
+
+    def read_chunks(self, path: str, offset: int = 0, length: int = None, chunk_size: int = File.DEFAULT_CHUNK_SIZE,
+                    session: Session = None):
+        with PathResolver.hold(self, path, session=session) as (directory, name):
+            # The pieces are views of the stored chunks, so collecting them is cheap
+            return iter(list(self._file_in(directory, name, path).iter_chunks(chunk_size, offset, length)))
+
+    def _file_in(self, directory: Directory, name: str, path: str) -> File:
+        target = directory.find_child(name)
+        if target is None:
+            directory.raise_error(NotFoundError, name=name, directory=directory.name)
+        if not isinstance(target, File):
+            self.current.raise_error(FileSystemError, f"Cannot read: '{path}' is not a valid file.")
+        return target
+
+    def touch(self, *paths: str, content: str = '', session: Session = None) -> None:
+        if not paths:
+            self.current.raise_error(FileSystemError, "touch: missing file operand")
+
+        self.reclaim(self.RECLAIM_BUDGET)
+        for path in paths:
+            with PathResolver.hold(self, path, exclusive=True, session=session) as (parent, file_name):
+                existing_file = parent.find_child(file_name)
+                if existing_file:
+                    if isinstance(existing_file, File):
+                        existing_file.write(content)
+                    else:
+                        self.current.raise_error(DuplicateNameError, name=file_name, directory=parent.name)
+                else:
+                    parent.add_child(File(name=file_name, content=content, blobs=self.blobs))
+
+    def write(self, path: str, content: str, overwrite: bool = False, session: Session = None) -> None:
+        self.reclaim(self.RECLAIM_BUDGET)
+        with PathResolver.hold(self, path, exclusive=True, session=session) as (parent, name):
+            target = parent.find_child(name)
+            if target is None:
+                parent.raise_error(NotFoundError, name=name, directory=parent.name)
+            if not isinstance(target, File):
+                self.current.raise_error(NotADirectoryError, name=target.name, directory=self.current.name)
+            if overwrite:
+                target.write(content)
+            else:
+                target.append(content)
+
+    def del_(self, path: str, recurse: bool = False, session: Session = None) -> None:
+        self.reclaim(self.RECLAIM_BUDGET)
+        with PathResolver.hold(self, path, exclusive=True, session=session) as (parent, name):
+            if name or parent.parent is None:
+                self._delete_in(parent, name, path, recurse)
+                return
+            # The path names a directory through ".." or "~"; its own parent must be locked instead
+            path = parent.get_absolute_path()
+        self.del_(path, recurse)
+
+    def _delete_in(self, parent: Directory, name: str, path: str, recurse: bool) -> None:
+        target = parent.find_child(name)
+        if target is None:
+            parent.raise_error(NotFoundError, name=name, directory=parent.name)
+
+        if isinstance(target, Directory):
+            if not recurse:
+                self.current.raise_error(FileSystemError, f"Cannot delete: '{path}' is a directory. Use -R to delete directories.")
+            if target is parent:
+                # The root itself stays, so detach each of its children instead
+                while target.count:
+                    child = next(target.children.values())
+                    target.remove_child(child.name)
+                    if isinstance(child, Directory):
+                        self._bury(child)
+            else:
+                parent.remove_child(name)
+                self._bury(target)
+        else:
+            parent.remove_child(name)
+
+    def reclaim(self, budget: int = None) -> int:
+        """
+        Tears down detached directories like FileSystem.reclaim, write-locking
+        each directory while unlinking its children, since a thread that
+        resolved a path before the delete may still be working inside it.
+        Only one thread reclaims at a time; the others skip the work.
+        """
+        if not self._graveyard or not self._reclaim_lock.acquire(blocking=False):
+            return 0
+        try:
+            released = 0
+            graveyard = self._graveyard
+            while graveyard and (budget is None or released < budget):
+                directory, epoch = graveyard[-1]
+                lock = lock_for(directory)
+                lock.acquire(True)
+                try:
+                    if not directory.children:
+                        graveyard.pop()
+                        continue
+                    child = next(directory.children.values())
+                    directory._unlink(child.name)
+                    if directory.names is not None:
+                        directory.names.discard(child)
+                    if directory.text is not None:
+                        directory.text.discard(child)
+                    if child.quota is not None:
+                        self.ledger.count_quotas(-1)
+                finally:
+                    lock.release(True)
+                if isinstance(child, Directory) and child.children_loaded and child.children:
+                    graveyard.append((child, epoch))
+                released += 1
+            return released
+        finally:
+            self._reclaim_lock.release()
+
+    def import_tree(self, host_path: str, path: str = '.', workers: int = host_tree.DEFAULT_WORKERS,
+                    session: Session = None) -> int:
+        """
+        Copies a real directory into path like FileSystem.import_tree. The host
+        tree is read before any lock is taken; only attaching it locks the target.
+        """
+        nodes, count = host_tree.read_tree(host_path, epoch=self.epoch, workers=workers, blobs=self.blobs)
+        with PathResolver.hold(self, path, exclusive=True, session=session) as (parent, name):
+            target = parent.find_child(name)
+            if target is None:
+                parent.raise_error(NotFoundError, name=name, directory=parent.name)
+            if not isinstance(target, Directory):
+                target.raise_error(NotADirectoryError, name=target.name, directory=path)
+            lock = lock_for(target) if target is not parent else None
+            if lock is not None:
+                lock.acquire(True)  # Below the held parent lock, so still top-down
+            try:
+                for node in nodes:
+                    if target.find_child(node.name) is not None:
+                        target.raise_error(DuplicateNameError, name=node.name, directory=target.name)
+                self._attach_all(target, nodes)
+            finally:
+                if lock is not None:
+                    lock.release(True)
+        return count
+
+    def export_tree(self, host_path: str, path: str = '.', workers: int = host_tree.DEFAULT_WORKERS,
+                    session: Session = None) -> int:
+        """
+        Writes path to a real directory like FileSystem.export_tree, reading
+        each directory under its read lock.
+        """
+        with PathResolver.hold(self, path, session=session) as (parent, name):
+            source = parent.find_child(name)
+            if source is None:
+                parent.raise_error(NotFoundError, name=name, directory=parent.name)
+        if not isinstance(source, Directory):
+            source.raise_error(NotADirectoryError, name=source.name, directory=path)
+        return host_tree.write_tree(source, host_path, workers=workers, lock_of=_loaded_lock)
+
+    def compress_cold(self, idle: float = None) -> int:
+        """
+        Compresses idle files like FileSystem.compress_cold, holding each
+        directory's write lock while its files are compressed.
+        """
+        if self.cold is None:
+            self.current.raise_error(FileSystemError, "compress: cold compression is not enabled")
+        return self.cold.sweep(self.root, idle, lock_of=_loaded_lock)
+
+    def _children(self, directory: Directory) -> list:
+        return _locked_children(directory, sort=True)
+
+    def _name_index(self) -> NameIndex:
+        """
+        Builds the name index once, read-locking each directory while it is
+        indexed so that children added meanwhile are indexed by add_child.
+        """
+        with self._names_lock:
+            if self.names is None:
+                names = NameIndex()
+                names.build(self.root, lock_of=_loaded_lock)
+                self.names = names
+            return self.names
+
+    def _text_index(self) -> TextIndex | None:
+        """
+        Builds the content index once, like _name_index.
+        """
+        with self._names_lock:
+            text = self.text
+            if text is not None and self.root.text is not text:
+                text.build(self.root, lock_of=_loaded_lock)
+            return text
+
+
+def _loaded_lock(directory: Directory):
+    """
+    Returns the lock of directory, loading lazily loaded children first.
+    """
+    ensure_loaded(directory)
+    return lock_for(directory)
+
+
+def _locked_children(directory: Directory, **filters) -> list:
+    """
+    Returns the children of directory, collected under its read lock.
+    """
+    lock = lock_for(directory)
+    lock.acquire()
+    try:
+        ensure_loaded(directory)
+        return list(directory.iter_children(**filters))
+    finally:
+        lock.release()
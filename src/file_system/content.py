@@ -0,0 +1,127 @@
+from bisect import bisect_right
+
+
+class ChunkedContent:
+    """
+    Append-friendly text storage for file content.
+
+    Appends are kept as a list of chunks and only joined when the whole
+    content is requested, so appending costs O(len(data)) instead of copying
+    everything written so far. The length is tracked incrementally, as is the
+    starting offset of every chunk so ranged reads can seek without joining.
+    """
+    __slots__ = ('_chunks', '_offsets', '_length')
+
+    COALESCE_LIMIT = 4096  # Small appends are merged into a tail chunk below this length
+
+    def __init__(self, content: str = ''):
+        """
+        Args:
+            content (str, optional): Initial content. Defaults to an empty string.
+        """
+        self._chunks = [content] if content else []
+        self._offsets = [0] if content else []
+        self._length = len(content)
+
+    def __len__(self):
+        return self._length
+
+    def copy(self) -> "ChunkedContent":
+        """
+        Returns an independent store sharing the same (immutable) chunk strings.
+        """
+        clone = ChunkedContent.__new__(ChunkedContent)
+        clone._chunks = self._chunks[:]
+        clone._offsets = self._offsets[:]
+        clone._length = self._length
+        return clone
+
+    def append(self, data: str) -> None:
+        """
+        Appends data without touching existing chunks.
+
+        Args:
+            data (str): The text to append.
+        """
+        if not data:
+            return
+        chunks = self._chunks
+        if chunks and len(chunks[-1]) + len(data) <= self.COALESCE_LIMIT:
+            chunks[-1] += data  # Bounded copy keeps tiny records from becoming one chunk each
+        else:
+            chunks.append(data)
+            self._offsets.append(self._length)
+        self._length += len(data)
+
+    def replace(self, content: str) -> None:
+        """
+        Replaces the whole content.
+
+        Args:
+            content (str): The new content.
+        """
+        self._chunks = [content] if content else []
+        self._offsets = [0] if content else []
+        self._length = len(content)
+
+    def getvalue(self) -> str:
+        """
+        Materializes the content. The chunks are left as they are, so concurrent
+        readers can keep iterating over them (see ConcurrentFileSystem).
+
+        Returns:
+            str: The full content.
+        """
+        chunks = self._chunks
+        if len(chunks) == 1:
+            return chunks[0]
+        return ''.join(chunks)
+
+    def iter_range(self, offset: int = 0, length: int = None, chunk_size: int = None):
+        """
+        Iterates over a range of the content without materializing it.
+
+        Stored chunks that fall entirely inside the range (and within
+        chunk_size) are yielded as-is, without copying.
+
+        Args:
+            offset (int, optional): Start offset. Defaults to 0.
+            length (int, optional): Maximum number of characters, or None for the rest.
+            chunk_size (int, optional): Maximum length of each yielded piece, or None for stored chunk boundaries.
+
+        Yields:
+            str: Consecutive pieces of the requested range.
+        """
+        end = self._length if length is None else min(self._length, offset + length)
+        if offset >= end:
+            return
+
+        chunks, offsets = self._chunks, self._offsets
+        i = bisect_right(offsets, offset) - 1
+        position = offset
+        while position < end:
+            chunk, start = chunks[i], offsets[i]
+            stop = min(len(chunk), end - start)
+            lo = position - start
+            if chunk_size is None:
+                yield chunk if lo == 0 and stop == len(chunk) else chunk[lo:stop]
+            else:
+                for piece_start in range(lo, stop, chunk_size):
+                    piece_stop = min(piece_start + chunk_size, stop)
+                    whole = piece_start == 0 and piece_stop == len(chunk)
+                    yield chunk if whole else chunk[piece_start:piece_stop]
+            position = start + stop
+            i += 1
+
+    def read_range(self, offset: int = 0, length: int = None) -> str:
+        """
+        Returns a range of the content, copying only the requested characters.
+
+        Args:
+            offset (int, optional): Start offset. Defaults to 0.
+            length (int, optional): Maximum number of characters, or None for the rest.
+
+        Returns:
+            str: The requested range, shorter if it runs past the end.
+        """
+        return ''.join(self.iter_range(offset, length))
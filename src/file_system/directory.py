@@ -1,25 +1,37 @@
 from src.file_system.constants import (
     PREFIX_DIRECTORY,
-    ROOT,
-    PATH_DELIMITER,
-    TREE_BRANCH,
-    TREE_LAST,
-    TREE_SPACE,
-    TREE_VERTICAL
+    ROOT
 )
 from src.file_system.exceptions import (
     DuplicateNameError,
-    NotFoundError
+    NotFoundError,
+    QuotaExceededError
 )
 from src.file_system.node import FSNode
 from src.file_system.file import File
-from src.file_system.linked_list import LinkedList
+from src.file_system.sorted_list import SortedMap
+from src.file_system.tree_renderer import iter_tree_lines
+from itertools import islice
 
 class Directory(FSNode):
+    __slots__ = ('children', '_index', 'ordered', 'count', 'generation', '_lock', 'quota', 'names', 'text', 'ledger',
+                 '_successor')
+
+    children_loaded = True  # Lazily loaded directories report False until their children exist
+
     def __init__(self, name: str = ROOT): 
         super().__init__(name)
-        self.children = LinkedList()
+        self.children = SortedMap()  # Maps a sequence number to each child, so children iterate in insertion order
+        self._index = {}  # Maps child name to child for O(1) lookup; handed on to the copy by cow_copy
+        self.ordered = SortedMap()  # Maps child names, in sorted order for ranged listing, to their sequence number
         self.count = 0  # Track the number of children
+        self.generation = 0  # Bumped on every change to the set of child names
+        self._lock = None  # Reader/writer lock, created on first use in concurrent mode
+        self.quota = None  # Quota limiting this subtree, if any (see FileSystem.set_quota)
+        self.names = None  # NameIndex of the tree, once one is built (see FileSystem.find)
+        self.text = None  # TextIndex of the tree, once one is built (see FileSystem.search)
+        self.ledger = None  # SizeLedger of the tree's file system, once attached to one
+        self._successor = None  # The copy that replaced this directory in the live tree (see cow_copy)
 
     def __str__(self):
         return (f"{PREFIX_DIRECTORY} " if self.parent else "") + super().__str__()
@@ -27,10 +39,11 @@ class Directory(FSNode):
     def find_child(self, name: str) -> FSNode | None:
         if name == '':
             return self
-        child = self.children.find(value=name, key=lambda x: x.name)
-        if child is None:
-            return None
-        return child.data
+        index = self._index
+        if index is not None:
+            return index.get(name)
+        sequence = self.ordered.get(name)  # A superseded directory looks its children up in its own maps
+        return None if sequence is None else self.children.get(sequence)
 
     def add_child(self, node: FSNode, overwrite: bool = False) -> None:
         """
@@ -43,6 +56,9 @@ class Directory(FSNode):
         Raises:
             DuplicateNameError: If a child with the same name already exists and overwrite is False.
         """
+        ledger = self.ledger
+        if ledger is not None and ledger.dirty:
+            ledger.flush()  # Deferred deltas must land before the tree shape changes
         existing_child = self.find_child(node.name)
         if existing_child is not None:
             if overwrite:
@@ -51,16 +67,40 @@ class Directory(FSNode):
                     self.modify()  # Update the modification time
                     return
                 else:
-                    self.children.remove(existing_child)
+                    self._unlink(node.name)
                     self.update_size(-existing_child.size)  # Trigger size propagation
                     self.count -= 1
+                    if existing_child.quota is not None and ledger is not None:
+                        ledger.count_quotas(-1)
+                    if self.names is not None:
+                        self.names.discard(existing_child)
+                    if self.text is not None:
+                        self.text.discard(existing_child)
             else:
                 self.raise_error(DuplicateNameError, name=node.name, directory=self.name)
 
-        self.children.append(node)
+        quota = self.quota
+        if quota is not None and quota.max_entries is not None and self.count >= quota.max_entries:
+            self.raise_error(QuotaExceededError, directory=self.name, limit=quota.max_entries, unit="entries")
+        self.update_size(node.size)  # Trigger size propagation; checks byte quotas before anything is linked
+
+        sequence = self.children.max_key(-1) + 1
+        self.children.add(sequence, node)
+        self.ordered.add(node.name, sequence)
+        self._index[node.name] = node
         node.parent = self
-        self.update_size(node.size)  # Trigger size propagation
+        node._epoch = self._epoch  # New children belong to the same snapshot epoch as their parent
         self.count += 1
+        self.generation += 1
+        if ledger is not None and isinstance(node, Directory):
+            if node.ledger is not ledger:
+                ledger.adopt(node)
+            if node.quota is not None:
+                ledger.count_quotas(1)
+        if self.names is not None:
+            self.names.add_tree(node)
+        if self.text is not None:
+            self.text.add_tree(node)
         self.modify()
 
     def remove_child(self, name: str) -> bool:
@@ -76,40 +116,146 @@ class Directory(FSNode):
         Raises:
             NotFoundError: If the child does not exist.
         """
+        ledger = self.ledger
+        if ledger is not None and ledger.dirty:
+            ledger.flush()  # Deferred deltas must land before the tree shape changes
         child = self.find_child(name)
         if child is None:
             self.raise_error(NotFoundError, name=name, directory=self.name)
 
-        self.children.remove(child)
+        self._unlink(name)
         self.update_size(-child.size)  # Trigger size propagation
         self.count -= 1
+        self.generation += 1
+        if child.quota is not None and ledger is not None:
+            ledger.count_quotas(-1)  # Quotas further down count until reclaimed
+        if self.names is not None:
+            self.names.discard(child)  # Its descendants are dropped as they are reclaimed
+        if self.text is not None:
+            self.text.discard(child)
         self.modify()
         return True
 
-    def list(self, prefix: str = "", is_last: bool = True, recurse: bool = False) -> str:
+    def rename_child(self, child: FSNode, new_name: str) -> None:
         """
-        Produces a tree-formatted directory using a recursive approach.
+        Re-keys a child under a new name, keeping the name index in sync.
+
+        Args:
+            child (FSNode): The child being renamed.
+            new_name (str): The new name of the child.
+
+        Raises:
+            DuplicateNameError: If another child already uses new_name.
         """
-        # For root directory, no prefix is used
-        buffer = f"{str(self)}{PATH_DELIMITER}\n"
-        if self.parent is None:
-            child_prefix = ""  # No indentation for the first level under root
+        if new_name == child.name:
+            return
+        if new_name in self._index:
+            self.raise_error(DuplicateNameError, name=new_name, directory=self.name)
+
+        self._index[new_name] = self._index.pop(child.name)
+        self.ordered.add(new_name, self.ordered.pop(child.name))
+        if self.names is not None:
+            self.names.rename(child, new_name)
+        self.generation += 1
+        self.modify()
+
+    def _unlink(self, name: str) -> None:
+        """
+        Drops a child from the child containers, leaving sizes and indexes to the caller.
+        """
+        del self._index[name]
+        self.children.remove(self.ordered.pop(name))
+
+    def cow_copy(self, epoch: int) -> "Directory":
+        """
+        Returns a copy owned by epoch for copy-on-write, which takes this
+        directory's place in the live tree.
+
+        The copy shares the chunks of both child maps (see SortedMap.copy) and
+        takes over the name index, which the live tree needs but a snapshot
+        does not, so copying costs a pointer per chunk rather than per child.
+        The shared children keep this directory as their parent; it points on
+        to the copy, and live-tree walks follow it (see FSNode.live_parent).
+        """
+        clone = self._copy_into(Directory.__new__(Directory), epoch)
+        clone.children = self.children.copy()
+        clone._index, self._index = self._index, None
+        clone.ordered = self.ordered.copy()
+        clone.count = self.count
+        clone.generation = 0
+        clone._lock = None
+        clone.quota = self.quota
+        clone.names = self.names
+        clone.text = self.text
+        clone.ledger = self.ledger
+        clone._successor = None
+        self._successor = clone
+        self.generation += 1  # Cached paths through the superseded directory are stale
+        return clone
+
+    def latest(self) -> "Directory":
+        """
+        Returns the newest version of the directory: itself, or the last of the
+        copies that superseded it (see cow_copy).
+        """
+        latest = self
+        while latest._successor is not None:
+            latest = latest._successor
+        if self._successor is not None:
+            self._successor = latest  # Later lookups skip the versions in between
+        return latest
+
+    def replace_child(self, old: FSNode, new: FSNode) -> None:
+        """
+        Swaps a child for its copy-on-write replacement under the same name.
+
+        Args:
+            old (FSNode): The current child.
+            new (FSNode): The node taking its place.
+        """
+        self._index[old.name] = new
+        self.children.add(self.ordered.get(old.name), new)
+        new.parent = self
+        if self.names is not None:
+            self.names.replace(old, new)
+        if self.text is not None:
+            self.text.replace(old, new)
+        self.generation += 1
+
+    def iter_children(self, sort: bool = False, name_prefix: str = None, after: str = None, limit: int = None):
+        """
+        Iterates over the children, in insertion order or in name order.
+
+        Name-ordered iteration seeks straight to the first matching name, so the
+        cost is proportional to the number of children yielded.
+
+        Args:
+            sort (bool): If True, yield children sorted by name.
+            name_prefix (str, optional): Only yield children whose name starts with this prefix. Implies sort.
+            after (str, optional): Only yield children whose name sorts after this one. Implies sort.
+            limit (int, optional): Maximum number of children to yield.
+
+        Yields:
+            FSNode: The matching children.
+        """
+        if not (sort or name_prefix or after is not None):
+            children = self.children.values()
         else:
-            marker = TREE_LAST if is_last else TREE_BRANCH
-            buffer = f"{prefix}{marker}" + buffer
-            child_prefix = prefix + (TREE_SPACE if is_last else TREE_VERTICAL)
-        
-        for is_last, child in self.children.enumerate():
-            # If at root, don't add extra indent to children
-            new_prefix = child_prefix if self.parent is not None else ""
-            
-            if hasattr(child, "list") and recurse:
-                buffer += child.list(prefix=new_prefix, is_last=is_last, recurse=recurse)
-            else:
-                marker = TREE_LAST if is_last else TREE_BRANCH
-                buffer += f"{new_prefix}{marker}{str(child)}{PATH_DELIMITER if isinstance(child, Directory) else ''}\n"
-        
-        return buffer
+            children = map(self.find_child, self.ordered.iselect(name_prefix, after))
+
+        return children if limit is None else islice(children, limit)
+
+    def list(self, recurse: bool = False, sort: bool = False, name_prefix: str = None, after: str = None,
+             limit: int = None, max_depth: int = None, max_entries: int = None) -> str:
+        """
+        Produces a tree-formatted directory listing.
+
+        sort applies at every level; name_prefix, after and limit filter the
+        top level only (see iter_children). See iter_tree_lines to stream the
+        listing instead of building it.
+        """
+        return "".join(iter_tree_lines(self, recurse=recurse, sort=sort, name_prefix=name_prefix, after=after,
+                                       limit=limit, max_depth=max_depth, max_entries=max_entries))
 
     def get_absolute_path(self) -> str:
         """
@@ -121,4 +267,4 @@ class Directory(FSNode):
         if self.parent is None:
             return self.name
         
-        return super().get_absolute_path()
\ No newline at end of file
+        return super().get_absolute_path()
@@ -64,3 +64,24 @@ class NotFoundError(FileSystemError):
         self.directory = directory
         reason = f"File '{name}' not found in directory '{directory}'"
         super().__init__(reason)
+
+
+class QuotaExceededError(FileSystemError):
+    """Exception raised when a change would exceed a directory quota."""
+    def __init__(self, directory: str, limit: int, unit: str):
+        """
+        Args:
+            directory (str): The directory whose quota would be exceeded.
+            limit (int): The quota limit.
+            unit (str): What the limit counts, e.g. "bytes" or "entries".
+        """
+        self.directory = directory
+        self.limit = limit
+        reason = f"Quota of {limit} {unit} exceeded in directory '{directory}'"
+        super().__init__(reason)
+
+
+class RemoteError(FileSystemError):
+    """Exception raised for an error reported by a file system server."""
+    def __str__(self):
+        return self.reason  # Already formatted by the server
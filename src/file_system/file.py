@@ -1,27 +1,47 @@
-from datetime import datetime
+from time import time_ns
 from src.file_system.constants import PREFIX_FILE
 from src.file_system.node import FSNode
+from src.file_system.content import ChunkedContent
+from src.file_system.exceptions import FileSystemError
 
 class File(FSNode):
-    
-    def __init__(self, name: str, content: str = ''):
+    __slots__ = ('_store', 'rtime')
+
+    DEFAULT_CHUNK_SIZE = 64 * 1024  # Characters per piece yielded by iter_chunks
+
+    def __init__(self, name: str, content: str = '', blobs=None):
+        """
+        Args:
+            name (str): The file name.
+            content (str, optional): Initial content. Defaults to an empty string.
+            blobs (BlobStore, optional): Pool to share the content through, or None to store it privately.
+        """
         super().__init__(name)
-        self._content = content  # Privatize the content attribute
+        # Privatize the content storage
+        self._store = blobs.new_content(content) if blobs is not None else ChunkedContent(content)
+        self.rtime = self.ctime
         self.update_size(len(content))  # Initialize size based on content
         
     @property
     def size(self) -> int:
         """
-        Returns the size of the file based on its content.
+        Returns the size of the file, tracked incrementally by its content store.
         """
-        return len(self._content)
+        return len(self._store)
     
     @property
     def content(self) -> str:
         """
         Provides read-only access to the file's content.
         """
-        return self._content
+        return self._store.getvalue()
+
+    @property
+    def _content(self) -> str:
+        """
+        Materialized content, kept for callers that predate the chunked store.
+        """
+        return self._store.getvalue()
 
     def __str__(self):
         return f"{PREFIX_FILE} " + super().__str__()
@@ -31,18 +51,37 @@ class File(FSNode):
             return ''
         return super().__getattr__(name)
     
+    def cow_copy(self, epoch: int) -> "File":
+        """
+        Returns a copy owned by epoch for copy-on-write. The content chunks are
+        shared; only the list referencing them is copied.
+        """
+        clone = self._copy_into(File.__new__(File), epoch)
+        clone._store = self._store.copy()
+        clone.rtime = self.rtime
+        return clone
+
     def write(self, content: str, overwrite: bool = True):
         """
         Writes content to the file. Updates size dynamically and modification time.
         """
         if overwrite:
-            size_difference = len(content) - len(self._content)  # Calculate size difference before overwriting
-            self._content = content  # Replace the content entirely
+            size_difference = len(content) - len(self._store)  # Calculate size difference before overwriting
         else:
             size_difference = len(content)  # Appending adds the full length of the new content
-            self._content += content  # Append the new content
+        self.update_size(size_difference)  # Trigger size propagation; raises before the content changes if over quota
+        parent = self.parent
+        if parent is not None and parent.text is not None:
+            try:
+                parent.text.update(self, content, overwrite)  # Reads the old content, so before it changes
+            except BaseException:
+                self.update_size(-size_difference)  # Leave the sizes as they were, like the content
+                raise
 
-        self.update_size(size_difference)  # Trigger size propagation
+        if overwrite:
+            self._store.replace(content)  # Replace the content entirely
+        else:
+            self._store.append(content)  # Append as a new chunk, without copying existing content
         self.modify()  # Update the modification time
     
     def append(self, data: str):
@@ -58,6 +97,48 @@ class File(FSNode):
         Returns:
             tuple[str, int]: The content and its size.
         """        
-        self.rtime = datetime.now()
-        return self._content, len(self._content)
+        self.rtime = time_ns()
+        return self._store.getvalue(), len(self._store)
+
+    def read_range(self, offset: int = 0, length: int = None) -> str:
+        """
+        Reads part of the file content without materializing the rest.
+
+        Args:
+            offset (int, optional): Start offset. Defaults to 0.
+            length (int, optional): Maximum number of characters to read, or None for the rest.
+
+        Returns:
+            str: The requested range, shorter if it runs past the end of the file.
+
+        Raises:
+            FileSystemError: If offset or length is negative.
+        """
+        self._validate_range(offset, length)
+        self.rtime = time_ns()
+        return self._store.read_range(offset, length)
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE, offset: int = 0, length: int = None):
+        """
+        Streams the file content (or a range of it) in pieces of at most chunk_size.
+
+        Args:
+            chunk_size (int, optional): Maximum length of each piece.
+            offset (int, optional): Start offset. Defaults to 0.
+            length (int, optional): Maximum number of characters, or None for the rest.
+
+        Returns:
+            Iterator[str]: The content pieces, in order.
+
+        Raises:
+            FileSystemError: If offset or length is negative, or chunk_size is not positive.
+        """
+        self._validate_range(offset, length)
+        if chunk_size <= 0:
+            self.raise_error(FileSystemError, f"Invalid chunk size {chunk_size} for '{self.name}'.")
+        self.rtime = time_ns()
+        return self._store.iter_range(offset, length, chunk_size)
 
+    def _validate_range(self, offset: int, length: int):
+        if offset < 0 or (length is not None and length < 0):
+            self.raise_error(FileSystemError, f"Invalid range (offset={offset}, length={length}) for '{self.name}'.")
@@ -1,19 +1,90 @@
-from src.file_system.constants import PATH_DELIMITER
+from collections import deque
+from weakref import WeakSet
+from src.file_system.constants import PATH_DELIMITER, ROOT
 from src.file_system.exceptions import FileSystemError, NotADirectoryError, DuplicateNameError
 from src.file_system.directory import Directory
 from src.file_system.file import File
 from src.file_system.path_resolver import PathResolver
+from src.file_system.path_cache import PathCache
+from src.file_system.tree_renderer import iter_tree_lines
+from src.file_system.size_ledger import SizeLedger
+from src.file_system.image import load_image, save_image
+from src.file_system import journal as wal
+from src.file_system import host_tree
+from src.file_system.snapshot import Snapshot
+from src.file_system.session import Session
+from src.file_system.blob_store import BlobStore
+from src.file_system import cold_tier
+from src.file_system.quota import Quota
+from src.file_system.name_index import NameIndex
+from src.file_system.text_index import TextIndex, matches, parse_query, tokenize
 
 class FileSystem:
     """
     Simulates a file system with basic operations like mkdir, touch, ls, and read.
     """
-    def __init__(self):
+    RECLAIM_BUDGET = 1024  # Detached nodes torn down per mutating operation
+    concurrent = False  # True for file systems shared between threads (see ConcurrentFileSystem)
+
+    def __init__(self, path_cache_size: int = 4096, deferred_sizes: bool = False, dedup: bool = False,
+                 cold_budget: int = None, cold_idle: float = cold_tier.DEFAULT_IDLE, search_budget: int = None):
         """
         Initializes the file system with a root directory.
+
+        Args:
+            path_cache_size (int, optional): Number of resolved paths to cache, or 0 to disable the cache.
+            deferred_sizes (bool, optional): If True, turn on deferred size accounting (see set_deferred_sizes).
+            dedup (bool, optional): If True, files with equal contents share one copy (see content_stats).
+            cold_budget (int, optional): If set, turn on compression of idle files (see compress_cold),
+                caching up to this many characters of decompressed content.
+            cold_idle (float, optional): Seconds without a read or write after which compress_cold compresses a file.
+            search_budget (int, optional): If set, index file contents for search, keeping up to this many postings.
         """
+        self.ledger = SizeLedger()  # Deferred size deltas of this tree (see batch and set_deferred_sizes)
         self.root = Directory()
-        self.current: Directory = self.root
+        self.root.ledger = self.ledger
+        self.session = Session(self.root)  # Used by operations called without a session
+        self.sessions = WeakSet([self.session])  # Every open session, to keep their directories valid
+        self.path_cache = PathCache(path_cache_size) if path_cache_size else None
+        self._graveyard = deque()  # (directory, epoch) pairs awaiting lazy reclamation
+        self.epoch = 0  # Nodes stamped with an older epoch may be shared with a snapshot
+        self.journal = None
+        self.checkpoint_lsn = 0  # Last journal sequence number captured by the loaded image
+        self._checkpoint_path = None
+        self._checkpoint_every = None
+        self._ops_since_checkpoint = 0
+        self.blobs = BlobStore() if dedup else None
+        self.cold = cold_tier.ColdTier(cold_budget, cold_idle) if cold_budget is not None else None
+        self.names = None  # NameIndex, built by the first find
+        self.text = TextIndex(search_budget) if search_budget is not None else None  # Built by the first search
+        if deferred_sizes:
+            self.set_deferred_sizes(True)
+
+    @property
+    def current(self) -> Directory:
+        """
+        The working directory of the default session.
+        """
+        return self.session.cwd
+
+    @current.setter
+    def current(self, directory: Directory) -> None:
+        self.session.cwd = directory
+
+    def open_session(self, cwd: Directory = None) -> Session:
+        """
+        Creates a session over this tree with its own working directory.
+        Pass it as session= to any operation.
+
+        Args:
+            cwd (Directory, optional): The initial working directory. Defaults to the root.
+
+        Returns:
+            Session: The new session.
+        """
+        session = Session(cwd or self.root)
+        self.sessions.add(session)
+        return session
 
     def get_size(self) -> int:
         """
@@ -21,41 +92,279 @@ class FileSystem:
         """
         return self.root.size
 
-    def ls(self, recurse: bool = False) -> str:
+    def content_stats(self) -> dict:
+        """
+        Reports how much storage content deduplication saves (see BlobStore.stats).
+        Contents of files loaded from an image are shared once they are rewritten.
+        Deleted files keep counting until their contents are garbage collected:
+        for recursive deletes, that is once reclaim has torn the subtree down.
+
+        Returns:
+            dict: blobs, references, logical_size, stored_size, saved and dedup_ratio.
+
+        Raises:
+            FileSystemError: If the file system was created without dedup.
+        """
+        if self.blobs is None:
+            self.current.raise_error(FileSystemError, "stats: content deduplication is not enabled")
+        return self.blobs.stats()
+
+    def compress_cold(self, idle: float = None) -> int:
+        """
+        Compresses the content of files that have not been read or written for a while.
+
+        Compressed files keep their exact size. Reading one decompresses it
+        into an LRU bounded by the cold budget (self.cold.budget), and writing
+        one keeps it decompressed until it is idle again. Call this
+        periodically, e.g. from a timer or between batches of commands.
+
+        Args:
+            idle (float, optional): Seconds without a read or write, or None for cold_idle.
+
+        Returns:
+            int: The number of files compressed.
+
+        Raises:
+            FileSystemError: If the file system was created without a cold budget.
+        """
+        if self.cold is None:
+            self.current.raise_error(FileSystemError, "compress: cold compression is not enabled")
+        return self.cold.sweep(self.root, idle)
+
+    def cold_stats(self) -> dict:
+        """
+        Reports compression ratio, decompression latency and LRU use (see ColdTier.stats).
+        Deleted files count as compressed until their contents are garbage collected.
+
+        Raises:
+            FileSystemError: If the file system was created without a cold budget.
+        """
+        if self.cold is None:
+            self.current.raise_error(FileSystemError, "stats: cold compression is not enabled")
+        return self.cold.stats()
+
+    def save(self, path: str) -> None:
+        """
+        Saves the whole tree to a binary image (see file_system.image).
+
+        Args:
+            path (str): Destination path.
+        """
+        lsn = self.journal.last_lsn if self.journal is not None else self.checkpoint_lsn
+        save_image(self.root, path, lsn=lsn)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "FileSystem":
+        """
+        Opens a binary image. The image is memory-mapped and directories and
+        files are only created as paths are resolved, so startup cost does not
+        grow with the size of the image.
+
+        Args:
+            path (str): Path of the image file.
+            **kwargs: Passed to the FileSystem constructor.
+
+        Returns:
+            FileSystem: A file system rooted at the image's root directory.
+
+        Raises:
+            FileSystemError: If the file is not a valid image.
+        """
+        fs = cls(**kwargs)
+        fs.root, fs.checkpoint_lsn = load_image(path)
+        fs.root.ledger = fs.ledger
+        fs.current = fs.root
+        return fs
+
+    def attach_journal(self, journal: wal.Journal, checkpoint_path: str = None, checkpoint_every: int = None) -> int:
+        """
+        Replays a write-ahead journal onto this file system, then records every
+        further mkdir, touch, write and del_ in it.
+
+        Args:
+            journal (Journal): The journal to replay and append to.
+            checkpoint_path (str, optional): Image path used by checkpoint().
+            checkpoint_every (int, optional): Checkpoint automatically after this many journaled operations.
+
+        Returns:
+            int: The number of operations replayed.
+        """
+        replayed = wal.replay(self, journal, after_lsn=self.checkpoint_lsn)
+        journal.last_lsn = max(journal.last_lsn, self.checkpoint_lsn)
+        self.journal = journal
+        self._checkpoint_path = checkpoint_path
+        self._checkpoint_every = checkpoint_every
+        self._ops_since_checkpoint = replayed
+        return replayed
+
+    def checkpoint(self, path: str = None) -> None:
+        """
+        Saves an image that includes every journaled operation, then truncates
+        the journal so replay time stays bounded. The image records the last
+        sequence number it includes, so a crash between the two steps never
+        replays an operation twice.
+
+        Args:
+            path (str, optional): Image path. Defaults to the checkpoint_path given to attach_journal().
+        """
+        path = path or self._checkpoint_path
+        if path is None:
+            self.current.raise_error(FileSystemError, "checkpoint: no image path given")
+        self.journal.commit()
+        self.save(path)
+        self.journal.truncate()
+        self.checkpoint_lsn = self.journal.last_lsn
+        self._ops_since_checkpoint = 0
+
+    def _log(self, op: int, flags: int, *fields: str) -> None:
+        """
+        Journals a completed operation and checkpoints when one is due.
+        """
+        self.journal.append(op, flags, *fields)
+        self._ops_since_checkpoint += 1
+        if self._checkpoint_every and self._ops_since_checkpoint >= self._checkpoint_every:
+            self.checkpoint()
+
+    def _absolute(self, path: str, session: Session = None) -> str:
+        """
+        Returns path anchored at the root, for journal records that must not depend on the cwd.
+        """
+        if path.startswith(ROOT):
+            return path
+        return f"{(session or self.session).cwd.get_absolute_path()}{PATH_DELIMITER}{path}"
+
+    def snapshot(self) -> Snapshot:
+        """
+        Returns a frozen, read-only view of the tree in O(1).
+
+        Taking a snapshot starts a new epoch. From then on, a write to a node
+        from an older epoch first copies the node and every older ancestor up to
+        the root (path copying), so the snapshot keeps the originals while
+        unchanged subtrees and file contents stay shared.
+
+        Returns:
+            Snapshot: The frozen view.
+        """
+        self.ledger.flush()  # The view must not see deltas recorded after it was taken
+        self.epoch += 1
+        return Snapshot(self.root, self.epoch - 1)
+
+    def _own(self, node):
+        """
+        Returns the version of node that the live tree may modify in place,
+        copying it and its ancestors first if they may be shared with a snapshot.
+        """
+        if node._epoch == self.epoch:
+            return node
+
+        shared = []
+        owner = node
+        while owner is not None and owner._epoch != self.epoch:
+            shared.append(owner)
+            owner = owner.live_parent
+
+        # Copy top-down so every copy is attached to an already owned parent
+        for original in reversed(shared):
+            clone = original.cow_copy(self.epoch)
+            if owner is None:
+                self.root = clone
+                clone.parent = None
+                if clone.text is not None:
+                    clone.text.replace(original, clone)  # The root has no parent to do it in replace_child
+            else:
+                owner.replace_child(original, clone)
+            if isinstance(original, Directory):
+                for session in self.sessions:
+                    if session.cwd is original:
+                        session.cwd = clone
+            owner = clone
+        return owner
+
+    def batch(self):
+        """
+        Returns a context manager that defers size propagation for every write
+        inside it and applies the coalesced deltas in one pass on exit.
+
+        Example:
+            with fs.batch():
+                for line in records:
+                    fs.write("logs/app.log", content=line)
+        """
+        return self.ledger.batch()
+
+    def set_deferred_sizes(self, enabled: bool) -> None:
+        """
+        Turns deferred size accounting on or off. While on, writes only mark
+        nodes dirty and ancestor sizes are recomputed the next time a size is read.
+        Other file systems are not affected.
+
+        Args:
+            enabled (bool): True to defer size propagation.
+        """
+        self.ledger.set_deferred(enabled)
+
+    def ls(self, recurse: bool = False, sort: bool = False, prefix: str = None, after: str = None, limit: int = None,
+           max_depth: int = None, max_entries: int = None, session: Session = None) -> str:
         """
         Lists the contents of the current directory.
 
         Args:
             recurse (bool): If True, recursively list subdirectories.
+            sort (bool): If True, list entries in name order.
+            prefix (str, optional): Only list top-level entries whose name starts with prefix. Implies sort.
+            after (str, optional): Only list top-level entries named after this one, for paging. Implies sort.
+            limit (int, optional): Maximum number of top-level entries to list.
+            max_depth (int, optional): Deepest level to descend to when recursing.
+            max_entries (int, optional): Maximum number of entries to list in total.
+            session (Session, optional): List this session's working directory instead.
 
         Returns:
             str: A string representation of the directory contents.
         """
-        return self.current.list(recurse=recurse)
+        return "".join(self.iter_ls(recurse=recurse, sort=sort, prefix=prefix, after=after, limit=limit,
+                                    max_depth=max_depth, max_entries=max_entries, session=session))
+
+    def iter_ls(self, recurse: bool = False, sort: bool = False, prefix: str = None, after: str = None, limit: int = None,
+                max_depth: int = None, max_entries: int = None, session: Session = None):
+        """
+        Streams the listing of the current directory line by line. Takes the same arguments as ls().
+
+        Returns:
+            Iterator[str]: Newline-terminated lines of the listing.
+        """
+        return iter_tree_lines((session or self.session).cwd, recurse=recurse, sort=sort, name_prefix=prefix, after=after, limit=limit,
+                               max_depth=max_depth, max_entries=max_entries)
     
-    def mkdir(self, *paths: str) -> None:
+    def mkdir(self, *paths: str, session: Session = None) -> None:
         """
         Creates one or more directories, including parent directories if necessary.
 
         Args:
             *paths (str): One or more directory paths to create. Paths can be nested (e.g., "a/b/c").
+            session (Session, optional): Session whose working directory relative paths start from.
 
         Raises:
             DuplicateNameError: If a directory or file with the same name already exists.
             NotADirectoryError: If a path component is not a directory.
         """
+        self.reclaim(self.RECLAIM_BUDGET)
+        session = session or self.session
         for path in paths:
-            current = self.current  # Start from the current directory
+            current = session.cwd  # Start from the current directory
             components = path.split(PATH_DELIMITER)
 
             for component in components:
                 if not component:  # Skip empty components (e.g., from leading/trailing slashes)
                     continue
+                if component == ROOT:  # Absolute paths restart from the root, as in PathResolver
+                    current = self.root
+                    continue
 
                 child = current.find_child(component)
                 if not child:
                     # Create the directory if it doesn't exist
                     new_dir = Directory(component)
+                    current = self._own(current)
                     current.add_child(new_dir)
                     current = new_dir
                 elif isinstance(child, Directory):
@@ -65,12 +374,18 @@ class FileSystem:
                     # Raise an error if the path component is not a directory
                     current.raise_error(NotADirectoryError, name=component, directory=current.name)
 
-    def read(self, path: str) -> str:
+            if self.journal is not None:
+                self._log(wal.OP_MKDIR, 0, self._absolute(path, session))
+
+    def read(self, path: str, offset: int = 0, length: int = None, session: Session = None) -> str:
         """
-        Reads the content of a file.
+        Reads the content of a file, or a range of it.
 
         Args:
             path (str): The path to the file.
+            offset (int, optional): Start offset. Defaults to 0.
+            length (int, optional): Maximum number of characters to read, or None for the rest.
+            session (Session, optional): Session whose working directory relative paths start from.
 
         Returns:
             str: The content of the file.
@@ -79,12 +394,39 @@ class FileSystem:
             NotFoundError: If the file does not exist.
             NotADirectoryError: If the path points to a directory instead of a file.
         """
-        target = PathResolver.resolve(self, path, must_exist=True)
+        target = self._resolve_file(path, session)
+        if offset == 0 and length is None:
+            return target.read()[0]  # Stamps the read time, which keeps the file warm (see compress_cold)
+        return target.read_range(offset, length)
+
+    def read_chunks(self, path: str, offset: int = 0, length: int = None, chunk_size: int = File.DEFAULT_CHUNK_SIZE,
+                    session: Session = None):
+        """
+        Streams the content of a file, or a range of it, in pieces.
+
+        Args:
+            path (str): The path to the file.
+            offset (int, optional): Start offset. Defaults to 0.
+            length (int, optional): Maximum number of characters to read, or None for the rest.
+            chunk_size (int, optional): Maximum length of each piece.
+            session (Session, optional): Session whose working directory relative paths start from.
+
+        Returns:
+            Iterator[str]: The content pieces, in order.
+
+        Raises:
+            NotFoundError: If the file does not exist.
+            FileSystemError: If the path points to a directory instead of a file.
+        """
+        return self._resolve_file(path, session).iter_chunks(chunk_size, offset, length)
+
+    def _resolve_file(self, path: str, session: Session = None) -> File:
+        target = PathResolver.resolve(self, path, must_exist=True, session=session)
         if not isinstance(target, File):
             self.current.raise_error(FileSystemError, f"Cannot read: '{path}' is not a valid file.")
-        return target.content
+        return target
     
-    def touch(self, *paths: str, content: str = '') -> None:
+    def touch(self, *paths: str, content: str = '', session: Session = None) -> None:
         """
         Creates one or more files, including parent directories if necessary.
         Supports appending or overwriting content for existing files.
@@ -92,6 +434,7 @@ class FileSystem:
         Args:
             *paths (str): One or more file paths to create. Paths can be nested (e.g., "a/b/c.txt").
             content (str, optional): The content to write to the file. Defaults to an empty string.
+            session (Session, optional): Session whose working directory relative paths start from.
 
         Raises:
             NotADirectoryError: If a path component is not a directory.
@@ -99,24 +442,29 @@ class FileSystem:
         if not paths:
             self.current.raise_error(FileSystemError, "touch: missing file operand")
 
+        self.reclaim(self.RECLAIM_BUDGET)
         for path in paths:
-            parent, file_name = PathResolver.resolve_parent(self, path)
+            parent, file_name = PathResolver.resolve_parent(self, path, session=session)
 
             # Check if the file already exists
             existing_file = parent.find_child(file_name)
             if existing_file:
                 if isinstance(existing_file, File):
-                    existing_file.write(content)  # Overwrite content
+                    self._own(existing_file).write(content)  # Overwrite content
                 else:
                     self.current.raise_error(DuplicateNameError, name=file_name, directory=parent.name)
             else:
-                new_file = File(name=file_name, content=content)
-                parent.add_child(new_file)  # Automatically updates size
+                new_file = File(name=file_name, content=content, blobs=self.blobs)
+                self._own(parent).add_child(new_file)  # Automatically updates size
+
+            if self.journal is not None:
+                self._log(wal.OP_TOUCH, 0, self._absolute(path, session), content)
     
-    def pwd(self, recurse) -> str:
-        return self.current.get_absolute_path() if recurse else str(self.current)
+    def pwd(self, recurse, session: Session = None) -> str:
+        cwd = (session or self.session).cwd
+        return cwd.get_absolute_path() if recurse else str(cwd)
     
-    def write(self, path: str, content: str, overwrite: bool = False) -> None:
+    def write(self, path: str, content: str, overwrite: bool = False, session: Session = None) -> None:
         """
         Writes to a file. Supports appending content.
 
@@ -124,61 +472,407 @@ class FileSystem:
             path (str): The path to the file.
             content (str): The content to write to the file.
             append (bool): If True, appends content to the file. Defaults to False.
+            session (Session, optional): Session whose working directory relative paths start from.
 
         Raises:
             NotFoundError: If the file does not exist.
             NotADirectoryError: If the path points to a directory instead of a file.
         """
-        target = PathResolver.resolve(self, path, must_exist=True)
+        self.reclaim(self.RECLAIM_BUDGET)
+        target = PathResolver.resolve(self, path, must_exist=True, session=session)
 
         if not isinstance(target, File):
             self.current.raise_error(NotADirectoryError, name=target.name, directory=self.current.name)
 
-        target.parent.size -= len(target)
+        target = self._own(target)
         if overwrite:
             target.write(content)
         else:
-            target.append(content)
-        target.parent.size += len(target)
+            target.append(content)  # Size propagation is handled by the file
+
+        if self.journal is not None:
+            self._log(wal.OP_WRITE, wal.FLAG_OVERWRITE if overwrite else 0, self._absolute(path, session), content)
     
-    def del_(self, path: str, recurse: bool = False) -> None:
+    def del_(self, path: str, recurse: bool = False, session: Session = None) -> None:
         """
         Deletes a file or directory.
 
         Args:
             path (str): The path to the file or directory to delete.
             recurse (bool): If True, recursively delete subdirectories.
+            session (Session, optional): Session whose working directory relative paths start from.
 
         Raises:
             NotFoundError: If the path does not exist.
             NotADirectoryError: If attempting to delete a directory without the recurse flag.
         """
-        target = PathResolver.resolve(self, path, must_exist=True)
+        self.reclaim(self.RECLAIM_BUDGET)
+        target = PathResolver.resolve(self, path, must_exist=True, session=session)
+        logged_path = self._absolute(path, session) if self.journal is not None else None  # Before the cwd may be detached
 
         if isinstance(target, Directory):
             if recurse:
-                # Recursively delete all children
-                while len(target.children) > 0:
-                    child = target.children.head.data  # Get the first child
-                    target.remove_child(child.name)  # Remove the child
-                # Remove the directory itself
                 if target.parent:
-                    target.parent.remove_child(target.name)
+                    # Detach the whole subtree in one step; its nodes are torn down lazily
+                    self._own(target.live_parent).remove_child(target.name)
+                    self._bury(target)
+                else:
+                    # The root itself stays, so detach each of its children instead
+                    target = self._own(target)
+                    while target.count:
+                        child = next(target.children.values())
+                        target.remove_child(child.name)
+                        if isinstance(child, Directory):
+                            self._bury(child)
             else:
                 self.current.raise_error(FileSystemError, f"Cannot delete: '{path}' is a directory. Use -R to delete directories.")
         elif isinstance(target, File):
             # If it's a file, simply remove it
             if target.parent:
-                target.parent.remove_child(target.name)
+                self._own(target.live_parent).remove_child(target.name)
         else:
             self.current.raise_error(FileSystemError, f"Cannot delete: '{path}' is not a valid file or directory.")
+
+        if self.journal is not None:
+            self._log(wal.OP_DEL, wal.FLAG_RECURSE if recurse else 0, logged_path)
+
+    def import_tree(self, host_path: str, path: str = '.', workers: int = host_tree.DEFAULT_WORKERS,
+                    session: Session = None) -> int:
+        """
+        Copies the contents of a real directory into a directory of this file system.
+
+        The host tree is read in bulk (see file_system.host_tree): nodes are
+        built without per-node validation or size propagation, file contents
+        are read in a thread pool, and each top-level entry is attached with a
+        single add_child at the end. With a journal attached, a checkpoint is
+        taken afterwards instead of journaling every node.
+
+        Args:
+            host_path (str): The host directory to import.
+            path (str, optional): The directory to import into. Defaults to the current directory.
+            workers (int, optional): Number of threads reading file contents.
+            session (Session, optional): Session whose working directory relative paths start from.
+
+        Returns:
+            int: The number of files and directories imported.
+
+        Raises:
+            NotADirectoryError: If path is not a directory.
+            DuplicateNameError: If a top-level host entry already exists in the target directory.
+            InvalidNameError: If a host entry's name is not valid here. Nothing is imported.
+            QuotaExceededError: If the imported tree does not fit in a quota. Nothing is imported.
+            FileSystemError: If a journal is attached without a checkpoint image path.
+        """
+        if self.journal is not None and self._checkpoint_path is None:
+            self.current.raise_error(FileSystemError, "import: a journaled file system needs a checkpoint image path")
+        target = PathResolver.resolve(self, path, must_exist=True, session=session)
+        if not isinstance(target, Directory):
+            target.raise_error(NotADirectoryError, name=target.name, directory=path)
+
+        nodes, count = host_tree.read_tree(host_path, epoch=self.epoch, workers=workers, blobs=self.blobs)
+        for node in nodes:
+            if target.find_child(node.name) is not None:
+                target.raise_error(DuplicateNameError, name=node.name, directory=target.name)
+
+        self._attach_all(self._own(target), nodes)
+        if self.journal is not None:
+            self.checkpoint()
+        return count
+
+    def _attach_all(self, target: Directory, nodes: list) -> None:
+        """
+        Adds imported nodes to a directory, all or none: if one exceeds a quota,
+        the ones already added are removed again before the error propagates.
+        """
+        attached = []
+        try:
+            for node in nodes:
+                target.add_child(node)  # Sizes reach the ancestors once per top-level entry
+                attached.append(node)
+        except BaseException:
+            for node in reversed(attached):
+                target.remove_child(node.name)
+                if isinstance(node, Directory):
+                    self._bury(node)
+            raise
+
+    def export_tree(self, host_path: str, path: str = '.', workers: int = host_tree.DEFAULT_WORKERS,
+                    session: Session = None) -> int:
+        """
+        Writes the contents of a directory of this file system to a real directory,
+        with file contents written in a thread pool.
+
+        Args:
+            host_path (str): The host directory to write to; created if missing.
+            path (str, optional): The directory to export. Defaults to the current directory.
+            workers (int, optional): Number of threads writing file contents.
+            session (Session, optional): Session whose working directory relative paths start from.
+
+        Returns:
+            int: The number of files and directories exported.
+
+        Raises:
+            NotADirectoryError: If path is not a directory.
+        """
+        source = PathResolver.resolve(self, path, must_exist=True, session=session)
+        if not isinstance(source, Directory):
+            source.raise_error(NotADirectoryError, name=source.name, directory=path)
+        return host_tree.write_tree(source, host_path, workers=workers)
+
+    def set_quota(self, path: str, max_bytes: int = None, max_entries: int = None, session: Session = None) -> None:
+        """
+        Limits the total size of a directory's subtree and its number of children.
+
+        Writes, touches, mkdirs and imports that would exceed a limit raise
+        QuotaExceededError and change nothing. A limit below the current usage
+        only blocks further growth. Passing neither limit removes the quota.
+        Quotas are kept in memory only, and are not saved in images or journals.
+
+        Args:
+            path (str): The directory to limit.
+            max_bytes (int, optional): Maximum size of the subtree, or None for no limit.
+            max_entries (int, optional): Maximum number of children of the directory, or None for no limit.
+            session (Session, optional): Session whose working directory relative paths start from.
+
+        Raises:
+            NotADirectoryError: If path is not a directory.
+            FileSystemError: If a limit is negative.
+        """
+        if (max_bytes is not None and max_bytes < 0) or (max_entries is not None and max_entries < 0):
+            self.current.raise_error(FileSystemError, f"quota: invalid limits for '{path}'")
+        target = PathResolver.resolve(self, path, must_exist=True, session=session)
+        if not isinstance(target, Directory):
+            target.raise_error(NotADirectoryError, name=target.name, directory=path)
+
+        target = self._own(target)
+        quota = Quota(max_bytes, max_entries) if max_bytes is not None or max_entries is not None else None
+        self.ledger.count_quotas((quota is not None) - (target.quota is not None))
+        target.quota = quota
+
+    def du(self, path: str = '.', session: Session = None) -> list[tuple[str, int]]:
+        """
+        Reports the size of every child of a directory, read from the
+        aggregated subtree sizes without scanning any content.
+
+        Args:
+            path (str, optional): The directory to report on. Defaults to the current directory.
+            session (Session, optional): Session whose working directory relative paths start from.
+
+        Returns:
+            list[tuple[str, int]]: (name, size) for each child, directories suffixed with "/",
+                followed by (path, total size). A file reports only itself.
+        """
+        target = PathResolver.resolve(self, path, must_exist=True, session=session)
+        if not isinstance(target, Directory):
+            return [(target.name, target.size)]
+        usage = [(child.name + PATH_DELIMITER if isinstance(child, Directory) else child.name, child.size)
+                 for child in self._children(target)]
+        usage.append((path, target.size))
+        return usage
+
+    def _children(self, directory: Directory):
+        return directory.iter_children(sort=True)
+
+    def find(self, pattern: str, path: str = '.', session: Session = None) -> list[str]:
+        """
+        Finds every file and directory below a directory whose name matches a pattern.
+
+        The first call builds a NameIndex of the whole tree (see
+        file_system.name_index), loading lazily loaded image directories;
+        the tree keeps it up to date from then on, so later calls cost as
+        much as their matches instead of a walk of the tree.
+
+        Args:
+            pattern (str): A name, or a glob pattern with *, ? and [...], matched case-sensitively.
+            path (str, optional): The directory to search. Defaults to the current directory.
+            session (Session, optional): Session whose working directory relative paths start from.
+
+        Returns:
+            list[str]: The absolute paths of the matches, sorted.
+
+        Raises:
+            NotADirectoryError: If path is not a directory.
+        """
+        start = PathResolver.resolve(self, path, must_exist=True, session=session)
+        if not isinstance(start, Directory):
+            start.raise_error(NotADirectoryError, name=start.name, directory=path)
+        names = self._name_index()
+
+        found = []
+        for node in names.match(pattern):
+            trail = self._trail(node)
+            if trail is None:
+                names.discard(node)  # Detached by a recursive delete and not reclaimed yet
+            elif start is self.root or any(ancestor is start for ancestor in trail):
+                found.append(_path_of(trail))
+        found.sort()
+        return found
+
+    def search(self, query: str, path: str = '.', session: Session = None) -> list[str]:
+        """
+        Finds the files below a directory whose content matches a query.
+
+        A query is a list of clauses that must all match: words, "quoted
+        phrases" of consecutive words, and either ending with * to match
+        the last word as a prefix. Words are runs of letters, digits and
+        underscores, compared case-insensitively.
+
+        With a search budget, the first call builds a TextIndex of every
+        file (see file_system.text_index) and writes keep it up to date, so
+        a query only reads the files its posting lists propose, plus those
+        of directories that did not fit in the budget. Without one, every
+        file below path is read.
+
+        Args:
+            query (str): The query, e.g. 'error "disk full" time*'.
+            path (str, optional): The directory to search. Defaults to the current directory.
+            session (Session, optional): Session whose working directory relative paths start from.
+
+        Returns:
+            list[str]: The absolute paths of the matching files, sorted.
+
+        Raises:
+            FileSystemError: If the query has no words.
+            NotADirectoryError: If path is not a directory.
+        """
+        clauses = parse_query(query)
+        if not clauses:
+            self.current.raise_error(FileSystemError, f"search: no words to search for in '{query}'")
+        start = PathResolver.resolve(self, path, must_exist=True, session=session)
+        if not isinstance(start, Directory):
+            start.raise_error(NotADirectoryError, name=start.name, directory=path)
+        text = self._text_index()
+        if text is None:
+            return sorted(self._scan(start, clauses, recurse=True))
+
+        found = []
+        confirm = any(len(words) > 1 for words, _ in clauses)  # Postings do not record word positions
+        for file in text.candidates(clauses):
+            trail = self._trail(file)
+            if trail is None:
+                text.discard(file)  # Detached by a recursive delete and not reclaimed yet
+            elif (start is self.root or any(ancestor is start for ancestor in trail)) and \
+                    (not confirm or matches(clauses, tokenize(file.content))):
+                found.append(_path_of(trail))
+        for directory in text.unindexed():
+            trail = self._trail(directory)
+            if trail is None:
+                text.discard(directory)
+            elif start is self.root or any(ancestor is start for ancestor in trail):
+                found.extend(self._scan(directory, clauses, recurse=False))
+        found.sort()
+        return found
+
+    def search_stats(self) -> dict:
+        """
+        Reports the size of the content index (see TextIndex.stats).
+
+        Raises:
+            FileSystemError: If the file system was created without a search budget.
+        """
+        if self.text is None:
+            self.current.raise_error(FileSystemError, "stats: content search indexing is not enabled")
+        return self._text_index().stats()
+
+    def _text_index(self) -> TextIndex | None:
+        text = self.text
+        if text is not None and self.root.text is not text:
+            text.build(self.root)
+        return text
+
+    def _scan(self, directory: Directory, clauses: list, recurse: bool) -> list[str]:
+        """
+        Returns the paths of the files in directory, and below it with recurse, whose content matches.
+        """
+        found = []
+        stack = [(directory, directory.get_absolute_path())]
+        while stack:
+            current, prefix = stack.pop()
+            for child in self._children(current):
+                if isinstance(child, Directory):
+                    if recurse:
+                        stack.append((child, f"{prefix}{PATH_DELIMITER}{child.name}"))
+                elif matches(clauses, tokenize(child.content)):
+                    found.append(f"{prefix}{PATH_DELIMITER}{child.name}")
+        return found
+
+    def _name_index(self) -> NameIndex:
+        if self.names is None:
+            names = NameIndex()
+            names.build(self.root)
+            self.names = names
+        return self.names
+
+    def _trail(self, node) -> list | None:
+        """
+        Returns node and its ancestors below the root, or None if node is no longer in the tree.
+        """
+        trail = []
+        parent = node.live_parent
+        while parent is not None:
+            if parent.find_child(node.name) is not node:
+                return None
+            trail.append(node)
+            node, parent = parent, parent.live_parent
+        return trail if node is self.root else None
+
+    def reclaim(self, budget: int = None) -> int:
+        """
+        Tears down directories detached by recursive deletes, a bounded number of nodes at a time.
+
+        Unlinking children one by one spreads the cost of freeing a large
+        subtree over later operations instead of paying it inside del_.
+
+        Args:
+            budget (int, optional): Maximum number of nodes to release, or None to drain everything.
+
+        Returns:
+            int: The number of nodes released.
+        """
+        released = 0
+        graveyard = self._graveyard
+        while graveyard and (budget is None or released < budget):
+            directory, epoch = graveyard[-1]
+            if not directory.children:
+                graveyard.pop()
+                continue
+            child = next(directory.children.values())
+            directory._unlink(child.name)
+            if directory.names is not None:
+                directory.names.discard(child)
+            if directory.text is not None:
+                directory.text.discard(child)
+            if child.quota is not None:
+                self.ledger.count_quotas(-1)
+            # Older nodes may still be shared with a snapshot, so only tear down nodes of the same epoch
+            if isinstance(child, Directory) and child._epoch == epoch and child.children_loaded \
+                    and child.children:
+                graveyard.append((child, epoch))
+            released += 1
+        return released
+
+    def _bury(self, directory: Directory) -> None:
+        """
+        Queues a detached directory for lazy reclamation, unless the working
+        directory of a session lives inside it and still needs it, or a snapshot shares it.
+        """
+        if directory._epoch != self.epoch:
+            return
+        for session in self.sessions:
+            node = session.cwd
+            while node is not None:
+                if node is directory:
+                    return
+                node = node.live_parent
+        self._graveyard.append((directory, self.epoch))
     
-    def cd(self, path: str) -> bool:
+    def cd(self, path: str, session: Session = None) -> bool:
         """
         Changes the current directory.
 
         Args:
             path (str): The path to change to.
+            session (Session, optional): Change this session's working directory instead.
 
         Returns:
             bool: True if the directory change is successful, False otherwise.
@@ -187,18 +881,20 @@ class FileSystem:
             NotFoundError: If the path does not exist.
             NotADirectoryError: If the target is not a directory.
         """
-        target = PathResolver.resolve(self, path, must_exist=True)
+        session = session or self.session
+        target = PathResolver.resolve(self, path, must_exist=True, session=session)
         if not isinstance(target, Directory):
-            target.raise_error(NotADirectoryError, name=target.name, directory=self.current.name)
-        self.current = target
+            target.raise_error(NotADirectoryError, name=target.name, directory=session.cwd.name)
+        session.cwd = target
         return True
     
-    def size(self, path: str) -> int:
+    def size(self, path: str, session: Session = None) -> int:
         """
         Get the size of a file or directory.
 
         Args:
             path (str): The path to the file or directory.
+            session (Session, optional): Session whose working directory relative paths start from.
 
         Returns:
             int: The size of the file or directory in bytes.
@@ -206,5 +902,12 @@ class FileSystem:
         Raises:
             NotFoundError: If the path does not exist.
         """
-        target = PathResolver.resolve(self, path, must_exist=True)
-        return target.size
\ No newline at end of file
+        target = PathResolver.resolve(self, path, must_exist=True, session=session)
+        return target.size
+
+
+def _path_of(trail: list) -> str:
+    """
+    Returns the absolute path of the first node of a trail (see FileSystem._trail).
+    """
+    return PATH_DELIMITER.join([ROOT, *(ancestor.name for ancestor in reversed(trail))])
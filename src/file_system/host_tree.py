@@ -0,0 +1,204 @@
+"""
+Bulk copying between the simulator and a real directory tree.
+
+Importing walks the host tree with os.scandir and builds detached nodes
+directly, like the image loader: names are checked with validate_name
+before anything is read, and no size is propagated while building. File contents
+are read in a thread pool, since reads release the GIL. Sizes are then
+summed bottom-up in one pass, and the caller attaches the finished subtrees
+with a single add_child each.
+
+Contents are decoded as UTF-8 with surrogateescape, as os.scandir decodes
+names, and images and the journal encode them the same way: files and names
+that are not valid UTF-8 keep their bytes when saved, journaled or exported. Exports hand file contents
+to the writer threads a batch at a time, as directories are walked.
+"""
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from time import time_ns
+
+from src.file_system.content import ChunkedContent
+from src.file_system.directory import Directory
+from src.file_system.exceptions import InvalidNameError
+from src.file_system.file import File
+from src.file_system.sorted_list import SortedMap
+from src.file_system.validation import validate_name
+
+DEFAULT_WORKERS = 8
+BATCH = 256  # Files per thread pool task; one task per file costs more than reading a small file
+ENCODING = 'utf-8'
+ERRORS = 'surrogateescape'
+
+
+def _new_directory(name: str, parent, epoch: int, now: int) -> Directory:
+    directory = Directory.__new__(Directory)
+    directory.name = name
+    directory.ctime = directory.mtime = now
+    directory.parent = parent
+    directory._size = 0
+    directory._epoch = epoch
+    directory._index = {}  # The child maps are built once every child is known (see read_tree)
+    directory.count = 0
+    directory.generation = 0
+    directory._lock = None
+    directory.quota = None
+    directory.names = None
+    directory.text = None
+    directory.ledger = None
+    directory._successor = None
+    return directory
+
+
+def _new_file(name: str, parent, epoch: int, now: int) -> File:
+    file = File.__new__(File)
+    file.name = name
+    file.ctime = file.mtime = file.rtime = now
+    file.parent = parent
+    file._size = 0
+    file._epoch = epoch
+    return file
+
+
+def _check_name(entity_type: str, entry: os.DirEntry) -> None:
+    try:
+        validate_name(entity_type, entry.name)
+    except InvalidNameError as e:
+        raise InvalidNameError(entry.name, f"{e.reason} Host path: '{entry.path}'") from None
+
+
+def _read_batch(host_paths: list) -> list:
+    contents = []
+    for host_path in host_paths:
+        with open(host_path, encoding=ENCODING, errors=ERRORS, newline='') as host_file:
+            contents.append(host_file.read())
+    return contents
+
+
+def _batches(items: list):
+    return (items[start:start + BATCH] for start in range(0, len(items), BATCH))
+
+
+def read_tree(host_path: str, epoch: int = 0, workers: int = DEFAULT_WORKERS, blobs=None) -> tuple[list, int]:
+    """
+    Builds detached nodes for everything inside a host directory.
+
+    Symbolic links and special files are skipped. Names are validated while
+    the host tree is walked, before any content is read.
+
+    Args:
+        host_path (str): The host directory to read.
+        epoch (int, optional): Snapshot epoch to stamp on the new nodes.
+        workers (int, optional): Number of threads reading file contents.
+        blobs (BlobStore, optional): Pool to share file contents through.
+
+    Returns:
+        (list[FSNode], int): The top-level nodes, parented to None, and the total number of nodes.
+
+    Raises:
+        InvalidNameError: If a host entry's name is not valid in the simulator.
+    """
+    now = time_ns()
+    holder = _new_directory("", None, epoch, now)  # Temporary parent of the top-level nodes
+    directories = [holder]
+    files, file_paths = [], []
+
+    stack = [(holder, host_path)]
+    while stack:
+        directory, path = stack.pop()
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    _check_name("Directory", entry)
+                    node = _new_directory(entry.name, directory, epoch, now)
+                    directories.append(node)
+                    stack.append((node, entry.path))
+                elif entry.is_file(follow_symlinks=False):
+                    _check_name("File", entry)
+                    node = _new_file(entry.name, directory, epoch, now)
+                    files.append(node)
+                    file_paths.append(entry.path)
+                else:
+                    continue
+                directory._index[node.name] = node
+                directory.count += 1
+
+    new_content = blobs.new_content if blobs is not None else ChunkedContent
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        contents = (content for batch in pool.map(_read_batch, _batches(file_paths)) for content in batch)
+        for node, content in zip(files, contents):
+            node._store = new_content(content)
+            node._size = len(content)
+            node.parent._size += node._size
+
+    # Parents precede their children in directories, so the reverse order sums sizes bottom-up
+    for directory in reversed(directories):
+        directory.children = SortedMap(enumerate(directory._index.values()))
+        directory.ordered = SortedMap((name, sequence) for sequence, name in enumerate(directory._index))
+        if directory.parent is not None:
+            directory.parent._size += directory._size
+
+    top = list(holder.children.values())
+    for node in top:
+        node.parent = None
+    return top, len(directories) - 1 + len(files)
+
+
+def _write_batch(tasks: list) -> None:
+    for host_path, content in tasks:
+        with open(host_path, 'w', encoding=ENCODING, errors=ERRORS, newline='') as host_file:
+            host_file.write(content)
+
+
+def write_tree(directory: Directory, host_path: str, workers: int = DEFAULT_WORKERS, lock_of=None) -> int:
+    """
+    Writes the contents of a directory into a host directory, creating it if needed.
+    Existing host files with the same names are overwritten.
+
+    Args:
+        directory (Directory): The directory to export.
+        host_path (str): The host directory to write to.
+        workers (int, optional): Number of threads writing file contents.
+        lock_of (callable, optional): Returns the RWLock to read-hold while a directory's
+            children and file contents are collected (see ConcurrentFileSystem).
+
+    Returns:
+        int: The number of nodes written.
+    """
+    os.makedirs(host_path, exist_ok=True)
+    written = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()  # Submitted batches; bounded so collected contents do not pile up
+        batch = []
+        stack = [(directory, host_path)]
+        while stack:
+            current, path = stack.pop()
+            lock = lock_of(current) if lock_of is not None else None
+            if lock is not None:
+                lock.acquire()
+            try:
+                children = [(child, child.content if isinstance(child, File) else None)
+                            for child in current.iter_children()]
+            finally:
+                if lock is not None:
+                    lock.release()
+
+            for child, content in children:
+                child_path = os.path.join(path, child.name)
+                if content is None:
+                    os.makedirs(child_path, exist_ok=True)
+                    stack.append((child, child_path))
+                else:
+                    batch.append((child_path, content))
+                    if len(batch) == BATCH:
+                        pending.append(pool.submit(_write_batch, batch))
+                        batch = []
+                        if len(pending) > 2 * workers:
+                            pending.popleft().result()
+                written += 1
+
+        if batch:
+            pending.append(pool.submit(_write_batch, batch))
+        for future in pending:
+            future.result()
+    return written
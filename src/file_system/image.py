@@ -0,0 +1,257 @@
+"""
+Compact binary image of a FileSystem tree, loaded lazily through mmap.
+
+Layout (little endian):
+    header      HEADER: magic, version, node count, name area offset, content area offset,
+                and the last journal sequence number the image includes
+    node table  one NODE record per node, in breadth-first order so the
+                children of every directory are contiguous
+    name area   UTF-8 names, referenced by (offset, length)
+    content     UTF-8 file contents, referenced by (offset, length)
+
+Names and contents are encoded with surrogateescape, so those imported from
+host files that are not valid UTF-8 (see host_tree) keep their bytes.
+
+Loading maps the file and builds only the root. Every other Directory and
+File is created the first time its parent's children are needed, and file
+content is decoded the first time it is read or written.
+"""
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from collections import deque
+from contextlib import contextmanager, suppress
+
+from src.file_system.constants import ROOT
+from src.file_system.exceptions import FileSystemError
+from src.file_system.content import ChunkedContent
+from src.file_system.directory import Directory
+from src.file_system.file import File
+from src.file_system.sorted_list import SortedMap
+
+MAGIC = b'FSIM'
+VERSION = 2
+HEADER = struct.Struct('<4sHHQQQQ')  # magic, version, flags, node_count, names_offset, content_offset, lsn
+NODE = struct.Struct('<BxHIQIQQQqq')  # kind, name_len, first_child, name_off, child_count,
+                                      # content_off, content_len, size, ctime, mtime
+KIND_DIRECTORY = 0
+KIND_FILE = 1
+ENCODING = 'utf-8'
+ERRORS = 'surrogateescape'
+
+
+class Image:
+    """
+    A memory-mapped image shared by the nodes loaded from it.
+    """
+    __slots__ = ('_file', '_map', 'node_count', 'names_offset', 'content_offset', 'lsn', '_table_offset')
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): Path of the image file.
+
+        Raises:
+            FileSystemError: If the file is not a valid image.
+        """
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise FileSystemError(f"'{path}' is not a file system image.")
+
+        try:
+            magic, version, _, self.node_count, self.names_offset, self.content_offset, self.lsn = \
+                HEADER.unpack_from(self._map, 0)
+        except struct.error:
+            magic = version = None
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise FileSystemError(f"'{path}' is not a version {VERSION} file system image.")
+        self._table_offset = HEADER.size
+
+    def record(self, index: int) -> tuple:
+        """
+        Returns the NODE fields of a node.
+        """
+        return NODE.unpack_from(self._map, self._table_offset + index * NODE.size)
+
+    def name(self, offset: int, length: int) -> str:
+        start = self.names_offset + offset
+        return self._map[start:start + length].decode(ENCODING, ERRORS)
+
+    def content(self, offset: int, length: int) -> str:
+        return self.raw_content(offset, length).decode(ENCODING, ERRORS)
+
+    def raw_content(self, offset: int, length: int) -> bytes:
+        start = self.content_offset + offset
+        return self._map[start:start + length]
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+class ImageDirectory(Directory):
+    """
+    Directory whose children are created from the image on first access.
+    """
+    __slots__ = ('_image', '_first_child')
+
+    @property
+    def children_loaded(self) -> bool:
+        return self._image is None
+
+    def __getattr__(self, name):
+        # The child containers are left unset until first needed
+        if name in ('children', '_index', 'ordered') and self._image is not None:
+            self._load_children()
+            return getattr(self, name)
+        return super().__getattr__(name)
+
+    def _load_children(self) -> None:
+        image, first = self._image, self._first_child
+        children = [_load_node(image, index, self) for index in range(first, first + self.count)]
+        self.children = SortedMap(enumerate(children))
+        self._index = {child.name: child for child in children}
+        self.ordered = SortedMap((child.name, sequence) for sequence, child in enumerate(children))
+        self._image = None
+
+
+class ImageFile(File):
+    """
+    File whose content is decoded from the image on first access.
+    """
+    __slots__ = ('_image', '_content_span')
+
+    @property
+    def size(self) -> int:
+        if self._image is not None:
+            return self._size  # Recorded size, without decoding the content
+        return len(self._store)
+
+    def __getattr__(self, name):
+        if name == '_store':
+            image = self._image
+            if image is None:  # Decoded by another thread in the meantime
+                return File._store.__get__(self)
+            self._store = ChunkedContent(image.content(*self._content_span))
+            self._image = None
+            return self._store
+        return super().__getattr__(name)
+
+
+def _load_node(image: Image, index: int, parent):
+    """
+    Creates the node for one NODE record, without validating its name again.
+    """
+    kind, name_len, first_child, name_off, child_count, content_off, content_len, size, ctime, mtime = image.record(index)
+    if kind == KIND_DIRECTORY:
+        node = ImageDirectory.__new__(ImageDirectory)
+        node.count = child_count
+        node.generation = 0
+        node._lock = None
+        node.quota = None
+        node.names = None
+        node.text = None
+        node.ledger = parent.ledger if parent is not None else None
+        node._successor = None
+        node._first_child = first_child
+    else:
+        node = ImageFile.__new__(ImageFile)
+        node._content_span = (content_off, content_len)
+        node.rtime = ctime
+    node._image = image
+    node._epoch = 0
+    node.name = image.name(name_off, name_len) if parent is not None else ROOT
+    node.parent = parent
+    node._size = size
+    node.ctime = ctime
+    node.mtime = mtime
+    return node
+
+
+def load_image(path: str) -> tuple[Directory, int]:
+    """
+    Maps an image and returns its root directory; the rest of the tree loads on demand.
+
+    Args:
+        path (str): Path of the image file.
+
+    Returns:
+        (Directory, int): The root directory and the journal sequence number the image includes.
+
+    Raises:
+        FileSystemError: If the file is not a valid image.
+    """
+    image = Image(path)
+    return _load_node(image, 0, None), image.lsn
+
+
+@contextmanager
+def atomic_output(path: str):
+    """
+    Opens a temporary file next to path for writing, and moves it into place
+    once the block completes. If the block raises, the temporary file is
+    removed and path is left as it was.
+    """
+    output = tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(path)), delete=False)
+    try:
+        with output:
+            yield output
+        os.replace(output.name, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(output.name)
+        raise
+
+
+def save_image(root: Directory, path: str, lsn: int = 0) -> None:
+    """
+    Writes the tree under root as an image. The image is written to a
+    temporary file and moved into place, so saving over the image the tree
+    was loaded from is safe.
+
+    Args:
+        root (Directory): The root of the tree to save.
+        path (str): Destination path.
+        lsn (int, optional): Last journal sequence number reflected in the tree.
+    """
+    table = bytearray()
+    names = bytearray()
+    with tempfile.TemporaryFile() as content, atomic_output(path) as output:
+        content_length = 0
+        next_index = 1  # Root is node 0; children are numbered as they are queued
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            name = node.name.encode(ENCODING, ERRORS)
+            name_off = len(names)
+            names += name
+            if isinstance(node, Directory):
+                record = (KIND_DIRECTORY, len(name), next_index, name_off, node.count, 0, 0, node.size,
+                          node.ctime, node.mtime)
+                for child in node.children.values():
+                    queue.append(child)
+                    next_index += 1
+            else:
+                if isinstance(node, ImageFile) and node._image is not None:
+                    data = node._image.raw_content(*node._content_span)  # Copy untouched content as-is
+                else:
+                    data = node.content.encode(ENCODING, ERRORS)
+                content.write(data)
+                record = (KIND_FILE, len(name), 0, name_off, 0, content_length, len(data), node.size,
+                          node.ctime, node.mtime)
+                content_length += len(data)
+            table += NODE.pack(*record)
+
+        node_count = len(table) // NODE.size
+        names_offset = HEADER.size + len(table)
+        output.write(HEADER.pack(MAGIC, VERSION, 0, node_count, names_offset, names_offset + len(names), lsn))
+        output.write(table)
+        output.write(names)
+        content.seek(0)
+        shutil.copyfileobj(content, output)
@@ -0,0 +1,443 @@
+from array import array
+from time import time_ns
+
+from src.file_system.constants import PATH_DELIMITER
+from src.file_system.content import ChunkedContent
+from src.file_system.sorted_list import SortedMap
+
+NONE = -1  # Inode column value for "no node"
+KIND_DIRECTORY = 0
+KIND_FILE = 1
+
+_EMPTY = -1  # Hash slot never used
+_DELETED = -2  # Hash slot whose entry was removed; probing continues past it
+_MIN_SLOTS = 8
+ENCODING = 'utf-8'
+ERRORS = 'surrogateescape'  # Names loaded from images may carry escaped host bytes (see image)
+
+
+class InodeTable:
+    """
+    Struct-of-arrays storage for a file system tree.
+
+    Every node is an integer inode indexing parallel typed arrays: kind,
+    parent, first and last child, next and previous sibling, child count,
+    name id, size, ctime and mtime. File contents live in a list indexed by
+    inode: the str a file was written with, which costs nothing more, or a
+    ChunkedContent once it is appended to, so appends only copy the appended
+    data (see append_content). Inodes of deleted nodes are recycled.
+
+    Names are interned in a string table: their UTF-8 bytes are appended to
+    one buffer and a name id indexes offset, length, hash and reference
+    count columns, so a name used in many directories is stored once.
+
+    Both lookups, name to name id and (parent, name id) to child inode, are
+    open-addressing hash tables held in arrays of ids, which compare keys
+    against the columns instead of storing them. This keeps a node at about
+    a hundred bytes, against several hundred for the object tree's node,
+    index entry and sorted map entries.
+
+    A directory listed in name order gets a SortedMap of its child names,
+    kept up to date from then on (see ordered), so only the directories
+    that need one pay for it.
+    """
+    __slots__ = ('kind', 'parent', 'first_child', 'last_child', 'next_sibling', 'prev_sibling', 'count', 'name',
+                 'size', 'ctime', 'mtime', 'contents', '_free',
+                 '_children', '_children_used', '_ordered',
+                 '_names', '_name_offset', '_name_length', '_name_hash', '_name_refs', '_name_slots',
+                 '_name_slots_used', '_free_names', '_name_garbage')
+
+    def __init__(self):
+        self.kind = array('b')
+        self.parent = array('i')
+        self.first_child = array('i')
+        self.last_child = array('i')
+        self.next_sibling = array('i')
+        self.prev_sibling = array('i')
+        self.count = array('i')
+        self.name = array('i')
+        self.size = array('q')
+        self.ctime = array('q')
+        self.mtime = array('q')
+        self.contents = []  # File content by inode, str or ChunkedContent; None for directories and free inodes
+        self._free = []
+        self._children = array('i', [_EMPTY]) * _MIN_SLOTS  # Child inodes, hashed by (parent, name id)
+        self._children_used = 0  # Live and deleted slots
+        self._ordered = {}  # Directory inode to a SortedMap of child name to inode, once listed in name order
+
+        self._names = bytearray()
+        self._name_offset = array('I')
+        self._name_length = array('H')
+        self._name_hash = array('q')
+        self._name_refs = array('i')
+        self._name_slots = array('i', [_EMPTY]) * _MIN_SLOTS  # Name ids, hashed by name
+        self._name_slots_used = 0
+        self._free_names = []
+        self._name_garbage = 0  # Bytes of released names still in the buffer
+
+    def __len__(self):
+        return len(self.kind) - len(self._free)
+
+    # String table
+
+    def name_of(self, inode: int) -> str:
+        """
+        Returns the name of a node.
+        """
+        name_id = self.name[inode]
+        offset = self._name_offset[name_id]
+        return self._names[offset:offset + self._name_length[name_id]].decode(ENCODING, ERRORS)
+
+    def _find_name(self, name: str, name_hash: int) -> int:
+        slots, hashes = self._name_slots, self._name_hash
+        mask = len(slots) - 1
+        index = name_hash & mask
+        encoded = None
+        while True:
+            name_id = slots[index]
+            if name_id == _EMPTY:
+                return NONE
+            if name_id >= 0 and hashes[name_id] == name_hash:
+                if encoded is None:
+                    encoded = name.encode(ENCODING, ERRORS)
+                offset = self._name_offset[name_id]
+                if self._names[offset:offset + self._name_length[name_id]] == encoded:
+                    return name_id
+            index = (index + 1) & mask
+
+    def intern(self, name: str) -> int:
+        """
+        Returns the id of name in the string table, adding a reference to it.
+        """
+        name_hash = hash(name)
+        name_id = self._find_name(name, name_hash)
+        if name_id == NONE:
+            encoded = name.encode(ENCODING, ERRORS)
+            if self._free_names:
+                name_id = self._free_names.pop()
+                self._name_offset[name_id] = len(self._names)
+                self._name_length[name_id] = len(encoded)
+                self._name_hash[name_id] = name_hash
+            else:
+                name_id = len(self._name_refs)
+                self._name_offset.append(len(self._names))
+                self._name_length.append(len(encoded))
+                self._name_hash.append(name_hash)
+                self._name_refs.append(0)
+            self._names += encoded
+            self._name_refs[name_id] = 1
+            self._name_slots_used = _insert(self._name_slots, name_hash, name_id, self._name_slots_used)
+            if self._name_slots_used * 2 > len(self._name_slots):
+                self._rehash_names()
+        else:
+            self._name_refs[name_id] += 1
+        return name_id
+
+    def _release_name(self, name_id: int) -> None:
+        self._name_refs[name_id] -= 1
+        if self._name_refs[name_id]:
+            return
+        _remove(self._name_slots, self._name_hash[name_id], name_id)
+        self._free_names.append(name_id)
+        self._name_garbage += self._name_length[name_id]
+        if self._name_garbage > 4096 and self._name_garbage * 2 > len(self._names):
+            self._compact_names()
+
+    def _rehash_names(self) -> None:
+        live = [name_id for name_id in range(len(self._name_refs)) if self._name_refs[name_id]]
+        self._name_slots = _new_slots(len(live))
+        self._name_slots_used = 0
+        for name_id in live:
+            self._name_slots_used = _insert(self._name_slots, self._name_hash[name_id], name_id, self._name_slots_used)
+
+    def _compact_names(self) -> None:
+        """
+        Rewrites the name buffer without the bytes of released names.
+        """
+        names = bytearray()
+        offsets, lengths = self._name_offset, self._name_length
+        for name_id in range(len(self._name_refs)):
+            if self._name_refs[name_id]:
+                offset = offsets[name_id]
+                offsets[name_id] = len(names)
+                names += self._names[offset:offset + lengths[name_id]]
+        self._names = names
+        self._name_garbage = 0
+
+    # Nodes
+
+    def allocate(self, kind: int, name: str, content: str = None, now: int = None) -> int:
+        """
+        Creates a detached node and returns its inode.
+
+        Args:
+            kind (int): KIND_DIRECTORY or KIND_FILE.
+            name (str): The node name.
+            content (str, optional): File content.
+            now (int, optional): Creation time in nanoseconds. Defaults to the current time.
+
+        Returns:
+            int: The new inode.
+        """
+        now = time_ns() if now is None else now
+        name_id = self.intern(name)
+        size = len(content) if content else 0
+        if self._free:
+            inode = self._free.pop()
+            self.kind[inode] = kind
+            self.parent[inode] = self.first_child[inode] = self.last_child[inode] = NONE
+            self.next_sibling[inode] = self.prev_sibling[inode] = NONE
+            self.count[inode] = 0
+            self.name[inode] = name_id
+            self.size[inode] = size
+            self.ctime[inode] = self.mtime[inode] = now
+            self.contents[inode] = content
+        else:
+            inode = len(self.kind)
+            self.kind.append(kind)
+            for column in (self.parent, self.first_child, self.last_child, self.next_sibling, self.prev_sibling):
+                column.append(NONE)
+            self.count.append(0)
+            self.name.append(name_id)
+            self.size.append(size)
+            self.ctime.append(now)
+            self.mtime.append(now)
+            self.contents.append(content)
+        return inode
+
+    def append_loaded(self, kind: int, name: str, parent: int, first_child: int, count: int, size: int, ctime: int,
+                      mtime: int, content: str = None) -> int:
+        """
+        Appends a node read from a breadth-first image, where it is numbered
+        after its parent and the children of a directory are contiguous.
+        The recorded size is used as is, and sibling links follow from the numbering.
+
+        Returns:
+            int: The new inode, equal to its record number.
+        """
+        inode = len(self.kind)
+        name_id = self.intern(name)
+        self.kind.append(kind)
+        self.parent.append(parent)
+        self.first_child.append(first_child)
+        self.last_child.append(first_child + count - 1 if count else NONE)
+        self.count.append(count)
+        self.name.append(name_id)
+        self.size.append(size)
+        self.ctime.append(ctime)
+        self.mtime.append(mtime)
+        self.contents.append(content)
+        if parent == NONE:
+            self.prev_sibling.append(NONE)
+            self.next_sibling.append(NONE)
+        else:
+            self.prev_sibling.append(NONE if self.first_child[parent] == inode else inode - 1)
+            self.next_sibling.append(NONE if self.last_child[parent] == inode else inode + 1)
+            self._index_child(parent, name_id, inode)
+        return inode
+
+    # Child lookup
+
+    def find(self, directory: int, name: str) -> int:
+        """
+        Returns the inode of a child by name, or NONE.
+        """
+        name_id = self._find_name(name, hash(name))
+        if name_id == NONE:
+            return NONE
+        slots, parent, names = self._children, self.parent, self.name
+        mask = len(slots) - 1
+        index = _child_hash(directory, name_id) & mask
+        while True:
+            inode = slots[index]
+            if inode == _EMPTY:
+                return NONE
+            if inode >= 0 and parent[inode] == directory and names[inode] == name_id:
+                return inode
+            index = (index + 1) & mask
+
+    def ordered(self, directory: int) -> SortedMap:
+        """
+        Returns the children of directory keyed by name in sorted order,
+        building the map the first time and keeping it up to date after.
+        """
+        ordered = self._ordered.get(directory)
+        if ordered is None:
+            ordered = SortedMap((self.name_of(child), child) for child in self.children(directory))
+            self._ordered[directory] = ordered
+        return ordered
+
+    def _index_child(self, directory: int, name_id: int, inode: int) -> None:
+        self._children_used = _insert(self._children, _child_hash(directory, name_id), inode, self._children_used)
+        if self._children_used * 2 > len(self._children):
+            self._rehash_children()
+
+    def _rehash_children(self) -> None:
+        parent, kind = self.parent, self.kind
+        live = [inode for inode in range(len(kind)) if kind[inode] != NONE and parent[inode] != NONE]
+        self._children = _new_slots(len(live))
+        self._children_used = 0
+        for inode in live:
+            self._children_used = _insert(self._children, _child_hash(parent[inode], self.name[inode]), inode,
+                                          self._children_used)
+
+    # Tree shape
+
+    def link(self, directory: int, inode: int) -> None:
+        """
+        Appends a detached node to the children of directory and adds its size to every ancestor.
+        """
+        self.parent[inode] = directory
+        self._index_child(directory, self.name[inode], inode)
+        ordered = self._ordered.get(directory)
+        if ordered is not None:
+            ordered.add(self.name_of(inode), inode)
+        last = self.last_child[directory]
+        self.prev_sibling[inode] = last
+        self.next_sibling[inode] = NONE
+        if last == NONE:
+            self.first_child[directory] = inode
+        else:
+            self.next_sibling[last] = inode
+        self.last_child[directory] = inode
+        self.count[directory] += 1
+        self.mtime[directory] = time_ns()
+        self.grow(directory, self.size[inode])
+
+    def unlink(self, inode: int) -> None:
+        """
+        Detaches a node from its parent and subtracts its size from every ancestor.
+        """
+        directory = self.parent[inode]
+        _remove(self._children, _child_hash(directory, self.name[inode]), inode)
+        ordered = self._ordered.get(directory)
+        if ordered is not None:
+            ordered.remove(self.name_of(inode))
+        previous, following = self.prev_sibling[inode], self.next_sibling[inode]
+        if previous == NONE:
+            self.first_child[directory] = following
+        else:
+            self.next_sibling[previous] = following
+        if following == NONE:
+            self.last_child[directory] = previous
+        else:
+            self.prev_sibling[following] = previous
+        self.parent[inode] = NONE
+        self.count[directory] -= 1
+        self.mtime[directory] = time_ns()
+        self.grow(directory, -self.size[inode])
+
+    def grow(self, inode: int, delta: int) -> None:
+        """
+        Adds delta to the size of inode and of all its ancestors.
+        """
+        if not delta:
+            return
+        size, parent = self.size, self.parent
+        while inode != NONE:
+            size[inode] += delta
+            inode = parent[inode]
+
+    def content(self, inode: int) -> str:
+        """
+        Returns the whole content of a file.
+        """
+        content = self.contents[inode]
+        return content if isinstance(content, str) else content.getvalue()
+
+    def content_store(self, inode: int) -> ChunkedContent:
+        """
+        Returns the content of a file as a ChunkedContent, for ranged reads.
+        A file never appended to is wrapped without copying its content.
+        """
+        content = self.contents[inode]
+        return ChunkedContent(content) if isinstance(content, str) else content
+
+    def append_content(self, inode: int, data: str) -> None:
+        """
+        Appends to the content of a file and grows the sizes along its ancestors.
+        """
+        content = self.contents[inode]
+        if isinstance(content, str):
+            content = self.contents[inode] = ChunkedContent(content)
+        content.append(data)
+        self.grow(inode, len(data))
+
+    def free(self, inode: int) -> int:
+        """
+        Releases a detached node and its whole subtree for reuse.
+
+        Returns:
+            int: The number of nodes released.
+        """
+        released = 0
+        stack = [inode]
+        while stack:
+            node = stack.pop()
+            if self._ordered:
+                self._ordered.pop(node, None)  # The inode may be reused for another directory
+            child = self.first_child[node]
+            while child != NONE:
+                _remove(self._children, _child_hash(node, self.name[child]), child)
+                stack.append(child)
+                child = self.next_sibling[child]
+            self._release_name(self.name[node])
+            self.contents[node] = None
+            self.kind[node] = NONE
+            self.parent[node] = NONE
+            self._free.append(node)
+            released += 1
+        return released
+
+    def children(self, directory: int):
+        """
+        Yields the children of directory in insertion order.
+        """
+        following = self.next_sibling
+        child = self.first_child[directory]
+        while child != NONE:
+            yield child
+            child = following[child]
+
+    def path(self, inode: int) -> str:
+        """
+        Returns the names from the root down to inode, joined by "/".
+        """
+        parts = []
+        while inode != NONE:
+            parts.append(self.name_of(inode))
+            inode = self.parent[inode]
+        return PATH_DELIMITER.join(reversed(parts))
+
+
+def _child_hash(directory: int, name_id: int) -> int:
+    return directory * 0x9E3779B1 ^ name_id * 0x85EBCA77
+
+
+def _new_slots(live: int) -> array:
+    capacity = _MIN_SLOTS
+    while capacity < live * 4:  # A quarter full after a rebuild, so it doubles before the next one
+        capacity *= 2
+    return array('i', [_EMPTY]) * capacity
+
+
+def _insert(slots: array, key_hash: int, value: int, used: int) -> int:
+    """
+    Stores value in the first free slot of its probe sequence. Returns the new count of used slots.
+    """
+    mask = len(slots) - 1
+    index = key_hash & mask
+    while slots[index] >= 0:
+        index = (index + 1) & mask
+    if slots[index] == _EMPTY:
+        used += 1  # Reusing a deleted slot does not lengthen any probe sequence
+    slots[index] = value
+    return used
+
+
+def _remove(slots: array, key_hash: int, value: int) -> None:
+    mask = len(slots) - 1
+    index = key_hash & mask
+    while slots[index] != value:
+        index = (index + 1) & mask
+    slots[index] = _DELETED
@@ -0,0 +1,213 @@
+"""
+Write-ahead journal of mutating FileSystem operations.
+
+Every record is framed as RECORD (payload length, CRC32 of the payload)
+followed by the payload: ENTRY (sequence number, operation, flags, field
+count) and then each field as a length-prefixed UTF-8 string, encoded with
+surrogateescape like images. Paths are stored absolute, so replay does not
+depend on the working directory.
+
+Records are buffered and written in groups: after every group_commit_ops
+records, and, when group_commit_ms is set, by a background flusher at least
+that often. Each group is fsynced once. A record torn by a crash fails its
+CRC check and ends replay; the journal is truncated there.
+"""
+import os
+import struct
+import threading
+from time import monotonic
+from zlib import crc32
+
+from src.file_system.exceptions import FileSystemError
+
+RECORD = struct.Struct('<II')   # payload length, crc32
+ENTRY = struct.Struct('<QBBH')  # lsn, op, flags, field count
+FIELD = struct.Struct('<I')     # field length
+
+OP_MKDIR = 1
+OP_TOUCH = 2
+OP_WRITE = 3
+OP_DEL = 4
+
+FLAG_OVERWRITE = 1
+FLAG_RECURSE = 2
+
+ENCODING = 'utf-8'
+ERRORS = 'surrogateescape'  # Host content that is not UTF-8 keeps its bytes (see host_tree)
+
+
+class Journal:
+    """
+    Append-only journal file with group commit.
+    """
+    def __init__(self, path: str, group_commit_ops: int = 64, group_commit_ms: float = None, fsync: bool = True):
+        """
+        Args:
+            path (str): Path of the journal file; created if missing.
+            group_commit_ops (int, optional): Commit after this many buffered records. Defaults to 64.
+            group_commit_ms (float, optional): Also commit buffered records at least this often, in milliseconds.
+            fsync (bool, optional): If True, fsync each committed group. Defaults to True.
+        """
+        self.path = path
+        self.group_commit_ops = max(1, group_commit_ops)
+        self.group_commit_ms = group_commit_ms
+        self.fsync = fsync
+        self.last_lsn = 0
+        self.commits = 0
+        self._file = open(path, 'ab+')
+        self._buffer = bytearray()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = None
+        if group_commit_ms:
+            self._flusher = threading.Thread(target=self._flush_periodically, name="journal-flusher", daemon=True)
+            self._flusher.start()
+
+    def append(self, op: int, flags: int = 0, *fields: str) -> int:
+        """
+        Buffers one record, committing the group if it is full.
+
+        Args:
+            op (int): One of the OP_* codes.
+            flags (int, optional): FLAG_* bits.
+            *fields (str): The operation's arguments.
+
+        Returns:
+            int: The record's sequence number.
+        """
+        with self._lock:
+            self.last_lsn += 1
+            payload = bytearray(ENTRY.pack(self.last_lsn, op, flags, len(fields)))
+            for field in fields:
+                data = field.encode(ENCODING, ERRORS)
+                payload += FIELD.pack(len(data))
+                payload += data
+            self._buffer += RECORD.pack(len(payload), crc32(payload))
+            self._buffer += payload
+            self._pending += 1
+            if self._pending >= self.group_commit_ops:
+                self._commit_locked()
+            return self.last_lsn
+
+    def commit(self) -> None:
+        """
+        Writes and syncs every buffered record.
+        """
+        with self._lock:
+            self._commit_locked()
+
+    def records(self, after_lsn: int = 0):
+        """
+        Reads committed records, stopping at the first torn or corrupt one,
+        which is truncated away so later appends start on a clean boundary.
+
+        Args:
+            after_lsn (int, optional): Skip records up to and including this sequence number.
+
+        Yields:
+            (int, int, int, list[str]): Sequence number, op, flags and fields of each record.
+        """
+        with self._lock:
+            self._commit_locked()
+            self._file.seek(0)
+            data = self._file.read()
+
+        offset = 0
+        while offset + RECORD.size <= len(data):
+            length, checksum = RECORD.unpack_from(data, offset)
+            start = offset + RECORD.size
+            payload = data[start:start + length]
+            if len(payload) < length or crc32(payload) != checksum:
+                break
+            lsn, op, flags, count = ENTRY.unpack_from(payload, 0)
+            position = ENTRY.size
+            fields = []
+            for _ in range(count):
+                (size,) = FIELD.unpack_from(payload, position)
+                position += FIELD.size
+                fields.append(payload[position:position + size].decode(ENCODING, ERRORS))
+                position += size
+            self.last_lsn = max(self.last_lsn, lsn)
+            offset = start + length
+            if lsn > after_lsn:
+                yield lsn, op, flags, fields
+
+        if offset < len(data):
+            with self._lock:
+                self._file.truncate(offset)
+
+    def truncate(self) -> None:
+        """
+        Discards every record, after a checkpoint has captured them.
+        """
+        with self._lock:
+            self._buffer.clear()
+            self._pending = 0
+            self._file.truncate(0)
+            self._sync()
+
+    def close(self) -> None:
+        """
+        Commits buffered records and closes the journal.
+        """
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            if not self._file.closed:
+                self._commit_locked()
+                self._file.close()
+
+    def _commit_locked(self) -> None:
+        if not self._buffer:
+            return
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(self._buffer)
+        self._buffer.clear()
+        self._pending = 0
+        self._sync()
+        self.commits += 1
+
+    def _sync(self) -> None:
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _flush_periodically(self) -> None:
+        interval = self.group_commit_ms / 1000
+        deadline = monotonic() + interval
+        while not self._closed.wait(max(0.0, deadline - monotonic())):
+            self.commit()
+            deadline = monotonic() + interval
+
+
+def replay(fs, journal: Journal, after_lsn: int = 0) -> int:
+    """
+    Re-applies journaled operations to a file system.
+
+    Args:
+        fs (FileSystem): The file system, without a journal attached.
+        journal (Journal): The journal to read.
+        after_lsn (int, optional): Sequence number already reflected in fs.
+
+    Returns:
+        int: The number of operations replayed.
+
+    Raises:
+        FileSystemError: If a record has an unknown operation.
+    """
+    replayed = 0
+    for lsn, op, flags, fields in journal.records(after_lsn):
+        if op == OP_MKDIR:
+            fs.mkdir(*fields)
+        elif op == OP_TOUCH:
+            fs.touch(fields[0], content=fields[1])
+        elif op == OP_WRITE:
+            fs.write(fields[0], fields[1], overwrite=bool(flags & FLAG_OVERWRITE))
+        elif op == OP_DEL:
+            fs.del_(fields[0], recurse=bool(flags & FLAG_RECURSE))
+        else:
+            raise FileSystemError(f"Unknown journal operation {op} at sequence number {lsn}.")
+        replayed += 1
+    return replayed
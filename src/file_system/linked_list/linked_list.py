@@ -1,13 +1,13 @@
 from __future__ import annotations
-from itertools import count
 
 from src.file_system.constants import INDENT_STR
 
 class _LinkedListNode:
-    __ids = count(1)
     """
     Node in a linked list
     """    
+    __slots__ = ('data', 'next', 'prev')
+
     def __init__(self, data: any, prev: _LinkedListNode=None):
         """
         Constructs a linked list node
@@ -16,7 +16,6 @@ class _LinkedListNode:
             data (any): the data to be stored in the node
             prev (LinkedListNode, optional): The previous node in the list. Defaults to None.
         """ 
-        self.__id = next(self.__ids)
         self.data = data
         self.next = None
         self.prev = prev
@@ -34,11 +33,10 @@ class _LinkedListNode:
         while current.next:
             current = current.next
         return current
-    
-    def get_id(self):
-        return self.__id
 
 class LinkedList:
+    __slots__ = ('head', 'tail', 'length')
+
     def __init__(self, *data: any):
         self.head = None
         self.tail = None
@@ -99,42 +97,63 @@ class LinkedList:
         Returns:
             int: new length of list
         """          
-        new_node = None
         for datum in data:
-            new_node = _LinkedListNode(datum, prev=self.tail)
-            if self.head is None:
-                # first append to list will go here
-                self.head = new_node
-            
-            self.tail = new_node
-            self.length += 1
+            self.append_node(datum)
 
         return len(self)
 
+    def append_node(self, datum: any) -> _LinkedListNode:
+        """
+        Adds a single node holding datum to the end of the list
+
+        Args:
+            datum (any): the data to be stored in the new node
 
+        Returns:
+            _LinkedListNode: the newly created node, usable with remove_node()
+        """
+        new_node = _LinkedListNode(datum, prev=self.tail)
+        if self.head is None:
+            # first append to list will go here
+            self.head = new_node
+
+        self.tail = new_node
+        self.length += 1
+        return new_node
 
     def remove(self, value: any, key=lambda x: x):
         node = self.find(value, key=key)
         if node is None:
             return None
+        return self.remove_node(node)
+
+    def remove_node(self, node: _LinkedListNode) -> _LinkedListNode:
+        """
+        Unlinks a node known to belong to this list in O(1)
+
+        Args:
+            node (_LinkedListNode): the node to unlink
+
+        Returns:
+            _LinkedListNode: the unlinked node
+        """
         self.length -= 1
-        
+
         prev = node.prev
         next = node.next
         if prev is None:
             # removing head
             self.head = next
-            if next:
-                next.prev = None
-            return node
-        
-        prev.next = next
-        if next:
+        else:
+            prev.next = next
+
+        if next is None:
+            # removing tail
+            self.tail = prev
+        else:
             next.prev = prev
-            return node
-        
-        # removing tail
-        self.tail = prev
+
+        node.prev = node.next = None
         return node
     
     def list(self, indent=0, formatter=lambda x: str(x)):
@@ -0,0 +1,221 @@
+"""
+Index of every node in a tree by name, for find.
+
+A NameIndex maps each name to the set of nodes carrying it. Directories
+that belong to an indexed tree point at the index (Directory.names), and
+add_child, remove_child, rename_child and replace_child keep it up to
+date, so a lookup costs as much as its matches rather than a walk of the
+tree.
+
+Glob patterns are answered through two secondary indexes over the
+distinct names: a sorted list for patterns starting with a literal
+prefix, and a trigram index (every three-character substring to the names
+containing it) for literal runs anywhere in the pattern. Only the names
+they propose are matched against the pattern.
+
+Deleting a subtree only drops the detached node itself. Its descendants
+are dropped as reclaim tears them down, and until then lookups check that
+each match is still attached (see FileSystem.find) and drop it if not.
+"""
+import re
+from fnmatch import translate
+from threading import Lock
+
+from src.file_system.directory import Directory
+from src.file_system.sorted_list import SortedList
+
+TRIGRAM = 3
+_WILDCARDS = frozenset('*?[')
+
+
+class NameIndex:
+    """
+    Name -> nodes index of a tree, with prefix and trigram indexes over the names.
+    """
+    __slots__ = ('_nodes', '_names', '_trigrams', '_lock')
+
+    def __init__(self):
+        self._nodes = {}  # name -> set of nodes with that name
+        self._names = SortedList()  # Distinct names, for literal prefixes
+        self._trigrams = {}  # trigram -> set of distinct names containing it
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def build(self, root: Directory, lock_of=None) -> int:
+        """
+        Indexes every node below root and attaches the index to its directories.
+        Lazily loaded image directories are loaded on the way.
+
+        Args:
+            root (Directory): The root of the tree; it is not indexed itself.
+            lock_of (callable, optional): Returns the RWLock to read-hold while a directory is indexed,
+                so that no child can be added to it unseen (see ConcurrentFileSystem).
+
+        Returns:
+            int: The number of nodes indexed.
+        """
+        indexed = 0
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            lock = lock_of(directory) if lock_of is not None else None
+            if lock is not None:
+                lock.acquire()
+            try:
+                directory.names = self
+                children = list(directory.iter_children())
+                for child in children:
+                    self.add(child)
+            finally:
+                if lock is not None:
+                    lock.release()
+            indexed += len(children)
+            stack.extend(child for child in children if isinstance(child, Directory))
+        return indexed
+
+    def add(self, node, name: str = None) -> None:
+        """
+        Indexes one node.
+
+        Args:
+            node (FSNode): The node to index.
+            name (str, optional): The name to index it under. Defaults to its current name.
+        """
+        name = node.name if name is None else name
+        with self._lock:
+            nodes = self._nodes.get(name)
+            if nodes is None:
+                nodes = self._nodes[name] = set()
+                self._names.add(name)
+                for trigram in _trigrams(name):
+                    self._trigrams.setdefault(trigram, set()).add(name)
+            nodes.add(node)
+
+    def add_tree(self, node) -> None:
+        """
+        Indexes a node newly attached to the tree, with everything below it.
+        """
+        self.add(node)
+        if isinstance(node, Directory) and node.names is not self:
+            self.build(node)
+
+    def discard(self, node, name: str = None) -> None:
+        """
+        Drops a node, dropping its name from the secondary indexes with the last node carrying it.
+
+        Args:
+            node (FSNode): The node to drop.
+            name (str, optional): The name it was indexed under. Defaults to its current name.
+        """
+        name = node.name if name is None else name
+        with self._lock:
+            nodes = self._nodes.get(name)
+            if nodes is None or node not in nodes:
+                return
+            nodes.discard(node)
+            if nodes:
+                return
+            del self._nodes[name]
+            self._names.remove(name)
+            for trigram in _trigrams(name):
+                names = self._trigrams[trigram]
+                names.discard(name)
+                if not names:
+                    del self._trigrams[trigram]
+
+    def rename(self, node, new_name: str) -> None:
+        """
+        Moves a node from its current name to new_name.
+        """
+        self.discard(node)
+        self.add(node, new_name)
+
+    def replace(self, old, new) -> None:
+        """
+        Swaps a node for its copy-on-write replacement, which has the same name.
+        """
+        self.discard(old)
+        self.add(new)
+
+    def match(self, pattern: str) -> list:
+        """
+        Returns the indexed nodes whose name matches a glob pattern (see fnmatch),
+        case-sensitively. Matches may include nodes detached since they were indexed.
+
+        Args:
+            pattern (str): A name, or a glob pattern with *, ? and [...].
+
+        Returns:
+            list[FSNode]: The matching nodes, in no particular order.
+        """
+        with self._lock:
+            if _WILDCARDS.isdisjoint(pattern):
+                return list(self._nodes.get(pattern, ()))
+            matches = re.compile(translate(pattern)).match
+            return [node for name in self._candidates(pattern) if matches(name) for node in self._nodes[name]]
+
+    def _candidates(self, pattern: str):
+        """
+        Narrows the distinct names down to those that can match pattern.
+        """
+        runs = _literal_runs(pattern)
+        trigrams = {trigram for run in runs for trigram in _trigrams(run)}
+        if trigrams:
+            sets = sorted((self._trigrams.get(trigram, ()) for trigram in trigrams), key=len)
+            return set(sets[0]).intersection(*sets[1:])
+        if runs[0]:
+            return list(self._names.iprefix(runs[0]))
+        return list(self._nodes)
+
+    def stats(self) -> dict:
+        """
+        Reports the size of the index.
+
+        Returns:
+            dict: names (distinct), nodes and trigrams.
+        """
+        with self._lock:
+            return {
+                'names': len(self._nodes),
+                'nodes': sum(len(nodes) for nodes in self._nodes.values()),
+                'trigrams': len(self._trigrams),
+            }
+
+
+def _trigrams(text: str):
+    return (text[start:start + TRIGRAM] for start in range(len(text) - TRIGRAM + 1))
+
+
+def _literal_runs(pattern: str) -> list:
+    """
+    Splits a glob pattern into its literal runs, the text between wildcards,
+    following fnmatch's rules for brackets. The first run is the literal
+    prefix, empty if the pattern starts with a wildcard.
+    """
+    runs, run = [], []
+    index, length = 0, len(pattern)
+    while index < length:
+        char = pattern[index]
+        if char == '[':
+            end = index + 1
+            if end < length and pattern[end] == '!':
+                end += 1
+            if end < length and pattern[end] == ']':
+                end += 1
+            end = pattern.find(']', end)
+            if end >= 0:
+                runs.append(''.join(run))
+                run = []
+                index = end + 1
+                continue
+            run.append(char)  # An unclosed bracket is literal
+        elif char in '*?':
+            runs.append(''.join(run))
+            run = []
+        else:
+            run.append(char)
+        index += 1
+    runs.append(''.join(run))
+    return runs
@@ -1,12 +1,35 @@
-from datetime import datetime
+from time import time_ns
 from src.file_system.constants import PATH_DELIMITER
 from src.file_system.validation import validate_name
 from src.file_system.linked_list import LinkedList
+from src.file_system.exceptions import QuotaExceededError
 
 class FSNode:
     """
     Simulates a file or directory
     """    
+    __slots__ = ('name', 'ctime', 'mtime', 'parent', '_size', '_epoch')
+
+    quota = None  # Only directories carry quotas (see Directory.quota)
+
+    @property
+    def ledger(self):
+        """
+        Returns the SizeLedger of the tree, which directories hold (see Directory.ledger), or None if detached.
+        """
+        parent = self.parent
+        return parent.ledger if parent is not None else None
+
+    @property
+    def live_parent(self):
+        """
+        Returns the parent as it is in the live tree. Nodes shared with a snapshot
+        keep the parent they were added to, which a copy may since have replaced
+        (see Directory.cow_copy); nodes written since the snapshot never need this.
+        """
+        parent = self.parent
+        return parent.latest() if parent is not None else None
+
     def __init__(self, name: str):
         """
         Initializes an entity representing a file or directory.
@@ -14,30 +37,92 @@ class FSNode:
         Args:
             name (str): name of entity, validated by validate_name()
         """            
-        self.entity_type = self.__class__.__name__
         self.validate(name)
         self.name = name
-        self.ctime = datetime.now()
+        self.ctime = time_ns()  # Nanoseconds since the epoch
         self.mtime = self.ctime
         self.parent = None
         self._size = 0  # Initialize size at the node level
+        self._epoch = 0  # Snapshot epoch that owns the node (see FileSystem.snapshot)
+
+    @property
+    def entity_type(self) -> str:
+        """
+        Returns the entity type name, e.g. "File" or "Directory".
+        """
+        return self.__class__.__name__
 
     @property
     def size(self) -> int:
         """
-        Returns the size of the node.
+        Returns the size of the node, first applying any deferred size deltas.
         """
+        ledger = self.ledger
+        if ledger is not None and ledger.dirty:
+            ledger.flush()
         return self._size
 
     def update_size(self, delta: int):
         """
         Updates the size of the node and propagates the change up the hierarchy iteratively.
+        In deferred mode the delta is only recorded, and propagated when sizes are next read.
+
+        While any directory of the tree has a quota, growth is propagated at once instead,
+        checking each ancestor's byte limit on the way up.
+
+        Raises:
+            QuotaExceededError: If the growth would exceed an ancestor's byte quota. No size is changed.
         """
+        ledger = self.ledger
+        if ledger is not None:
+            if ledger.quotas and delta > 0:
+                self._grow(delta, ledger)
+                return
+            if ledger.active:
+                ledger.record(self, delta)
+                return
+            if ledger.size_locks is not None:
+                # Other threads may be propagating through the same ancestors
+                locks, current = ledger.size_locks, self
+                while current is not None:
+                    locks.add(current, delta)
+                    current = current.parent
+                return
         current = self
         while current is not None:
             current._size += delta
             current = current.parent
 
+    def _grow(self, delta: int, ledger):
+        """
+        Propagates a positive delta, checking byte quotas in the same walk and
+        rolling back the ancestors already updated if one would be exceeded.
+        """
+        if ledger.dirty:
+            ledger.flush()  # Limits are checked against exact sizes
+        locks = ledger.size_locks
+        current = self
+        while current is not None:
+            quota = current.quota
+            limit = quota.max_bytes if quota is not None else None
+            if locks is not None:
+                grown = locks.add(current, delta, limit)
+            elif limit is not None and current._size + delta > limit:
+                grown = False
+            else:
+                current._size += delta
+                grown = True
+            if not grown:
+                undo = self
+                while undo is not current:
+                    if locks is not None:
+                        locks.add(undo, -delta)
+                    else:
+                        undo._size -= delta
+                    undo = undo.parent
+                current.raise_error(QuotaExceededError, directory=current.name, limit=limit, unit="bytes")
+            current = current.parent
+
     def __str__(self):
         return self.name
 
@@ -51,7 +136,7 @@ class FSNode:
         """
         Updates the modification time (mtime) of the node.
         """
-        self.mtime = datetime.now()  # Update the modification time
+        self.mtime = time_ns()  # Update the modification time
 
     def validate(self, name: str):
         """
@@ -70,23 +155,39 @@ class FSNode:
             new_name (str): new name
         """        
         self.validate(new_name)
+        parent = self.live_parent
+        if parent is not None:
+            parent.rename_child(self, new_name)  # Keep the parent's name index in sync
         self.name = new_name
 
+    def _copy_into(self, clone, epoch: int):
+        """
+        Copies the FSNode fields into a blank clone owned by epoch.
+        """
+        clone.name = self.name
+        clone.ctime = self.ctime
+        clone.mtime = self.mtime
+        clone.parent = self.parent
+        clone._size = self._size
+        clone._epoch = epoch
+        return clone
+
     def get_absolute_path(self):
         path = LinkedList(self.name)
-        current = self.parent
+        current = self.live_parent
         while current:
             path.append(current.name)
-            current = current.parent
+            current = current.live_parent
         
         return PATH_DELIMITER.join(path.reversed())
 
-    def raise_error(self, exception_class, **kwargs):
+    def raise_error(self, exception_class, *args, **kwargs):
         """
         Utility method to raise an exception with context.
 
         Args:
             exception_class (type): The exception class to raise.
+            *args: Positional arguments for the exception, e.g. a reason.
             **kwargs: Additional context for the exception.
         """
-        raise exception_class(**kwargs)
\ No newline at end of file
+        raise exception_class(*args, **kwargs)
\ No newline at end of file
@@ -0,0 +1,121 @@
+from collections import OrderedDict
+
+from src.file_system.constants import PATH_DELIMITER
+
+
+class PathCache:
+    """
+    LRU cache of resolved paths, keyed by start directory and normalized path
+    (see _normalize), so spellings like "a/./b" and "a//b" share an entry.
+
+    Each entry remembers the generation of every directory it looked a child
+    up in. Directories bump their generation whenever a child is added,
+    removed or renamed, so a stale entry is detected (and dropped) on its next
+    hit without ever flushing the whole cache.
+    """
+    __slots__ = ('maxsize', '_entries', 'hits', 'misses', 'stale', 'evictions')
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        Args:
+            maxsize (int, optional): Maximum number of cached paths. Defaults to 4096.
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, start, path: str):
+        """
+        Looks up a cached resolution.
+
+        Args:
+            start (Directory): The directory the path is resolved from.
+            path (str): The path as given.
+
+        Returns:
+            FSNode | None: The cached node, or None on a miss or stale entry.
+        """
+        key = (start, path)
+        entry = self._entries.get(key)
+        if entry is None:
+            # Normalizing costs a scan of the path, so it is only done on a miss: a normalized
+            # key normalizes to itself, hence a path equal to one resolves the same.
+            normalized = _normalize(path)
+            if normalized != path:
+                key = (start, normalized)
+                entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        node, trail = entry
+        for directory, generation in trail:
+            if directory.generation != generation:
+                del self._entries[key]
+                self.stale += 1
+                self.misses += 1
+                return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return node
+
+    def put(self, start, path: str, node, trail: list) -> None:
+        """
+        Caches a resolution.
+
+        Args:
+            start (Directory): The directory the path was resolved from.
+            path (str): The path as given.
+            node (FSNode): The resolved node.
+            trail (list): (directory, generation) pairs for each directory searched.
+        """
+        key = (start, _normalize(path))
+        self._entries[key] = (node, tuple(trail))
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Drops every entry, keeping the counters.
+        """
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters, for sizing the cache.
+
+        Returns:
+            dict: hits, misses, stale, evictions, size, maxsize and hit_rate.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _normalize(path: str) -> str:
+    """
+    Drops the empty and "." components of a path, which PathResolver skips.
+    A trailing one is kept as a final delimiter, as it requires the last
+    component to be a directory.
+    """
+    if '//' not in path and './' not in path and not path.endswith((PATH_DELIMITER, '/.')) and path != '.':
+        return path  # Nothing to drop, as for most paths
+    parts = path.split(PATH_DELIMITER)
+    key = PATH_DELIMITER.join(part for part in parts if part and part != '.')
+    return key + PATH_DELIMITER if parts[-1] in ('', '.') else key
@@ -1,4 +1,6 @@
+from contextlib import contextmanager
 from src.file_system.constants import ROOT, PATH_DELIMITER
+from src.file_system.concurrency import lock_for, ensure_loaded
 from src.file_system.exceptions import NotFoundError, NotADirectoryError
 from src.file_system.node import FSNode
 from src.file_system.directory import Directory
@@ -9,7 +11,7 @@ class PathResolver:
     """
 
     @staticmethod
-    def resolve(fs, path: str, must_exist: bool = True) -> FSNode:
+    def resolve(fs, path: str, must_exist: bool = True, session=None) -> FSNode:
         """
         Resolves a path to a file or directory node.
 
@@ -17,6 +19,8 @@ class PathResolver:
             fs (FileSystem): The file system instance.
             path (str): The path to resolve.
             must_exist (bool): If True, raises an error if the path does not exist.
+            session (Session, optional): Session whose working directory relative paths start from.
+                Defaults to the file system's default session.
 
         Returns:
             FSNode: The resolved node.
@@ -25,24 +29,53 @@ class PathResolver:
             NotFoundError: If the path does not exist and must_exist is True.
             NotADirectoryError: If a path component is not a directory.
         """
+        if fs.concurrent:
+            with PathResolver.hold(fs, path, session=session) as (directory, name):
+                node = directory.find_child(name)
+                if node is None:
+                    if must_exist:
+                        directory.raise_error(NotFoundError, name=name, directory=directory.name)
+                    return directory
+                return node
+
         # Determine if the path is absolute or relative
         if path.startswith(ROOT):
-            current = fs.root  # Start from the root for absolute paths
+            start = fs.root  # Start from the root for absolute paths
         else:
-            current = fs.current  # Start from the current directory for relative paths
+            start = (session or fs.session).cwd  # Start from the current directory for relative paths
+
+        cache = fs.path_cache if must_exist else None
+        if cache is None:
+            return PathResolver._walk(fs, start, path, must_exist)
+
+        node = cache.get(start, path)
+        if node is None:
+            trail = []
+            node = PathResolver._walk(fs, start, path, must_exist, trail)
+            cache.put(start, path, node, trail)
+        return node
 
+    @staticmethod
+    def _walk(fs, current: Directory, path: str, must_exist: bool, trail: list = None) -> FSNode:
+        """
+        Walks the path components from current, recording each directory
+        searched and its generation in trail when given.
+        """
         # Traverse the path components
         parts = path.split(PATH_DELIMITER)
         for part in parts:
             if part == "." or part == "":  # Skip current directory and empty components
                 continue  # Stay in the current directory
             elif part == "..":
-                if current.parent is None:
+                parent = current.live_parent
+                if parent is None:
                     current.raise_error(NotFoundError, name="..", directory=ROOT)
-                current = current.parent  # Move to the parent directory
+                current = parent  # Move to the parent directory
             elif part == ROOT:
                 current = fs.root
             else:
+                if trail is not None:
+                    trail.append((current, current.generation))
                 child = current.find_child(name=part)
                 if child is None and must_exist:
                     current.raise_error(NotFoundError, name=part, directory=current.name)
@@ -59,13 +92,79 @@ class PathResolver:
         return current
 
     @staticmethod
-    def resolve_parent(fs, path: str) -> tuple[Directory, str]:
+    @contextmanager
+    def hold(fs, path: str, exclusive: bool = False, session=None):
+        """
+        Walks to the directory containing the last component of path and keeps
+        it locked while the block runs, for file systems in concurrent mode.
+
+        Locks are taken hand-over-hand: each directory's read lock is acquired
+        before its parent's is released, so no directory on the way can be
+        detached mid-walk, yet only one lock is held at a time. Locks are only
+        ever waited on top-down; ".." and "~" release the current lock before
+        taking the one above, which rules out deadlocks with other walks.
+
+        Args:
+            fs (FileSystem): The file system instance.
+            path (str): The path to resolve.
+            exclusive (bool): If True, write-lock the final directory; otherwise read-lock it.
+            session (Session, optional): Session whose working directory relative paths start from.
+
+        Yields:
+            (Directory, str): The locked directory and the final component, or '' if
+            the path names a directory itself (see Directory.find_child).
+
+        Raises:
+            NotFoundError: If a directory on the path does not exist.
+            NotADirectoryError: If a path component is not a directory.
+        """
+        parts = [part for part in path.split(PATH_DELIMITER) if part and part != "."]
+        name = parts.pop() if parts and parts[-1] not in ("..", ROOT) else ""
+        current = fs.root if path.startswith(ROOT) else (session or fs.session).cwd
+        last = len(parts) - 1
+
+        mode = exclusive and last < 0
+        lock = lock_for(current)
+        lock.acquire(mode)
+        try:
+            for position, part in enumerate(parts):
+                next_mode = exclusive and position == last
+                if part == ".." or part == ROOT:
+                    if part == ROOT:
+                        target = fs.root
+                    elif current.parent is None:
+                        current.raise_error(NotFoundError, name="..", directory=ROOT)
+                    else:
+                        target = current.parent
+                    lock.release(mode)  # Never wait on an ancestor while holding a lock below it
+                    lock, mode = lock_for(target), next_mode
+                    lock.acquire(mode)
+                else:
+                    ensure_loaded(current)
+                    target = current.find_child(part)
+                    if target is None:
+                        current.raise_error(NotFoundError, name=part, directory=current.name)
+                    if not isinstance(target, Directory):
+                        current.raise_error(NotADirectoryError, name=part, directory=current.name)
+                    next_lock = lock_for(target)
+                    next_lock.acquire(next_mode)
+                    lock.release(mode)
+                    lock, mode = next_lock, next_mode
+                current = target
+            ensure_loaded(current)
+            yield current, name
+        finally:
+            lock.release(mode)
+
+    @staticmethod
+    def resolve_parent(fs, path: str, session=None) -> tuple[Directory, str]:
         """
         Resolves the parent directory of a given path and the final component.
 
         Args:
             fs (FileSystem): The file system instance.
             path (str): The path to resolve.
+            session (Session, optional): Session whose working directory relative paths start from.
 
         Returns:
             (Directory, str): The parent directory and the final component of the path.
@@ -78,7 +177,7 @@ class PathResolver:
         parent_path = PATH_DELIMITER.join(parts[:-1])  # Get the parent directory path
         final_component = parts[-1]  # Get the final component (file or directory name)
 
-        parent = PathResolver.resolve(fs, parent_path, must_exist=True)
+        parent = PathResolver.resolve(fs, parent_path, must_exist=True, session=session)
         if not isinstance(parent, Directory):
             parent.raise_error(NotADirectoryError, name=parent.name, directory=parent_path)
 
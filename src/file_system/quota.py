@@ -0,0 +1,26 @@
+class Quota:
+    """
+    Limits on a directory: its total size and its number of entries.
+
+    Byte limits apply to the whole subtree and are checked against the
+    aggregated sizes while FSNode.update_size walks up the ancestors, so
+    enforcement costs no extra traversal. Entry limits apply to the
+    directory's own children, whose count is kept on the directory;
+    lazily loaded image directories do not know their subtree counts.
+
+    The directories of a tree that carry a quota are counted on its ledger
+    (SizeLedger.quotas); while there are none, size updates skip the checks.
+    """
+    __slots__ = ('max_bytes', 'max_entries')
+
+    def __init__(self, max_bytes: int = None, max_entries: int = None):
+        """
+        Args:
+            max_bytes (int, optional): Maximum size of the subtree, or None for no limit.
+            max_entries (int, optional): Maximum number of children, or None for no limit.
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+    def __repr__(self):
+        return f"Quota(max_bytes={self.max_bytes}, max_entries={self.max_entries})"
@@ -0,0 +1,20 @@
+class Session:
+    """
+    Per-client state over a shared FileSystem: the working directory.
+
+    Every FileSystem operation accepts a session and resolves relative paths
+    from its working directory, so many clients can share one tree at the
+    cost of one small object each. Operations called without a session use
+    the file system's default session (see FileSystem.current).
+    """
+    __slots__ = ('cwd', '__weakref__')
+
+    def __init__(self, cwd):
+        """
+        Args:
+            cwd (Directory): The initial working directory.
+        """
+        self.cwd = cwd
+
+    def __repr__(self):
+        return f"Session(cwd={self.cwd.get_absolute_path()!r})"
@@ -0,0 +1,119 @@
+from contextlib import contextmanager
+from threading import Lock
+
+from src.file_system.directory import Directory
+
+
+class SizeLedger:
+    """
+    Collects size deltas so ancestor sizes can be updated in one pass.
+
+    While active, FSNode.update_size records a delta against the node instead
+    of walking to the root. flush() then pushes all pending deltas up one
+    level at a time, merging deltas that meet at a common ancestor, so each
+    directory on the union of the dirty paths is updated once per level.
+
+    Every file system owns a ledger, which the directories of its tree point
+    at (Directory.ledger); files use their parent's. Recording and flushing
+    are serialized by a lock, so threads can share the ledger. A concurrent
+    file system also hangs its striped size locks here (size_locks), so only
+    its own tree pays for them.
+    """
+    __slots__ = ('_pending', 'deferred', 'depth', 'quotas', 'size_locks', '_lock')
+
+    def __init__(self):
+        self._pending = {}
+        self._lock = Lock()
+        self.deferred = False  # Persistent deferred accounting mode
+        self.depth = 0  # Nesting level of open batch() contexts
+        self.quotas = 0  # Directories of the tree with a quota (see FSNode.update_size)
+        self.size_locks = None  # SizeLocks, for trees shared between threads (see ConcurrentFileSystem)
+
+    @property
+    def active(self) -> bool:
+        """
+        Returns True if size updates are currently being deferred.
+        """
+        return self.deferred or self.depth > 0
+
+    def record(self, node, delta: int) -> None:
+        """
+        Records a size delta for node, to be propagated on the next flush.
+
+        Args:
+            node (FSNode): The node whose size changed.
+            delta (int): The size change.
+        """
+        with self._lock:
+            pending = self._pending
+            pending[node] = pending.get(node, 0) + delta
+
+    def flush(self) -> None:
+        """
+        Applies every pending delta to its node and all of its ancestors.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            while pending:
+                upward = {}
+                for node, delta in pending.items():
+                    if not delta:
+                        continue
+                    node._size += delta
+                    parent = node.parent
+                    if parent is not None:
+                        upward[parent] = upward.get(parent, 0) + delta
+                pending = upward
+
+    @property
+    def dirty(self) -> bool:
+        """
+        Returns True if there are deltas waiting to be flushed.
+        """
+        return bool(self._pending)
+
+    def count_quotas(self, delta: int) -> None:
+        """
+        Adjusts the number of directories with a quota, as quotas are set or removed
+        and as directories carrying one are attached, detached or reclaimed.
+        """
+        with self._lock:
+            self.quotas += delta
+
+    def set_deferred(self, enabled: bool) -> None:
+        """
+        Turns deferred size accounting on or off. Turning it off flushes pending deltas.
+
+        Args:
+            enabled (bool): True to defer size propagation until sizes are read.
+        """
+        self.deferred = enabled
+        if not self.active:
+            self.flush()
+
+    @contextmanager
+    def batch(self):
+        """
+        Defers size propagation for the duration of the block and applies all
+        deltas in a single pass on exit. Batches can be nested.
+        """
+        self.depth += 1
+        try:
+            yield self
+        finally:
+            self.depth -= 1
+            if not self.active:
+                self.flush()
+
+    def adopt(self, directory) -> None:
+        """
+        Points a directory newly attached to the tree, and every loaded directory below it, at this ledger.
+        """
+        stack = [directory]
+        while stack:
+            directory = stack.pop()
+            if directory.ledger is self:
+                continue
+            directory.ledger = self
+            if directory.children_loaded:
+                stack.extend(child for child in directory.children.values() if isinstance(child, Directory))
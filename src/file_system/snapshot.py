@@ -0,0 +1,108 @@
+from src.file_system.constants import PATH_DELIMITER, ROOT
+from src.file_system.exceptions import FileSystemError, NotFoundError, NotADirectoryError
+from src.file_system.directory import Directory
+from src.file_system.file import File
+from src.file_system.tree_renderer import iter_tree_lines
+
+
+class Snapshot:
+    """
+    Frozen, read-only view of a FileSystem at the moment snapshot() was called.
+
+    The snapshot keeps the root the tree had at that moment. Writers to the
+    live tree copy each node they change (and its ancestors) instead of
+    modifying it, so everything reachable from this root stays as it was,
+    while unchanged subtrees and file contents remain shared with the live
+    tree and with other snapshots.
+
+    A shared node's parent pointer names the directory version it was added
+    to, which may be older than this view's, so the view never follows parent
+    pointers: '..' is resolved against the path walked so far.
+    """
+    __slots__ = ('root', 'epoch')
+
+    def __init__(self, root: Directory, epoch: int):
+        """
+        Args:
+            root (Directory): Root of the tree at snapshot time.
+            epoch (int): The snapshot epoch; nodes stamped with a later epoch are not part of the view.
+        """
+        self.root = root
+        self.epoch = epoch
+
+    def resolve(self, path: str = ROOT):
+        """
+        Resolves a path from the snapshot root. Relative paths are taken from the root too.
+
+        Args:
+            path (str): The path to resolve.
+
+        Returns:
+            FSNode: The node at that path in the snapshot.
+
+        Raises:
+            NotFoundError: If the path does not exist in the snapshot.
+            NotADirectoryError: If a path component is not a directory.
+        """
+        trail = [self.root]
+        parts = [part for part in path.split(PATH_DELIMITER) if part not in ("", ".")]
+        for i, part in enumerate(parts):
+            current = trail[-1]
+            if part == ROOT:
+                del trail[1:]
+            elif part == "..":
+                if len(trail) == 1:
+                    current.raise_error(NotFoundError, name="..", directory=ROOT)
+                trail.pop()
+            elif not isinstance(current, Directory):
+                current.raise_error(NotADirectoryError, name=current.name, directory=trail[-2].name)
+            else:
+                child = current.find_child(part)
+                if child is None:
+                    current.raise_error(NotFoundError, name=part, directory=current.name)
+                trail.append(child)
+        return trail[-1]
+
+    def read(self, path: str, offset: int = 0, length: int = None) -> str:
+        """
+        Reads a file, or a range of it, as it was at snapshot time.
+        """
+        target = self._resolve_file(path)
+        if offset == 0 and length is None:
+            return target.content
+        return target.read_range(offset, length)
+
+    def read_chunks(self, path: str, offset: int = 0, length: int = None, chunk_size: int = File.DEFAULT_CHUNK_SIZE):
+        """
+        Streams a file, or a range of it, as it was at snapshot time.
+        """
+        return self._resolve_file(path).iter_chunks(chunk_size, offset, length)
+
+    def ls(self, path: str = ROOT, recurse: bool = False, **kwargs) -> str:
+        """
+        Lists a directory as it was at snapshot time. Accepts the keyword arguments of FileSystem.ls().
+        """
+        return "".join(self.iter_ls(path, recurse=recurse, **kwargs))
+
+    def iter_ls(self, path: str = ROOT, recurse: bool = False, sort: bool = False, prefix: str = None,
+                after: str = None, limit: int = None, max_depth: int = None, max_entries: int = None):
+        """
+        Streams the listing of a directory as it was at snapshot time.
+        """
+        target = self.resolve(path)
+        if not isinstance(target, Directory):
+            target.raise_error(NotADirectoryError, name=target.name, directory=path)
+        return iter_tree_lines(target, recurse=recurse, sort=sort, name_prefix=prefix, after=after, limit=limit,
+                               max_depth=max_depth, max_entries=max_entries)
+
+    def size(self, path: str = ROOT) -> int:
+        """
+        Returns the size of a file or directory as it was at snapshot time.
+        """
+        return self.resolve(path).size
+
+    def _resolve_file(self, path: str) -> File:
+        target = self.resolve(path)
+        if not isinstance(target, File):
+            target.raise_error(FileSystemError, f"Cannot read: '{path}' is not a valid file.")
+        return target
@@ -0,0 +1,4 @@
+from .sorted_list import SortedList
+from .sorted_map import SortedMap
+
+__all__ = ["SortedList", "SortedMap"]
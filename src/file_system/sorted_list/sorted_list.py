@@ -0,0 +1,183 @@
+from __future__ import annotations
+from bisect import bisect_left, bisect_right, insort
+from itertools import takewhile
+
+class SortedList:
+    """
+    Sorted container built from a list of bounded, sorted chunks.
+
+    Each chunk holds at most 2 * load keys, so inserting or deleting a key costs
+    a binary search over the chunk maxima plus a bounded memmove inside one chunk,
+    instead of shifting the entire list.
+    """
+    __slots__ = ('_load', '_chunks', '_maxes', 'length')
+
+    def __init__(self, *data: any, load: int = 512):
+        """
+        Constructs a sorted list
+
+        Args:
+            *data (any): initial keys, in any order
+            load (int, optional): target chunk size. Defaults to 512.
+        """
+        self._load = load
+        self._chunks = []  # list of sorted lists
+        self._maxes = []   # _maxes[i] == _chunks[i][-1]
+        self.length = 0
+        for datum in sorted(data):
+            self.add(datum)
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            yield from chunk
+
+    def __contains__(self, key: any) -> bool:
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return False
+        chunk = self._chunks[pos]
+        idx = bisect_left(chunk, key)
+        return chunk[idx] == key
+
+    def copy(self) -> SortedList:
+        """
+        Returns a shallow copy, sharing the keys but not the chunks
+        """
+        clone = SortedList.__new__(SortedList)
+        clone._load = self._load
+        clone._chunks = [chunk[:] for chunk in self._chunks]
+        clone._maxes = self._maxes[:]
+        clone.length = self.length
+        return clone
+
+    def add(self, key: any) -> None:
+        """
+        Inserts a key, keeping the list sorted
+
+        Args:
+            key (any): the key to insert
+        """
+        if not self._maxes:
+            self._chunks.append([key])
+            self._maxes.append(key)
+            self.length += 1
+            return
+
+        pos = bisect_right(self._maxes, key)
+        if pos == len(self._maxes):
+            # Larger than every key, goes at the end of the last chunk
+            pos -= 1
+            self._chunks[pos].append(key)
+            self._maxes[pos] = key
+        else:
+            insort(self._chunks[pos], key)
+
+        self.length += 1
+        if len(self._chunks[pos]) > 2 * self._load:
+            self._split(pos)
+
+    def remove(self, key: any) -> bool:
+        """
+        Removes a key if present
+
+        Args:
+            key (any): the key to remove
+
+        Returns:
+            bool: True if the key was found and removed
+        """
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return False
+        chunk = self._chunks[pos]
+        idx = bisect_left(chunk, key)
+        if chunk[idx] != key:
+            return False
+
+        del chunk[idx]
+        self.length -= 1
+        if not chunk:
+            del self._chunks[pos]
+            del self._maxes[pos]
+        elif idx == len(chunk):
+            self._maxes[pos] = chunk[-1]
+        return True
+
+    def irange(self, start: any = None, stop: any = None, inclusive: tuple[bool, bool] = (True, False)):
+        """
+        Iterates keys between start and stop in sorted order. Only the keys
+        yielded are visited, after an O(log n) seek to start.
+
+        Args:
+            start (any, optional): lower bound, or None for the first key
+            stop (any, optional): upper bound, or None for no upper bound
+            inclusive (tuple[bool, bool], optional): whether each bound is inclusive
+
+        Yields:
+            any: keys within the range
+        """
+        if not self._maxes:
+            return
+        if start is None:
+            pos, idx = 0, 0
+        else:
+            seek = bisect_left if inclusive[0] else bisect_right
+            pos = seek(self._maxes, start)
+            if pos == len(self._maxes):
+                return
+            idx = seek(self._chunks[pos], start)
+
+        for p in range(pos, len(self._chunks)):
+            chunk = self._chunks[p]
+            for i in range(idx, len(chunk)):
+                key = chunk[i]
+                if stop is not None and (key > stop or (key == stop and not inclusive[1])):
+                    return
+                yield key
+            idx = 0
+
+    def iprefix(self, prefix: str):
+        """
+        Iterates string keys starting with prefix in sorted order
+
+        Args:
+            prefix (str): the prefix to match
+
+        Yields:
+            str: matching keys
+        """
+        for key in self.irange(start=prefix):
+            if not key.startswith(prefix):
+                return
+            yield key
+
+    def iselect(self, prefix: str = None, after: str = None):
+        """
+        Iterates string keys starting with prefix and sorting after after, in
+        sorted order, seeking straight to the first one that matches both
+
+        Args:
+            prefix (str, optional): the prefix to match, or None for any key
+            after (str, optional): the key to start after, or None to start at the first key
+
+        Returns:
+            Iterator[str]: matching keys
+        """
+        if prefix and (after is None or after < prefix):
+            return self.iprefix(prefix)
+        keys = self.irange(start=after, inclusive=(after is None, False))
+        return takewhile(lambda key: key.startswith(prefix), keys) if prefix else keys
+
+    def _split(self, pos: int) -> None:
+        """
+        Splits an oversized chunk in half
+        """
+        chunk = self._chunks[pos]
+        half = chunk[self._load:]
+        del chunk[self._load:]
+        self._chunks.insert(pos + 1, half)
+        self._maxes[pos] = chunk[-1]
+        self._maxes.insert(pos + 1, half[-1])
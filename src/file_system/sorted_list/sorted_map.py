@@ -0,0 +1,194 @@
+from __future__ import annotations
+from bisect import bisect_left
+from operator import itemgetter
+
+from .sorted_list import SortedList
+
+_MISSING = object()
+
+class SortedMap(SortedList):
+    """
+    Sorted mapping built like SortedList, with a chunk of values alongside each
+    chunk of keys.
+
+    Copies share their chunks: copy() costs one pointer per chunk rather than
+    one per key, and a map copies a shared chunk the first time it changes it,
+    so neither the copy nor the original sees the other's changes.
+    """
+    __slots__ = ('_values', '_owned')
+
+    def __init__(self, items=(), load: int = 512):
+        """
+        Constructs a sorted map
+
+        Args:
+            items (iterable, optional): initial (key, value) pairs with distinct keys, in any order
+            load (int, optional): target chunk size. Defaults to 512.
+        """
+        self._load = load
+        self._chunks = []
+        self._values = []  # _values[i][j] is the value of _chunks[i][j]
+        self._maxes = []
+        self._owned = set()  # ids of the key chunks no copy shares
+        self.length = 0
+        if not items:
+            return  # As for every new directory
+        items = sorted(items, key=itemgetter(0))
+        self.length = len(items)
+        for start in range(0, len(items), load):
+            batch = items[start:start + load]
+            chunk = [key for key, _ in batch]
+            self._chunks.append(chunk)
+            self._values.append([value for _, value in batch])
+            self._maxes.append(chunk[-1])
+            self._owned.add(id(chunk))
+
+    def get(self, key: any, default: any = None) -> any:
+        """
+        Returns the value of key, or default if it is absent
+        """
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return default
+        chunk = self._chunks[pos]
+        idx = bisect_left(chunk, key)
+        return self._values[pos][idx] if chunk[idx] == key else default
+
+    def values(self):
+        """
+        Iterates the values in key order
+        """
+        for chunk in self._values:
+            yield from chunk
+
+    def items(self):
+        """
+        Iterates (key, value) pairs in key order
+        """
+        for keys, values in zip(self._chunks, self._values):
+            yield from zip(keys, values)
+
+    def max_key(self, default: any = None) -> any:
+        """
+        Returns the largest key, or default if the map is empty
+        """
+        return self._maxes[-1] if self._maxes else default
+
+    def copy(self) -> SortedMap:
+        """
+        Returns a copy sharing every chunk with this map until either changes it
+        """
+        clone = SortedMap.__new__(SortedMap)
+        clone._load = self._load
+        clone._chunks = self._chunks[:]
+        clone._values = self._values[:]
+        clone._maxes = self._maxes[:]
+        clone._owned = set()
+        clone.length = self.length
+        self._owned = set()  # The chunks are shared from now on
+        return clone
+
+    def add(self, key: any, value: any) -> None:
+        """
+        Maps key to value, inserting the key if it is new
+
+        Args:
+            key (any): the key
+            value (any): its value
+        """
+        if not self._maxes:
+            chunk = [key]
+            self._chunks.append(chunk)
+            self._values.append([value])
+            self._maxes.append(key)
+            self._owned.add(id(chunk))
+            self.length += 1
+            return
+
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            # Larger than every key, goes at the end of the last chunk
+            pos -= 1
+            chunk, values = self._writable(pos)
+            chunk.append(key)
+            values.append(value)
+            self._maxes[pos] = key
+        else:
+            chunk, values = self._writable(pos)
+            idx = bisect_left(chunk, key)
+            if chunk[idx] == key:
+                values[idx] = value
+                return
+            chunk.insert(idx, key)
+            values.insert(idx, value)
+
+        self.length += 1
+        if len(chunk) > 2 * self._load:
+            self._split(pos)
+
+    def pop(self, key: any, default: any = _MISSING) -> any:
+        """
+        Removes key and returns its value
+
+        Args:
+            key (any): the key to remove
+            default (any, optional): returned if key is absent
+
+        Raises:
+            KeyError: if key is absent and no default is given
+        """
+        pos = bisect_left(self._maxes, key)
+        if pos < len(self._maxes):
+            idx = bisect_left(self._chunks[pos], key)
+            if self._chunks[pos][idx] == key:
+                chunk, values = self._writable(pos)
+                del chunk[idx]
+                value = values.pop(idx)
+                self.length -= 1
+                if not chunk:
+                    self._owned.discard(id(chunk))
+                    del self._chunks[pos]
+                    del self._values[pos]
+                    del self._maxes[pos]
+                elif idx == len(chunk):
+                    self._maxes[pos] = chunk[-1]
+                return value
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def remove(self, key: any) -> bool:
+        """
+        Removes a key if present
+
+        Returns:
+            bool: True if the key was found and removed
+        """
+        absent = []
+        return self.pop(key, absent) is not absent
+
+    def _writable(self, pos: int) -> tuple[list, list]:
+        """
+        Returns the key and value chunks at pos, first copying them if a copy of the map shares them
+        """
+        chunk = self._chunks[pos]
+        if id(chunk) in self._owned:
+            return chunk, self._values[pos]
+        chunk = self._chunks[pos] = chunk[:]
+        values = self._values[pos] = self._values[pos][:]
+        self._owned.add(id(chunk))
+        return chunk, values
+
+    def _split(self, pos: int) -> None:
+        """
+        Splits an oversized chunk in half
+        """
+        chunk, values = self._chunks[pos], self._values[pos]
+        half, half_values = chunk[self._load:], values[self._load:]
+        del chunk[self._load:]
+        del values[self._load:]
+        self._chunks.insert(pos + 1, half)
+        self._values.insert(pos + 1, half_values)
+        self._owned.add(id(half))
+        self._maxes[pos] = chunk[-1]
+        self._maxes.insert(pos + 1, half[-1])
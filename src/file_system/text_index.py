@@ -0,0 +1,343 @@
+"""
+Inverted index of file contents, for search.
+
+A TextIndex maps every token (a run of word characters, lowercased) to
+its posting list: the files containing it, with the number of
+occurrences in each. Directories of an indexed tree point at the index
+(Directory.text). File.write updates it incrementally: an overwrite
+swaps the tokens of the old content for those of the new one, and an
+append only re-tokenizes the word it may extend plus the appended data.
+add_child indexes new files, and remove_child and reclaim drop them.
+
+Queries are conjunctions of clauses. A clause is a word, a quoted phrase
+of consecutive words, or either one ending with "*", which makes its last
+word a prefix. Posting lists give the candidate files of each clause,
+and candidates of a multi-word clause are confirmed against their
+content. Prefixes are expanded through a sorted list of the tokens.
+
+Memory is capped by a budget of postings, one per distinct token of each
+file. When indexing a file would exceed it, the postings of every file
+in that file's directory are dropped and the directory is marked
+unindexed: its files are then scanned at query time instead.
+"""
+import re
+from collections import Counter
+from threading import Lock
+
+from src.file_system.directory import Directory
+from src.file_system.file import File
+from src.file_system.sorted_list import SortedList
+
+DEFAULT_BUDGET = 1_000_000  # Postings, i.e. (token, file) pairs; roughly 100 bytes each
+_TOKEN = re.compile(r'\w+')
+_TRAILING_TOKEN = re.compile(r'\w+$')
+_CLAUSE = re.compile(r'"([^"]*)"(\*?)|(\S+)')
+_TAIL_WINDOW = 64  # Characters read back from the end of a file to find the word an append extends
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Splits text into lowercased runs of word characters.
+    """
+    return _TOKEN.findall(text.lower())
+
+
+def parse_query(query: str) -> list[tuple[list[str], bool]]:
+    """
+    Parses a query into clauses, all of which must match.
+
+    Args:
+        query (str): Words, "quoted phrases", and either ending with * for a prefix.
+
+    Returns:
+        list[tuple[list[str], bool]]: (tokens, prefix) per clause. Punctuation inside a word
+            splits it into a phrase, so "a.b" matches the tokens a and b next to each other.
+    """
+    clauses = []
+    for phrase, phrase_star, word in _CLAUSE.findall(query):
+        text, prefix = (phrase, bool(phrase_star)) if not word else (word.rstrip('*'), word.endswith('*'))
+        tokens = tokenize(text)
+        if tokens:
+            clauses.append((tokens, prefix and _TRAILING_TOKEN.search(text) is not None))
+    return clauses
+
+
+def matches(clauses: list, tokens: list[str]) -> bool:
+    """
+    Returns True if a token list satisfies every clause.
+    """
+    for words, prefix in clauses:
+        last = len(words) - 1
+        for start in range(len(tokens) - last):
+            if all(tokens[start + i] == words[i] for i in range(last)) and \
+                    (tokens[start + last].startswith(words[last]) if prefix else tokens[start + last] == words[last]):
+                break
+        else:
+            return False
+    return True
+
+
+class TextIndex:
+    """
+    Token -> files index of file contents, capped by a budget of postings.
+    """
+    __slots__ = ('budget', '_postings', '_terms', '_files', '_unindexed', 'postings', '_lock')
+
+    def __init__(self, budget: int = DEFAULT_BUDGET):
+        """
+        Args:
+            budget (int, optional): Maximum number of postings kept before directories fall back to scanning.
+        """
+        self.budget = budget
+        self._postings = {}  # token -> {file: occurrences}
+        self._terms = SortedList()  # Distinct tokens, for prefixes
+        self._files = {}  # Indexed file -> its number of postings
+        self._unindexed = set()  # Directories whose files are scanned instead of indexed
+        self.postings = 0
+        self._lock = Lock()
+
+    def build(self, root: Directory, lock_of=None) -> int:
+        """
+        Indexes every file below root and attaches the index to its directories.
+        Lazily loaded image directories and files are loaded on the way.
+
+        Args:
+            root (Directory): The directory to index.
+            lock_of (callable, optional): Returns the RWLock to read-hold while a directory is indexed,
+                so that no file can change in it unseen (see ConcurrentFileSystem).
+
+        Returns:
+            int: The number of files indexed.
+        """
+        indexed = 0
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            lock = lock_of(directory) if lock_of is not None else None
+            if lock is not None:
+                lock.acquire()
+            try:
+                directory.text = self
+                for child in directory.iter_children():
+                    if isinstance(child, Directory):
+                        stack.append(child)
+                    elif self.add_file(child):
+                        indexed += 1
+            finally:
+                if lock is not None:
+                    lock.release()
+        return indexed
+
+    def add_tree(self, node) -> None:
+        """
+        Indexes a node newly attached to the tree, with everything below it.
+        """
+        if isinstance(node, File):
+            self.add_file(node)
+        elif node.text is not self:
+            self.build(node)
+
+    def add_file(self, file: File) -> bool:
+        """
+        Indexes the content of a file.
+
+        Returns:
+            bool: True if the file is indexed, False if its directory is scanned instead.
+        """
+        counts = Counter(tokenize(file.content))
+        with self._lock:
+            if file in self._files:
+                return True
+            if file.parent in self._unindexed:
+                return False
+            self._files[file] = 0
+            if self._add(file, counts):
+                return True
+            del self._files[file]
+            self._unindex(file.parent)
+            return False
+
+    def remove_file(self, file: File) -> None:
+        """
+        Drops a file from the index. Nothing happens if it is not indexed.
+        """
+        with self._lock:
+            if file not in self._files:
+                return
+        counts = Counter(tokenize(file.content))
+        with self._lock:
+            if self._files.pop(file, None) is not None:
+                self._subtract(file, counts)
+
+    def update(self, file: File, data: str, overwrite: bool) -> None:
+        """
+        Re-indexes a file for a write that is about to happen; called before its content changes.
+
+        Args:
+            file (File): The file being written.
+            data (str): The new content, or the data being appended.
+            overwrite (bool): True if data replaces the content.
+        """
+        with self._lock:
+            if file not in self._files:
+                return
+        if overwrite:
+            removed, added = Counter(tokenize(file.content)), Counter(tokenize(data))
+        else:
+            # Only the last word can grow; every earlier token stays as it is. Lowercasing may
+            # split the word into several tokens (e.g. "İ" becomes "i" and a combining dot).
+            word = _trailing_word(file)
+            removed, added = Counter(tokenize(word)), Counter(tokenize(word + data))
+        with self._lock:
+            if file not in self._files:
+                return
+            self._subtract(file, removed)
+            if not self._add(file, added):
+                # Drop what is left of the file's postings, then scan its whole directory instead
+                self._subtract(file, Counter(tokenize(file.content)) - removed)
+                del self._files[file]
+                self._unindex(file.parent)
+
+    def replace(self, old, new) -> None:
+        """
+        Moves the postings of a node to its copy-on-write replacement.
+        """
+        if isinstance(old, Directory):
+            with self._lock:
+                if old in self._unindexed:
+                    self._unindexed.discard(old)
+                    self._unindexed.add(new)
+            return
+        with self._lock:
+            if old not in self._files:
+                return
+        tokens = set(tokenize(old.content))
+        with self._lock:
+            count = self._files.pop(old, None)
+            if count is None:
+                return
+            for token in tokens:
+                entry = self._postings[token]
+                entry[new] = entry.pop(old)
+            self._files[new] = count
+
+    def discard(self, node) -> None:
+        """
+        Drops a node detached from the tree, file or directory.
+        """
+        if isinstance(node, File):
+            self.remove_file(node)
+        else:
+            with self._lock:
+                self._unindexed.discard(node)
+
+    def candidates(self, clauses: list) -> set:
+        """
+        Returns the indexed files that may match every clause. Files of multi-word
+        clauses still need to be confirmed against their content (see matches).
+        """
+        with self._lock:
+            result = None
+            for words, prefix in clauses:
+                for position, word in enumerate(words):
+                    if prefix and position == len(words) - 1:
+                        files = set()
+                        for term in self._terms.iprefix(word):
+                            files.update(self._postings[term])
+                    else:
+                        files = set(self._postings.get(word, ()))
+                    result = files if result is None else result & files
+                    if not result:
+                        return set()
+            return result if result is not None else set()
+
+    def unindexed(self) -> list:
+        """
+        Returns the directories whose files must be scanned.
+        """
+        with self._lock:
+            return list(self._unindexed)
+
+    def stats(self) -> dict:
+        """
+        Reports the size of the index.
+
+        Returns:
+            dict: files, terms, postings, budget and unindexed_directories.
+        """
+        with self._lock:
+            return {
+                'files': len(self._files),
+                'terms': len(self._postings),
+                'postings': self.postings,
+                'budget': self.budget,
+                'unindexed_directories': len(self._unindexed),
+            }
+
+    def _add(self, file: File, counts: Counter) -> bool:
+        """
+        Adds occurrences to the postings of an indexed file, unless that would exceed the budget.
+        """
+        new_postings = sum(1 for token in counts if file not in self._postings.get(token, ()))
+        if self.postings + new_postings > self.budget:
+            return False
+        postings, terms = self._postings, self._terms
+        for token, count in counts.items():
+            entry = postings.get(token)
+            if entry is None:
+                entry = postings[token] = {}
+                terms.add(token)
+            entry[file] = entry.get(file, 0) + count
+        self._files[file] += new_postings
+        self.postings += new_postings
+        return True
+
+    def _subtract(self, file: File, counts: Counter) -> None:
+        """
+        Removes occurrences from the postings of a file, skipping tokens it is not indexed under.
+        """
+        postings = self._postings
+        dropped = 0
+        for token, count in counts.items():
+            entry = postings.get(token)
+            if entry is None or file not in entry:
+                continue
+            remaining = entry[file] - count
+            if remaining > 0:
+                entry[file] = remaining
+                continue
+            del entry[file]
+            dropped += 1
+            if not entry:
+                del postings[token]
+                self._terms.remove(token)
+        if file in self._files:
+            self._files[file] -= dropped
+        self.postings -= dropped
+
+    def _unindex(self, directory: Directory) -> None:
+        """
+        Drops the postings of every file in a directory and scans it from now on.
+        """
+        self._unindexed.add(directory)
+        for child in directory.iter_children():
+            if child in self._files:
+                self._files.pop(child)
+                self._subtract(child, Counter(tokenize(child.content)))
+
+
+def _trailing_word(file: File) -> str:
+    """
+    Returns the word at the very end of a file's content, as stored, or "" if it ends in a non-word character.
+    """
+    store = file._store
+    length = len(store)
+    window = _TAIL_WINDOW
+    while True:
+        tail = store.read_range(max(0, length - window), window)
+        match = _TRAILING_TOKEN.search(tail)
+        if match is None:
+            return ''
+        if match.start() > 0 or window >= length:
+            return match.group()
+        window *= 4
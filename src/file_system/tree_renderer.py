@@ -0,0 +1,98 @@
+from src.file_system.constants import (
+    PATH_DELIMITER,
+    TREE_BRANCH,
+    TREE_LAST,
+    TREE_SPACE,
+    TREE_VERTICAL
+)
+from src.file_system.file import File
+
+
+def iter_tree_lines(directory, recurse: bool = False, sort: bool = False, name_prefix: str = None, after: str = None,
+                    limit: int = None, max_depth: int = None, max_entries: int = None, expand=None, label=str,
+                    is_directory=None, is_root=None):
+    """
+    Renders a directory as a tree, one line at a time.
+
+    The walk is iterative, keeping one child iterator per open directory, so
+    lines are produced as soon as they are known, memory stays proportional to
+    the depth of the tree and deep trees cannot hit the recursion limit.
+
+    Args:
+        directory (Directory): The directory to render.
+        recurse (bool): If True, descend into subdirectories.
+        sort (bool): If True, list entries in name order at every level.
+        name_prefix (str, optional): Only list top-level entries starting with this prefix.
+        after (str, optional): Only list top-level entries named after this one.
+        limit (int, optional): Maximum number of top-level entries.
+        max_depth (int, optional): Deepest level to descend to when recursing; 1 lists only direct children.
+        max_entries (int, optional): Stop after this many entries in total.
+        expand (callable, optional): Called as expand(directory, **filters) to get the children
+            of each directory listed; defaults to Directory.iter_children.
+        label (callable, optional): Returns the text shown for a node; defaults to str().
+        is_directory (callable, optional): Tells whether a node is a directory; defaults to not being a File.
+        is_root (callable, optional): Tells whether a directory is the root; defaults to having no parent.
+
+    Yields:
+        str: Newline-terminated lines of the tree.
+    """
+    is_directory = is_directory or _is_directory
+    header = f"{label(directory)}{PATH_DELIMITER}\n"
+    if (is_root or _is_root)(directory):
+        yield header
+        child_prefix = ""  # No indentation for the first level under root
+    else:
+        yield f"{TREE_LAST}{header}"
+        child_prefix = TREE_SPACE
+
+    expand = expand or _iter_children
+    top = expand(directory, sort=sort, name_prefix=name_prefix, after=after, limit=limit)
+    stack = [(_mark_last(top), child_prefix, 1)]
+    emitted = 0
+    while stack:
+        entries, prefix, depth = stack[-1]
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+            continue
+
+        if max_entries is not None and emitted >= max_entries:
+            yield f"... (listing truncated after {max_entries} entries)\n"
+            return
+        emitted += 1
+
+        is_last, child = entry
+        expandable = is_directory(child)
+        marker = TREE_LAST if is_last else TREE_BRANCH
+        yield f"{prefix}{marker}{label(child)}{PATH_DELIMITER if expandable else ''}\n"
+
+        if expandable and recurse and (max_depth is None or depth < max_depth):
+            nested_prefix = prefix + (TREE_SPACE if is_last else TREE_VERTICAL)
+            stack.append((_mark_last(expand(child, sort=sort)), nested_prefix, depth + 1))
+
+
+def _iter_children(directory, **filters):
+    return directory.iter_children(**filters)
+
+
+def _is_directory(node) -> bool:
+    return not isinstance(node, File)
+
+
+def _is_root(directory) -> bool:
+    return directory.parent is None
+
+
+def _mark_last(iterable):
+    """
+    Yields (is_last, item) pairs using one item of lookahead.
+    """
+    iterator = iter(iterable)
+    try:
+        current = next(iterator)
+    except StopIteration:
+        return
+    for upcoming in iterator:
+        yield False, current
+        current = upcoming
+    yield True, current
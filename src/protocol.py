@@ -0,0 +1,90 @@
+"""
+Wire protocol between the file system server and its clients.
+
+Every message is a FRAME (payload length) followed by the payload. A request
+payload is a compact JSON array [operation, arguments], for example
+["write", {"path": "a.txt", "content": "x"}]. A response payload is one
+STATUS byte followed by the UTF-8 output of the operation, or by the error
+message when the status is STATUS_ERROR.
+
+Requests on one connection are answered in order, so a client may send any
+number of requests before reading the responses (pipelining).
+"""
+import json
+import struct
+
+FRAME = struct.Struct('<I')   # payload length
+STATUS = struct.Struct('<B')  # response status
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+MAX_FRAME = 64 * 1024 * 1024  # Larger frames are rejected as corrupt
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def encode_request(operation: str, **arguments) -> bytes:
+    """
+    Frames a request.
+
+    Args:
+        operation (str): Operation name, e.g. "mkdir".
+        **arguments: Keyword arguments of the operation.
+
+    Returns:
+        bytes: The framed request.
+    """
+    payload = _encoder.encode([operation, arguments]).encode()
+    return FRAME.pack(len(payload)) + payload
+
+
+def decode_request(payload: bytes) -> tuple[str, dict]:
+    """
+    Returns the operation name and arguments of a request payload.
+
+    Raises:
+        ValueError: If the payload is not a valid request.
+    """
+    operation, arguments = json.loads(payload)
+    if not isinstance(operation, str) or not isinstance(arguments, dict):
+        raise ValueError("malformed request")
+    return operation, arguments
+
+
+def encode_response(status: int, text: str) -> bytes:
+    """
+    Frames a response.
+
+    Args:
+        status (int): STATUS_OK or STATUS_ERROR.
+        text (str): The output or error message.
+
+    Returns:
+        bytes: The framed response.
+    """
+    body = text.encode()
+    return FRAME.pack(len(body) + STATUS.size) + STATUS.pack(status) + body
+
+
+def decode_response(payload: bytes) -> tuple[int, str]:
+    """
+    Returns the status and text of a response payload.
+    """
+    return payload[0], payload[STATUS.size:].decode()
+
+
+def parse_address(address: str):
+    """
+    Parses a server address: "host:port" for TCP, anything else is a Unix socket path.
+
+    Args:
+        address (str): The address.
+
+    Returns:
+        tuple | str: (host, port) for TCP, or the socket path.
+    """
+    host, _, port = address.rpartition(':')
+    if host and port.isdigit():
+        return host, int(port)
+    return address
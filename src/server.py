@@ -0,0 +1,188 @@
+"""
+asyncio server that shares one FileSystem between many clients.
+
+Clients connect over TCP ("host:port") or a Unix socket (a path) and speak
+the length-prefixed protocol in src.protocol. Each connection keeps its own
+working directory (a Session). Requests are executed one at a time on the event loop,
+so the tree needs no locking, and each connection's responses are returned
+in request order, which lets clients pipeline.
+"""
+import asyncio
+import os
+import socket
+import stat
+
+from src.file_system.filesystem import FileSystem
+from src.file_system.exceptions import FileSystemError
+from src.file_system.session import Session
+from src.protocol import (
+    FRAME,
+    MAX_FRAME,
+    STATUS_ERROR,
+    STATUS_OK,
+    decode_request,
+    encode_response,
+    parse_address
+)
+
+
+def _ls(fs, session, recurse=False, sort=False, prefix=None, after=None, limit=None, max_depth=None, max_entries=None):
+    return "".join(fs.iter_ls(recurse=recurse, sort=sort, prefix=prefix, after=after, limit=limit,
+                              max_depth=max_depth, max_entries=max_entries, session=session))
+
+
+def _cd(fs, session, path):
+    fs.cd(path, session=session)
+    return ""
+
+
+def _mkdir(fs, session, paths):
+    fs.mkdir(*paths, session=session)
+    return ""
+
+
+def _touch(fs, session, paths, content=''):
+    fs.touch(*paths, content=content, session=session)
+    return ""
+
+
+def _write(fs, session, path, content, overwrite=False):
+    fs.write(path, content=content, overwrite=overwrite, session=session)
+    return ""
+
+
+def _del(fs, session, path, recurse=False):
+    fs.del_(path, recurse=recurse, session=session)
+    return ""
+
+
+# Operation name -> handler(fs, session, **arguments) returning the output text
+OPERATIONS = {
+    'ls': _ls,
+    'pwd': lambda fs, session, recurse=False: fs.pwd(recurse=recurse, session=session),
+    'cd': _cd,
+    'read': lambda fs, session, path, offset=0, length=None: fs.read(path, offset=offset, length=length, session=session),
+    'mkdir': _mkdir,
+    'touch': _touch,
+    'write': _write,
+    'del': _del,
+    'size': lambda fs, session, path: str(fs.size(path, session=session)),
+    'du': lambda fs, session, path='.': "\n".join(f"{size}\t{name}" for name, size in fs.du(path, session=session)),
+    'find': lambda fs, session, pattern, path='.': "\n".join(fs.find(pattern, path, session=session)),
+    'grep': lambda fs, session, query, path='.': "\n".join(fs.search(query, path, session=session)),
+}
+
+
+class FileSystemServer:
+    """
+    Serves FileSystem operations to socket clients.
+    """
+    def __init__(self, fs: FileSystem):
+        """
+        Args:
+            fs (FileSystem): The tree shared by all connections.
+        """
+        self.fs = fs
+        self.connections = 0  # Currently open connections
+        self.requests = 0  # Requests served since startup
+
+    def execute(self, payload: bytes, session: Session) -> bytes:
+        """
+        Runs one request on behalf of a connection.
+
+        Args:
+            payload (bytes): The request payload.
+            session (Session): The connection's session.
+
+        Returns:
+            bytes: The framed response.
+        """
+        fs = self.fs
+        self.requests += 1
+        try:
+            operation, arguments = decode_request(payload)
+            handler = OPERATIONS.get(operation)
+            if handler is None:
+                fs.root.raise_error(FileSystemError, f"Unknown operation '{operation}'")
+            response = encode_response(STATUS_OK, handler(fs, session, **arguments))
+        except FileSystemError as e:
+            response = encode_response(STATUS_ERROR, f"[{e.__class__.__name__}] {e.reason}")
+        except (ValueError, TypeError) as e:
+            response = encode_response(STATUS_ERROR, f"[BadRequest] {e}")
+        except Exception as e:
+            response = encode_response(STATUS_ERROR, f"[FileSystemError] Unknown error: {e}")
+        return response
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves one connection until the client disconnects.
+        """
+        session = self.fs.open_session()
+        self.connections += 1
+        try:
+            while True:
+                (length,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+                if length > MAX_FRAME:
+                    break
+                writer.write(self.execute(await reader.readexactly(length), session))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # Client went away
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def start(self, address: str) -> asyncio.AbstractServer:
+        """
+        Starts listening on address: "host:port" for TCP, or a Unix socket path.
+
+        Returns:
+            asyncio.AbstractServer: The listening server.
+
+        Raises:
+            FileSystemError: If the socket path is taken by something other than a stale socket.
+        """
+        target = parse_address(address)
+        if isinstance(target, tuple):
+            return await asyncio.start_server(self.handle, *target)
+        _remove_stale_socket(target)
+        return await asyncio.start_unix_server(self.handle, target)
+
+    async def serve_forever(self, address: str) -> None:
+        server = await self.start(address)
+        async with server:
+            await server.serve_forever()
+
+
+def _remove_stale_socket(path: str) -> None:
+    """
+    Deletes a Unix socket left by an earlier run, refusing to touch anything
+    that is not a socket or that a server still listens on.
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileSystemError(f"Cannot serve on '{path}': it exists and is not a socket.")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            os.unlink(path)  # Nobody is listening
+            return
+    raise FileSystemError(f"Cannot serve on '{path}': another server is listening on it.")
+
+
+def serve(fs: FileSystem, address: str) -> None:
+    """
+    Serves fs on address until interrupted.
+
+    Args:
+        fs (FileSystem): The tree to serve.
+        address (str): "host:port" for TCP, or a Unix socket path.
+    """
+    try:
+        asyncio.run(FileSystemServer(fs).serve_forever(address))
+    except KeyboardInterrupt:
+        pass
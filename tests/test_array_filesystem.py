@@ -0,0 +1,154 @@
+import os
+import tempfile
+import unittest
+from src.file_system.array_filesystem import ArrayFileSystem
+from src.file_system.content import ChunkedContent
+from src.file_system.filesystem import FileSystem
+from src.file_system.exceptions import FileSystemError, NotFoundError
+from src.file_system.inode_table import NONE
+
+COMMANDS = [
+    ("mkdir", ("docs/notes", "src/lib", "tmp"), {}),
+    ("touch", ("docs/readme.md", "src/main.py"), {"content": "hello"}),
+    ("write", ("docs/readme.md", " world"), {}),
+    ("touch", ("src/lib/util.py",), {"content": "x" * 10}),
+    ("cd", ("src",), {}),
+    ("ls", (), {"recurse": True}),
+    ("pwd", (True,), {}),
+    ("read", ("../docs/readme.md",), {"offset": 2, "length": 5}),
+    ("cd", ("lib/util.py",), {}),
+    ("cd", ("missing",), {}),
+    ("mkdir", ("main.py/sub",), {}),
+    ("touch", ("lib",), {}),
+    ("del_", ("lib",), {}),
+    ("cd", ("~",), {}),
+    ("ls", (), {"recurse": True, "sort": True}),
+    ("ls", (), {"sort": True, "prefix": "d"}),
+    ("du", (), {}),
+    ("del_", ("tmp",), {"recurse": True}),
+    ("mkdir", ("bad/na:me",), {}),
+    ("ls", (), {"recurse": True, "max_entries": 3}),
+    ("size", ("docs",), {}),
+    ("find", ("*.py",), {}),
+    ("find", ("[dn]*", "docs"), {}),
+    ("find", ("x", "docs/readme.md"), {}),
+    ("search", ('"hello world"',), {}),
+    ("search", ("x*", "src"), {}),
+]
+
+
+class TestArrayFileSystem(unittest.TestCase):
+    def setUp(self):
+        self.fs = ArrayFileSystem()
+
+    def run_commands(self, fs):
+        results = []
+        for name, args, kwargs in COMMANDS:
+            try:
+                results.append(getattr(fs, name)(*args, **kwargs))
+            except FileSystemError as e:
+                results.append((type(e).__name__, str(e)))
+        return results
+
+    def test_matches_object_engine(self):
+        self.assertEqual(self.run_commands(self.fs), self.run_commands(FileSystem()))
+        self.assertEqual(self.fs.get_size(), 26)
+
+    def test_images_are_interchangeable(self):
+        self.run_commands(self.fs)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tree.img")
+            self.fs.save(path)
+            loaded = FileSystem.load(path)
+            self.assertEqual(loaded.ls(recurse=True), self.fs.ls(recurse=True))
+            self.assertEqual(loaded.read("src/lib/util.py"), "x" * 10)
+
+            loaded.touch("new.txt", content="abc")
+            loaded.save(path)
+            reloaded = ArrayFileSystem.load(path)
+        self.assertEqual(reloaded.ls(recurse=True, sort=True), loaded.ls(recurse=True, sort=True))
+        self.assertEqual(reloaded.get_size(), loaded.get_size())
+        reloaded.touch("docs/notes/more.txt", content="1234")
+        self.assertEqual(reloaded.size("docs"), 15)
+
+    def test_appends_are_chunked(self):
+        record = "r" * 63 + "\n"
+        expected = FileSystem()
+        for fs in (self.fs, expected):
+            fs.touch("log", content="start\n")
+            for _ in range(200):
+                fs.write("log", record)
+        inode = self.fs._resolve("log")
+        self.assertIsInstance(self.fs.table.contents[inode], ChunkedContent)
+        self.assertEqual(self.fs.size("log"), 6 + 200 * 64)
+        self.assertEqual(self.fs.read("log"), "start\n" + record * 200)
+        self.assertEqual(self.fs.read("log", offset=4090, length=20), expected.read("log", offset=4090, length=20))
+        self.assertEqual(list(self.fs.read_chunks("log", offset=100, chunk_size=1000)),
+                         list(expected.read_chunks("log", offset=100, chunk_size=1000)))
+        self.fs.write("log", "new", overwrite=True)
+        self.assertEqual((self.fs.read("log"), self.fs.get_size()), ("new", 3))
+
+    def test_ordered_listings_keep_their_index(self):
+        def listings(fs):
+            return [fs.ls(sort=True), fs.ls(prefix="f"), fs.ls(after="b", limit=2), fs.ls(prefix="p", after="f")]
+
+        expected = FileSystem()
+        for fs in (self.fs, expected):
+            fs.mkdir("d/sub")
+            for name in ("pear", "apple", "fig", "plum"):
+                fs.touch(f"d/{name}")
+            fs.cd("d")
+        self.assertEqual(listings(self.fs), listings(expected))
+        directory = self.fs.session.cwd
+        self.assertEqual(list(self.fs.table.ordered(directory)), ["apple", "fig", "pear", "plum", "sub"])
+
+        for fs in (self.fs, expected):
+            fs.touch("banana")
+            fs.del_("fig")
+        self.assertEqual(listings(self.fs), listings(expected))
+        self.assertEqual(list(self.fs.table.ordered(directory)), ["apple", "banana", "pear", "plum", "sub"])
+
+        for fs in (self.fs, expected):
+            fs.cd("~")
+            fs.del_("d", recurse=True)
+            fs.mkdir(*(f"r{i}/new" for i in range(5)))  # Reuses every inode of d, which must not bring its index along
+        self.assertEqual(self.fs.ls(recurse=True, sort=True, max_entries=50), expected.ls(recurse=True, sort=True, max_entries=50))
+
+    def test_failed_save_leaves_no_temporary_file(self):
+        self.fs.touch("bad.txt", content="\ud800")  # A lone surrogate cannot be encoded
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaises(UnicodeEncodeError):
+                self.fs.save(os.path.join(tmp, "tree.img"))
+            self.assertEqual(os.listdir(tmp), [])
+
+    def test_sessions_leave_deleted_subtree(self):
+        self.fs.mkdir("a/b/c", "keep")
+        session = self.fs.open_session()
+        self.fs.cd("a/b/c", session=session)
+        self.fs.cd("keep")
+        self.fs.del_("~/a/b", recurse=True)
+        self.assertEqual(self.fs.pwd(True, session=session), "~/a")
+        self.assertEqual(self.fs.pwd(True), "~/keep")
+
+    def test_inodes_and_names_are_reused(self):
+        for _ in range(3):
+            self.fs.mkdir(*(f"d{i}/sub" for i in range(50)))
+            for i in range(50):
+                self.fs.touch(f"d{i}/sub/file", content="abc")
+            self.assertEqual(self.fs.get_size(), 150)
+            self.fs.del_("~", recurse=True)
+        table = self.fs.table
+        self.assertEqual(len(table), 1)
+        self.assertLessEqual(len(table.kind), 151)
+        with self.assertRaises(NotFoundError):
+            self.fs.read("d1/sub/file")
+        self.assertEqual(table.find(self.fs.root, "d1"), NONE)
+        self.assertEqual(self.fs.ls(), "~/\n")
+
+    def test_unsupported_features(self):
+        with self.assertRaises(FileSystemError):
+            self.fs.snapshot()
+
+
+if __name__ == '__main__':
+    unittest.main()
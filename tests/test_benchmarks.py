@@ -0,0 +1,72 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+import os
+import tempfile
+from benchmarks import dispatch, server, suite, threads
+
+class TestBenchmarkSuite(unittest.TestCase):
+    def test_small_run(self):
+        with redirect_stdout(io.StringIO()):
+            results = suite.run(widths=[20], depths=[5], repeat=2)
+        self.assertIn('mkdir/width=20', results)
+        self.assertEqual(results['del -R/depth=5']['ops'], 2)
+        self.assertEqual(results['touch/width=20']['ops'], 40)
+        self.assertGreater(results['read/depth=5']['calibration'], 0)
+        self.assertGreater(results['read/depth=5']['ops_per_sec'], 0)
+
+    def test_compare_flags_regressions(self):
+        baseline = {
+            'read/width=10': {'ops': 100, 'ops_per_sec': 1000.0},
+            'touch/width=10': {'ops': 100, 'ops_per_sec': 1000.0},
+            'del -R/width=10': {'ops': 3, 'ops_per_sec': 1000.0},
+        }
+        results = {
+            'read/width=10': {'ops': 100, 'ops_per_sec': 700.0},
+            'touch/width=10': {'ops': 100, 'ops_per_sec': 900.0},
+            'del -R/width=10': {'ops': 3, 'ops_per_sec': 1.0},  # Too few samples to gate
+            'new/width=10': {'ops': 100, 'ops_per_sec': 1.0},
+        }
+        regressions = suite.compare(results, baseline, tolerance=0.25)
+        self.assertEqual(regressions, [('read/width=10', 1000.0, 700.0)])
+
+        # A machine half as fast halves what is expected
+        baseline['read/width=10']['calibration'] = 2.0
+        results['read/width=10']['calibration'] = 1.0
+        self.assertEqual(suite.compare(results, baseline, tolerance=0.25), [])
+        results['read/width=10']['ops_per_sec'] = 300.0
+        self.assertEqual(suite.compare(results, baseline, tolerance=0.25), [('read/width=10', 500.0, 300.0)])
+
+    def test_confirm_keeps_regressions_that_reproduce(self):
+        baseline = {
+            'read/width=20': {'ops': 100, 'ops_per_sec': 1e12},  # Beyond any machine
+            'touch/width=20': {'ops': 100, 'ops_per_sec': 1.0},
+        }
+        flagged = [('read/width=20', 1e12, 1.0), ('touch/width=20', 1.0, 0.5)]
+        with redirect_stdout(io.StringIO()):
+            regressions = suite.confirm(flagged, baseline, tolerance=0.25, repeat=1)
+        self.assertEqual([key for key, _, _ in regressions], ['read/width=20'])
+
+class TestThreadBenchmark(unittest.TestCase):
+    def test_small_run_is_consistent(self):
+        with redirect_stdout(io.StringIO()):
+            results = threads.run(threads=[1, 4], ops=100)
+        self.assertEqual(set(results), {'disjoint/threads=1', 'disjoint/threads=4', 'shared/threads=1', 'shared/threads=4'})
+        for result in results.values():
+            self.assertEqual(result['errors'], [])
+
+class TestServerBenchmark(unittest.TestCase):
+    def test_small_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            results = server.run(os.path.join(tmp, "bench.sock"), ops=50)
+        self.assertEqual(results['sequential/read']['ops'], 50)
+        self.assertGreater(results['pipelined']['ops_per_sec'], 0)
+
+class TestDispatchBenchmark(unittest.TestCase):
+    def test_small_run(self):
+        results = dispatch.run(rounds=20)
+        self.assertEqual(set(results), {'rebuild', 'argparse', 'fast'})
+        self.assertLess(results['fast'], results['argparse'])
+
+if __name__ == "__main__":
+    unittest.main()
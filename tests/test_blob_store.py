@@ -0,0 +1,69 @@
+import gc
+import threading
+import unittest
+from src.file_system.filesystem import FileSystem
+from src.file_system.blob_store import BlobStore
+from src.file_system.exceptions import FileSystemError
+
+class TestBlobStore(unittest.TestCase):
+    def test_equal_contents_share_one_blob(self):
+        blobs = BlobStore()
+        first = blobs.new_content("template" * 10)
+        second = blobs.new_content("".join(["template"] * 10))  # Equal, but a different string
+        self.assertIs(first.getvalue(), second.getvalue())
+        self.assertEqual(len(blobs), 1)
+        self.assertEqual(blobs.stats()['saved'], 80)
+
+        second.append("!")  # Copy on write: the shared blob is left as it was
+        self.assertEqual(first.getvalue(), "template" * 10)
+        self.assertEqual(blobs.stats()['references'], 1)
+        del first
+        gc.collect()
+        self.assertEqual(len(blobs), 0)
+
+    def test_finalizer_under_held_lock(self):
+        blobs = BlobStore()
+        store = blobs.new_content("shared")
+
+        def collect_while_locked():
+            nonlocal store
+            with blobs._lock:  # As if collection ran in the middle of acquire or release
+                store = None
+
+        thread = threading.Thread(target=collect_while_locked, daemon=True)
+        thread.start()
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(blobs.stats()['references'], 0)
+        self.assertEqual(len(blobs), 0)
+
+    def test_filesystem_touch_shares_content(self):
+        fs = FileSystem(dedup=True)
+        fs.touch(*(f"f{i}" for i in range(100)), content="x" * 50)
+        stats = fs.content_stats()
+        self.assertEqual((stats['blobs'], stats['references']), (1, 100))
+        self.assertEqual((stats['logical_size'], stats['stored_size'], stats['saved']), (5000, 50, 4950))
+        self.assertEqual(stats['dedup_ratio'], 100.0)
+        self.assertEqual(fs.get_size(), 5000)
+
+        fs.write("f0", "other", overwrite=True)
+        fs.write("f1", "!")
+        stats = fs.content_stats()
+        self.assertEqual((stats['blobs'], stats['references']), (2, 99))
+        self.assertEqual(fs.read("f2"), "x" * 50)
+
+    def test_snapshot_keeps_shared_content(self):
+        fs = FileSystem(dedup=True)
+        fs.touch("a", "b", content="same")
+        snapshot = fs.snapshot()
+        fs.write("a", "changed", overwrite=True)
+        self.assertEqual(snapshot.read("a"), "same")
+        self.assertEqual(fs.read("b"), "same")
+        self.assertEqual(fs.content_stats()['blobs'], 2)
+
+    def test_stats_require_dedup(self):
+        with self.assertRaises(FileSystemError):
+            FileSystem().content_stats()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,7 @@
+import io
 import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from src import cli
 from src.file_system.filesystem import FileSystem
 from src.file_system.exceptions import FileSystemError, NotADirectoryError, DuplicateNameError
 
@@ -31,6 +34,13 @@ class TestCLI(unittest.TestCase):
         self.assertIn("file2.txt", output)
         self.assertIn("c", output)
 
+    def test_ls_prefix(self):
+        """Test listing only entries with a name prefix, in name order."""
+        self.fs.touch("b.txt", "a2.txt", "a1.txt")
+        output = self.fs.ls(prefix="a")
+        self.assertNotIn("b.txt", output)
+        self.assertLess(output.index("a1.txt"), output.index("a2.txt"))
+
     def test_cd_and_pwd(self):
         """Test changing directories and printing the current working directory."""
         self.fs.mkdir("a/b/c")
@@ -76,6 +86,27 @@ class TestCLI(unittest.TestCase):
         content = self.fs.read("file.txt")
         self.assertEqual(content, "Read me!")
 
+    def test_write_append_and_overwrite(self):
+        """Test appending to and overwriting a file keeps sizes in sync."""
+        self.fs.mkdir("logs")
+        self.fs.touch("logs/app.log", content="a")
+        for _ in range(3):
+            self.fs.write("logs/app.log", content="bc")
+        self.assertEqual(self.fs.read("logs/app.log"), "abcbcbc")
+        self.assertEqual(self.fs.size("logs"), 7)
+        self.fs.write("logs/app.log", content="z", overwrite=True)
+        self.assertEqual(self.fs.read("logs/app.log"), "z")
+        self.assertEqual(self.fs.get_size(), 1)
+
+    def test_read_range(self):
+        """Test reading a range of a file's content."""
+        self.fs.touch("file.txt", content="Read me!")
+        self.assertEqual(self.fs.read("file.txt", offset=5), "me!")
+        self.assertEqual(self.fs.read("file.txt", offset=0, length=4), "Read")
+        self.assertEqual("".join(self.fs.read_chunks("file.txt", chunk_size=3)), "Read me!")
+        with self.assertRaises(FileSystemError):
+            self.fs.read("file.txt", offset=-1)
+
     def test_size_command(self):
         """Test getting the size of a file and a directory."""
         self.fs.touch("file1.txt", content="12345")
@@ -86,6 +117,38 @@ class TestCLI(unittest.TestCase):
         self.assertEqual(file_size, 5)
         self.assertEqual(dir_size, 5)
 
+    def test_du_command(self):
+        """Test per-entry sizes reported from the aggregated subtree sizes."""
+        self.fs.mkdir("a/b")
+        self.fs.touch("a/b/f.txt", content="12345")
+        self.fs.touch("a/g.txt", content="678")
+        self.assertEqual(self.fs.du("a"), [("b/", 5), ("g.txt", 3), ("a", 8)])
+        output = io.StringIO()
+        with redirect_stdout(output):
+            cli.execute_command(self.fs, cli.parse_command("du"))
+        self.assertEqual(output.getvalue(), "8\ta/\n8\t.\n")
+
+    def test_find_command(self):
+        """Test finding nodes by name and glob pattern."""
+        self.fs.mkdir("a/b", "c")
+        self.fs.touch("a/b/config.json", "c/config.json", "a/main.py")
+        output = io.StringIO()
+        with redirect_stdout(output):
+            cli.execute_command(self.fs, cli.parse_command("find -name config.json"))
+            cli.execute_command(self.fs, cli.parse_command("find a -name '*.py'"))
+        self.assertEqual(output.getvalue(), "~/a/b/config.json\n~/c/config.json\n~/a/main.py\n")
+
+    def test_grep_command(self):
+        """Test listing the files whose content matches a query."""
+        self.fs.mkdir("logs")
+        self.fs.touch("logs/app.log", content="disk full")
+        self.fs.touch("notes.txt", content="full of ideas")
+        output = io.StringIO()
+        with redirect_stdout(output):
+            cli.execute_command(self.fs, cli.parse_command("grep full"))
+            cli.execute_command(self.fs, cli.parse_command("grep '\"disk full\"' logs"))
+        self.assertEqual(output.getvalue(), "~/logs/app.log\n~/notes.txt\n~/logs/app.log\n")
+
     def test_random_commands(self):
         """Test a sequence of random commands."""
         self.fs.mkdir("dir1")
@@ -101,5 +164,32 @@ class TestCLI(unittest.TestCase):
         self.assertIn("subdir", output)
         self.assertNotIn("file1.txt", output)
 
+    def test_batch_mode(self):
+        """Test running a script of commands with one output flush and a timing report."""
+        script = [
+            "# comment",
+            "mkdir logs",
+            "touch logs/app.log --content 'hello world'",
+            "",
+            "read logs/app.log",
+            "size logs",
+            "not-a-command",
+            "--image x.img",
+            "exit",
+            "mkdir never",
+        ]
+        output, report = io.StringIO(), io.StringIO()
+        with redirect_stdout(output), redirect_stderr(io.StringIO()):  # argparse reports syntax errors on stderr
+            stats = cli.batch_mode(script, lambda args: cli.execute_command(self.fs, args), report=report)
+
+        self.assertEqual(output.getvalue().splitlines()[:2], ["hello world", "11"])
+        self.assertIn("Invalid command syntax: 'not-a-command'", output.getvalue())
+        self.assertIn("Unknown or incomplete command '--image x.img'", output.getvalue())
+        self.assertNotIn(None, stats['per_command'])
+        self.assertIsNone(self.fs.root.find_child("never"))
+        self.assertEqual(stats['commands'], 4)
+        self.assertEqual(stats['per_command']['mkdir'][0], 1)
+        self.assertTrue(report.getvalue().startswith("Ran 4 commands"))
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from src.file_system.filesystem import FileSystem
+from src.file_system.concurrent_filesystem import ConcurrentFileSystem
+from src.file_system.cold_tier import ColdContent
+from src.file_system.exceptions import FileSystemError
+
+class TestColdTier(unittest.TestCase):
+    def setUp(self):
+        self.fs = FileSystem(cold_budget=20_000)
+        self.fs.mkdir("logs")
+        self.text = "2024-01-01 INFO request served\n" * 500  # 15500 characters
+        self.fs.touch("logs/a.log", "logs/b.log", content=self.text)
+        self.fs.touch("logs/small.txt", content="tiny")
+
+    def test_compress_keeps_sizes_exact(self):
+        total = self.fs.get_size()
+        self.assertEqual(self.fs.compress_cold(idle=0), 2)  # small.txt is below the minimum size
+        self.assertIsInstance(self.fs.root.find_child("logs").find_child("a.log")._store, ColdContent)
+        self.assertEqual(self.fs.get_size(), total)
+        self.assertEqual(self.fs.size("logs/a.log"), len(self.text))
+        stats = self.fs.cold_stats()
+        self.assertEqual(stats['files'], 2)
+        self.assertGreater(stats['compression_ratio'], 10)
+        self.assertEqual(stats['decompressions'], 0)
+        self.assertEqual(self.fs.compress_cold(idle=0), 0)  # Already cold
+
+    def test_reads_use_bounded_cache(self):
+        self.fs.compress_cold(idle=0)
+        self.assertEqual(self.fs.read("logs/a.log"), self.text)
+        self.assertEqual(self.fs.read("logs/a.log", offset=11, length=4), "INFO")
+        self.assertEqual("".join(self.fs.read_chunks("logs/b.log", chunk_size=1000)), self.text)
+        stats = self.fs.cold_stats()
+        self.assertEqual((stats['decompressions'], stats['cache_hits']), (2, 1))
+        self.assertEqual(stats['cached_size'], len(self.text))  # Both do not fit in the budget
+        self.assertEqual(stats['files'], 2)  # Reading leaves the files compressed
+
+        self.fs.cold.budget = 0
+        self.assertEqual(self.fs.cold_stats()['cached_size'], 0)
+
+    def test_reads_keep_files_warm(self):
+        logs = self.fs.root.find_child("logs")
+        for name in ("a.log", "b.log"):
+            file = logs.find_child(name)
+            file.rtime = file.mtime = 0  # Idle since the epoch
+        self.fs.read("logs/a.log")
+        self.assertEqual(self.fs.compress_cold(idle=3600), 1)
+        self.assertNotIsInstance(logs.find_child("a.log")._store, ColdContent)
+        self.assertIsInstance(logs.find_child("b.log")._store, ColdContent)
+
+    def test_write_thaws(self):
+        self.fs.compress_cold(idle=0)
+        self.fs.write("logs/a.log", "more\n")
+        self.assertEqual(self.fs.read("logs/a.log"), self.text + "more\n")
+        self.assertEqual(self.fs.size("logs"), 2 * len(self.text) + len("more\n") + 4)
+        self.assertEqual(self.fs.cold_stats()['files'], 1)
+        self.assertEqual(self.fs.compress_cold(idle=3600), 0)  # Just written
+        self.assertEqual(self.fs.compress_cold(idle=0), 1)
+
+    def test_snapshot_reads_compressed_content(self):
+        snapshot = self.fs.snapshot()
+        self.fs.compress_cold(idle=0)
+        self.fs.write("logs/a.log", "changed", overwrite=True)
+        self.assertEqual(snapshot.read("logs/a.log"), self.text)
+        self.assertEqual(self.fs.read("logs/a.log"), "changed")
+
+    def test_concurrent_sweep(self):
+        fs = ConcurrentFileSystem(cold_budget=0)
+        fs.touch("a", content=self.text)
+        self.assertEqual(fs.compress_cold(idle=0), 1)
+        self.assertEqual(fs.read("a"), self.text)
+        self.assertEqual(fs.cold_stats()['cached_size'], 0)
+
+    def test_requires_budget(self):
+        with self.assertRaises(FileSystemError):
+            FileSystem().compress_cold()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from src import cli
+from src.command_parser import parse_fast, tokenize
+
+class TestCommandParser(unittest.TestCase):
+    def test_matches_argparse(self):
+        commands = [
+            "ls",
+            "ls -R -s --prefix a --after a1 --limit 5 --max-depth 2 --max-entries 9",
+            "pwd --recurse",
+            "cd ../logs",
+            "del tmp -R",
+            "read app.log --offset 3 --length 4",
+            "mkdir a b/c",
+            "touch f.txt --content 'hello world'",
+            "write f.txt --overwrite --content \"x y\"",
+            "size ~",
+            "du",
+            "du logs",
+            "find -name config.json",
+            "find logs --name '*.log'",
+            "grep error",
+            "grep '\"disk full\"' logs",
+        ]
+        for command in commands:
+            with self.subTest(command=command):
+                fast = vars(parse_fast(command))
+                expected = vars(cli.parse_arguments(command))
+                self.assertEqual(fast, {key: expected[key] for key in fast})
+
+    def test_falls_back_to_argparse(self):
+        for command in ["ls --help", "ls -Rs", "ls --limit=3", "read f --offset x", "write f",
+                        "cd", "cd a b", "touch 'open", "bogus", "", "write f --content -x", "find logs", "grep"]:
+            with self.subTest(command=command):
+                self.assertIsNone(parse_fast(command))
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("touch  a.txt\t--content x"), ["touch", "a.txt", "--content", "x"])
+        self.assertEqual(tokenize("touch a.txt --content 'a b'"), ["touch", "a.txt", "--content", "a b"])
+
+if __name__ == "__main__":
+    unittest.main()
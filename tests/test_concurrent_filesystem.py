@@ -0,0 +1,105 @@
+import sys
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from src.file_system.concurrent_filesystem import ConcurrentFileSystem
+from src.file_system.concurrency import RWLock
+from src.file_system.filesystem import FileSystem
+from src.file_system.exceptions import FileSystemError, NotFoundError
+
+class TestRWLock(unittest.TestCase):
+    def test_readers_share_and_writer_excludes(self):
+        lock = RWLock()
+        lock.acquire()
+        lock.acquire()  # A second reader does not block
+
+        acquired = threading.Event()
+        def writer():
+            lock.acquire(exclusive=True)
+            acquired.set()
+            lock.release(exclusive=True)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+        lock.release()
+        lock.release()
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+
+class TestConcurrentFileSystem(unittest.TestCase):
+    def setUp(self):
+        self.fs = ConcurrentFileSystem()
+
+    def test_basic_operations(self):
+        self.fs.mkdir("a/b", "~/c")
+        self.fs.touch("a/b/f.txt", content="hi")
+        self.fs.write("a/b/f.txt", content="!")
+        self.assertEqual(self.fs.read("~/a/b/f.txt"), "hi!")
+        self.assertEqual("".join(self.fs.read_chunks("a/b/f.txt", offset=1)), "i!")
+        self.assertEqual(self.fs.size("a"), 3)
+        self.fs.cd("a/b")
+        self.assertEqual(self.fs.read("../b/./f.txt"), "hi!")
+        self.assertIn("f.txt", self.fs.ls())
+        with self.assertRaises(NotFoundError):
+            self.fs.read("missing.txt")
+        with self.assertRaises(FileSystemError):
+            self.fs.del_("~/c")
+        self.fs.cd("~")
+        self.fs.del_("a", recurse=True)
+        self.assertEqual(self.fs.get_size(), 0)
+        self.assertEqual(self.fs.ls(), "~/\n└──  c/\n")
+
+    def test_parallel_writes_keep_sizes_exact(self):
+        workers, ops = 8, 500
+        self.fs.mkdir("shared", *(f"w{i}" for i in range(workers)))
+        self.fs.touch(*(f"shared/f{i}" for i in range(workers)), *(f"w{i}/f" for i in range(workers)))
+
+        def work(worker):
+            for _ in range(ops):
+                self.fs.write(f"shared/f{worker}", content="ab")
+                self.fs.write(f"~/w{worker}/f", content="c")
+                self.fs.read(f"w{worker}/f")
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(work, range(workers)))
+
+        self.assertEqual(self.fs.size("shared"), 2 * ops * workers)
+        self.assertEqual(self.fs.get_size(), 3 * ops * workers)
+        for worker in range(workers):
+            self.assertEqual(self.fs.read(f"w{worker}/f"), "c" * ops)
+
+    def test_full_and_ranged_reads_run_together(self):
+        self.fs.touch("log")
+
+        def read(ranged):
+            total = self.fs.size("log")
+            if ranged:
+                return len(self.fs.read("log", offset=1, length=total - 2)) == total - 2
+            return len(self.fs.read("log")) == total
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # Switch threads often enough for the readers to interleave
+        try:
+            with ThreadPoolExecutor(max_workers=6) as pool:
+                for _ in range(15):
+                    for _ in range(20):
+                        self.fs.write("log", content="x" * 5000)
+                    self.assertTrue(all(pool.map(read, [True, False] * 3)))
+        finally:
+            sys.setswitchinterval(interval)
+
+    def test_size_locks_stay_with_their_tree(self):
+        plain = FileSystem()
+        plain.touch("b.txt", content="x")
+        self.assertIsNone(plain.ledger.size_locks)  # setUp built a concurrent tree first
+        self.assertIsNotNone(self.fs.ledger.size_locks)
+        plain.write("b.txt", "yz")
+        self.assertEqual(plain.get_size(), 3)
+
+    def test_snapshot_not_supported(self):
+        with self.assertRaises(FileSystemError):
+            self.fs.snapshot()
+
+if __name__ == "__main__":
+    unittest.main()
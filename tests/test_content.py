@@ -0,0 +1,46 @@
+import unittest
+from src.file_system.content import ChunkedContent
+
+class TestChunkedContent(unittest.TestCase):
+    def setUp(self):
+        self.content = ChunkedContent("Hello")
+
+    def test_append(self):
+        self.content.append(" World")
+        self.content.append("")
+        self.assertEqual(len(self.content), 11)
+        self.assertEqual(self.content.getvalue(), "Hello World")
+
+    def test_large_appends_stay_chunked(self):
+        record = "x" * ChunkedContent.COALESCE_LIMIT
+        for _ in range(10):
+            self.content.append(record)
+        self.assertEqual(len(self.content._chunks), 11)
+        self.assertEqual(len(self.content), 5 + 10 * len(record))
+        self.assertEqual(self.content.getvalue(), "Hello" + record * 10)
+        self.assertEqual(len(self.content._chunks), 11)  # Reads never restructure the chunks
+
+    def test_replace(self):
+        self.content.append("!")
+        self.content.replace("")
+        self.assertEqual(len(self.content), 0)
+        self.assertEqual(self.content.getvalue(), "")
+
+    def test_read_range_across_chunks(self):
+        record = "0123456789" * (ChunkedContent.COALESCE_LIMIT // 10)
+        for _ in range(3):
+            self.content.append(record)
+        full = "Hello" + record * 3
+        chunk_count = len(self.content._chunks)
+        for offset, length in ((0, 5), (3, 10), (len(full) - 4, 100), (4096, 8192), (len(full), 1), (7, None)):
+            self.assertEqual(self.content.read_range(offset, length), full[offset:None if length is None else offset + length])
+        self.assertEqual(len(self.content._chunks), chunk_count)  # Ranged reads never join
+
+    def test_iter_range_pieces(self):
+        self.content.append("x" * ChunkedContent.COALESCE_LIMIT)
+        pieces = list(self.content.iter_range(2, 10, chunk_size=4))
+        self.assertEqual(pieces, ["llo", "xxxx", "xxx"])
+        self.assertIs(next(self.content.iter_range()), self.content._chunks[0])  # Whole chunks are not copied
+
+if __name__ == "__main__":
+    unittest.main()
@@ -51,6 +51,29 @@ class TestDirectory(unittest.TestCase):
         self.assertIsNone(self.directory.find_child('hello'))
         self.assertEqual(self.directory.count, 2)
 
+    def test_rename_child(self):
+        """Test that renaming a child keeps name lookups in sync."""
+        foo = self.directory.find_child('foo')
+        foo.rename('bar')
+        self.assertIsNone(self.directory.find_child('foo'))
+        self.assertIs(self.directory.find_child('bar'), foo)
+
+        # Renaming onto an existing sibling is rejected
+        with self.assertRaises(DuplicateNameError):
+            foo.rename('baz')
+        self.assertEqual(foo.name, 'bar')
+
+    def test_iter_children_sorted(self):
+        """Test name-ordered, prefix and paged iteration over children."""
+        for name in ('foo2', 'apple', 'foo1'):
+            self.directory.add_child(File(name))
+        names = lambda **kwargs: [child.name for child in self.directory.iter_children(**kwargs)]
+        self.assertEqual(names(sort=True), ['apple', 'baz', 'foo', 'foo1', 'foo2', 'hello'])
+        self.assertEqual(names(name_prefix='foo'), ['foo', 'foo1', 'foo2'])
+        self.assertEqual(names(name_prefix='foo', after='foo'), ['foo1', 'foo2'])
+        self.assertEqual(names(after='baz', limit=2), ['foo', 'foo1'])
+        self.assertEqual(names(limit=2), ['foo', 'hello'])  # Insertion order
+
     def test_overwrite_file_in_directory(self):
         """Test overwriting a file in a directory and updating size."""
         # Initial setup
@@ -4,6 +4,8 @@ from src.file_system.directory import Directory
 from src.file_system.file import File
 from src.file_system.constants import ROOT, PATH_DELIMITER
 
+NUM_CHILDREN = 10 ** 6
+
 class TestDirectoryBig(unittest.TestCase):
     def setUp(self):
         # Start with a root directory for each test.
@@ -11,20 +13,20 @@ class TestDirectoryBig(unittest.TestCase):
 
     def test_add_many_children(self):
         """Test adding a large number of children (files) to the root directory."""
-        num_children = 1000
+        num_children = NUM_CHILDREN
         for i in range(num_children):
             f = File(f"file_{i}")
             self.root.add_child(f)
         self.assertEqual(self.root.children.length, num_children)
         
         # Check a middle file exists.
-        mid_file = self.root.find_child("file_500")
+        mid_file = self.root.find_child(f"file_{num_children // 2}")
         self.assertIsNotNone(mid_file)
-        self.assertEqual(mid_file.name, "file_500")
+        self.assertEqual(mid_file.name, f"file_{num_children // 2}")
 
     def test_remove_many_children(self):
         """Test removing children after adding many files."""
-        num_children = 1000
+        num_children = NUM_CHILDREN
         for i in range(num_children):
             self.root.add_child(File(f"file_{i}"))
         self.assertEqual(self.root.children.length, num_children)
@@ -71,7 +73,7 @@ class TestDirectoryBig(unittest.TestCase):
         total_nodes = 0
         def traverse(directory: Directory):
             nonlocal total_nodes
-            for _, child in directory.children.enumerate():
+            for child in directory.children.values():
                 total_nodes += 1
                 if hasattr(child, "children"):
                     traverse(child)
@@ -135,7 +137,7 @@ class TestDirectoryBig(unittest.TestCase):
         total_nodes = 0
         def traverse(directory: Directory):
             nonlocal total_nodes
-            for _, child in directory.children.enumerate():
+            for child in directory.children.values():
                 total_nodes += 1
                 if hasattr(child, "children"):
                     traverse(child)
@@ -1,7 +1,7 @@
 import unittest
 import time
 from src.file_system.file import File
-from src.file_system.exceptions import InvalidNameError
+from src.file_system.exceptions import InvalidNameError, FileSystemError
 
 class TestFile(unittest.TestCase):
 
@@ -27,6 +27,21 @@ class TestFile(unittest.TestCase):
         self.assertEqual(file._content, "Hello World")
         self.assertEqual(file.size, 11)
 
+    def test_read_range(self):
+        """Test reading part of the file content"""
+        file = File("test_file", "Hello World")
+        self.assertEqual(file.read_range(6, 5), "World")
+        self.assertEqual(file.read_range(6), "World")
+        self.assertEqual(file.read_range(20, 5), "")
+        with self.assertRaises(FileSystemError):
+            file.read_range(-1)
+
+    def test_iter_chunks(self):
+        """Test streaming the file content in pieces"""
+        file = File("test_file", "Hello World")
+        self.assertEqual(list(file.iter_chunks(chunk_size=4)), ["Hell", "o Wo", "rld"])
+        self.assertEqual("".join(file.iter_chunks(offset=6)), "World")
+
     def test_mtime_updates_on_write(self):
         """Test that modifying content updates the modification time"""
         file = File("test_file")
@@ -80,5 +80,66 @@ class TestFileSystem(unittest.TestCase):
             self.assertTrue(self.fs.cd(path))
             self.assertEqual(self.fs.current.name, path.split('/')[-1] if path != '~' else ROOT)
 
+    def test_recursive_delete_detaches_subtree(self):
+        self.fs.mkdir('keep', 'big')
+        self.fs.touch('keep/file.txt', content='12345')
+        for i in range(50):
+            self.fs.mkdir(f'big/dir_{i}')
+            self.fs.touch(f'big/dir_{i}/file.txt', content='xx')
+        self.assertEqual(self.fs.get_size(), 105)
+
+        big = self.fs.root.find_child('big')
+        self.fs.del_('big', recurse=True)
+        self.assertIsNone(self.fs.root.find_child('big'))
+        self.assertEqual(self.fs.get_size(), 5)
+
+        # The detached subtree is torn down lazily, in bounded steps
+        self.assertEqual(self.fs.reclaim(budget=10), 10)
+        self.fs.reclaim()
+        self.assertEqual(len(big.children), 0)
+        self.assertEqual(self.fs.reclaim(), 0)
+
+    def test_recursive_delete_keeps_current_directory_usable(self):
+        self.fs.mkdir('a/b')
+        self.fs.touch('a/b/file.txt')
+        self.fs.cd('a/b')
+        self.fs.del_('~/a', recurse=True)
+        self.fs.reclaim()
+        self.assertIn('file.txt', self.fs.ls())
+
+    def test_recursive_delete_of_root_empties_it(self):
+        self.fs.mkdir('a/b', 'c')
+        self.fs.touch('file.txt', content='abc')
+        self.fs.del_('~', recurse=True)
+        self.assertEqual(self.fs.root.count, 0)
+        self.assertEqual(self.fs.get_size(), 0)
+
+    def test_sessions_have_independent_working_directories(self):
+        self.fs.mkdir('a', 'b')
+        first, second = self.fs.open_session(), self.fs.open_session()
+        self.fs.cd('a', session=first)
+        self.fs.cd('b', session=second)
+        self.fs.touch('f.txt', content='x', session=first)
+        self.fs.mkdir('sub', session=second)
+
+        self.assertEqual(self.fs.pwd(recurse=True, session=first), '~/a')
+        self.assertEqual(self.fs.pwd(recurse=True, session=second), '~/b')
+        self.assertEqual(self.fs.pwd(recurse=True), '~')  # The default session did not move
+        self.assertEqual(self.fs.read('../a/f.txt', session=second), 'x')
+        self.assertIn('sub', self.fs.ls(session=second))
+        self.assertEqual(self.fs.size('f.txt', session=first), 1)
+
+    def test_session_directory_survives_delete_and_snapshot(self):
+        self.fs.mkdir('a/b')
+        session = self.fs.open_session()
+        self.fs.cd('a/b', session=session)
+        self.fs.snapshot()
+        self.fs.touch('f.txt', session=session)  # Copies a/b; the session must follow the copy
+        self.assertIsNotNone(self.fs.root.find_child('a').find_child('b').find_child('f.txt'))
+
+        self.fs.del_('a', recurse=True)
+        self.fs.reclaim()
+        self.assertIn('f.txt', self.fs.ls(session=session))
+
 if __name__ == '__main__':
     unittest.main()
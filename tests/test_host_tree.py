@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from src.file_system.array_filesystem import ArrayFileSystem
+from src.file_system.filesystem import FileSystem
+from src.file_system.concurrent_filesystem import ConcurrentFileSystem
+from src.file_system.exceptions import DuplicateNameError, InvalidNameError, NotADirectoryError
+from src.file_system.journal import Journal
+
+class TestHostTree(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "source")
+        os.makedirs(os.path.join(self.source, "a", "b"))
+        os.makedirs(os.path.join(self.source, "empty"))
+        self._write("a/notes.txt", b"line one\r\nline two\n")
+        self._write("a/b/blob.bin", b"\xff\xfe\x00raw")
+        self._write("top.txt", b"")
+        self.fs = FileSystem()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, relative, data):
+        with open(os.path.join(self.source, relative), "wb") as host_file:
+            host_file.write(data)
+
+    def test_import_builds_tree_and_sizes(self):
+        self.fs.mkdir("mirror")
+        self.assertEqual(self.fs.import_tree(self.source, "mirror"), 6)
+        self.assertEqual(self.fs.read("mirror/a/notes.txt"), "line one\r\nline two\n")
+        self.assertEqual(self.fs.size("mirror/a"), len("line one\r\nline two\n") + len("\udcff\udcfe\x00raw"))
+        self.assertEqual(self.fs.get_size(), self.fs.size("mirror"))
+        self.assertIn("blob.bin", self.fs.ls(recurse=True))
+        self.fs.touch("mirror/a/b/new.txt", content="x")  # Imported directories behave like any other
+        self.assertEqual(self.fs.size("mirror/a/b"), 7)
+
+        with self.assertRaises(DuplicateNameError):
+            self.fs.import_tree(self.source, "mirror")
+        with self.assertRaises(NotADirectoryError):
+            self.fs.import_tree(self.source, "mirror/top.txt")
+
+    def test_export_round_trips_bytes(self):
+        self.fs.import_tree(self.source)
+        target = os.path.join(self.tmp.name, "target")
+        self.assertEqual(self.fs.export_tree(target), 6)
+        with open(os.path.join(target, "a", "b", "blob.bin"), "rb") as host_file:
+            self.assertEqual(host_file.read(), b"\xff\xfe\x00raw")
+        with open(os.path.join(target, "a", "notes.txt"), "rb") as host_file:
+            self.assertEqual(host_file.read(), b"line one\r\nline two\n")
+        self.assertTrue(os.path.isdir(os.path.join(target, "empty")))
+
+    def test_non_utf8_files_save_and_journal(self):
+        with open(os.path.join(os.fsencode(self.source), b"caf\xe9"), "wb") as host_file:
+            host_file.write(b"caf\xe9")
+        image_path = os.path.join(self.tmp.name, "tree.img")
+        journal = Journal(os.path.join(self.tmp.name, "tree.wal"), fsync=False)
+        self.fs.attach_journal(journal, checkpoint_path=image_path)
+        self.assertEqual(self.fs.import_tree(self.source), 7)  # Checkpoints the imported tree
+        content = self.fs.read("caf\udce9")
+        self.fs.touch("copy", content=content)
+        self.fs.write("copy", content)
+        journal.close()
+
+        fs = FileSystem.load(image_path)
+        self.assertEqual(fs.attach_journal(Journal(journal.path, fsync=False)), 2)
+        self.assertEqual(fs.read("caf\udce9"), "caf\udce9")
+        self.assertEqual(fs.read("copy"), content * 2)
+        self.assertEqual(ArrayFileSystem.load(image_path).read("caf\udce9"), "caf\udce9")
+        target = os.path.join(self.tmp.name, "target")
+        fs.export_tree(target)
+        with open(os.path.join(os.fsencode(target), b"copy"), "rb") as host_file:
+            self.assertEqual(host_file.read(), b"caf\xe9caf\xe9")
+
+    def test_invalid_host_names_import_nothing(self):
+        self._write("a/b/bad:name.txt", b"x")
+        self.fs.mkdir("mirror")
+        with self.assertRaises(InvalidNameError) as context:
+            self.fs.import_tree(self.source, "mirror")
+        self.assertIn("bad:name.txt", str(context.exception))
+        self.assertEqual(self.fs.ls(recurse=True), "~/\n└──  mirror/\n")
+
+    def test_export_writes_in_batches(self):
+        self.fs.mkdir("many")
+        for i in range(1000):
+            self.fs.touch(f"many/f{i}", content=str(i))
+        target = os.path.join(self.tmp.name, "target")
+        self.assertEqual(self.fs.export_tree(target, workers=2), 1001)
+        self.assertEqual(len(os.listdir(os.path.join(target, "many"))), 1000)
+        with open(os.path.join(target, "many", "f999")) as host_file:
+            self.assertEqual(host_file.read(), "999")
+
+    def test_concurrent_import_and_export(self):
+        fs = ConcurrentFileSystem()
+        fs.mkdir("mirror")
+        self.assertEqual(fs.import_tree(self.source, "mirror"), 6)
+        self.assertEqual(fs.size("mirror"), fs.get_size())
+        with self.assertRaises(DuplicateNameError):
+            fs.import_tree(self.source, "mirror")
+        target = os.path.join(self.tmp.name, "target")
+        self.assertEqual(fs.export_tree(target, "mirror/a"), 3)
+        self.assertEqual(sorted(os.listdir(target)), ["b", "notes.txt"])
+
+if __name__ == "__main__":
+    unittest.main()
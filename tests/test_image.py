@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from src.file_system.filesystem import FileSystem
+from src.file_system.exceptions import FileSystemError
+from src.file_system.image import ImageDirectory, ImageFile
+
+class TestImage(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "fs.img")
+        self.fs = FileSystem()
+        self.fs.mkdir("a/b/c", "empty")
+        self.fs.touch("a/b/notes.txt", content="héllo wörld")
+        self.fs.touch("a/config.json", content="{}")
+        self.fs.save(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        loaded = FileSystem.load(self.path)
+        self.assertEqual(loaded.ls(recurse=True), self.fs.ls(recurse=True))
+        self.assertEqual(loaded.read("a/b/notes.txt"), "héllo wörld")
+        self.assertEqual(loaded.get_size(), self.fs.get_size())
+        self.assertEqual(loaded.size("a/b"), len("héllo wörld"))
+
+    def test_loads_lazily(self):
+        loaded = FileSystem.load(self.path)
+        self.assertIsInstance(loaded.root, ImageDirectory)
+        self.assertFalse(loaded.root.children_loaded)
+        a = loaded.root.find_child("a")
+        self.assertTrue(loaded.root.children_loaded)
+        self.assertFalse(a.children_loaded)
+
+        notes = loaded.root.find_child("a").find_child("b").find_child("notes.txt")
+        self.assertIsInstance(notes, ImageFile)
+        self.assertEqual(notes.size, len("héllo wörld"))
+        self.assertIsNotNone(notes._image)  # Size did not decode the content
+        self.assertEqual(notes.content, "héllo wörld")
+
+    def test_mutate_and_save_over_loaded_image(self):
+        loaded = FileSystem.load(self.path)
+        loaded.write("a/b/notes.txt", content="!")
+        loaded.mkdir("a/new")
+        loaded.del_("empty", recurse=True)
+        loaded.save(self.path)
+
+        reloaded = FileSystem.load(self.path)
+        self.assertEqual(reloaded.read("a/b/notes.txt"), "héllo wörld!")
+        self.assertEqual(reloaded.read("a/config.json"), "{}")
+        self.assertIsNotNone(reloaded.root.find_child("a").find_child("new"))
+        self.assertIsNone(reloaded.root.find_child("empty"))
+        self.assertEqual(reloaded.get_size(), self.fs.get_size() + 1)
+
+    def test_failed_save_leaves_no_temporary_file(self):
+        self.fs.touch("bad.txt", content="\ud800")  # A lone surrogate cannot be encoded
+        with self.assertRaises(UnicodeEncodeError):
+            self.fs.save(self.path)
+        self.assertEqual(os.listdir(self.tmp.name), ["fs.img"])
+        self.assertEqual(FileSystem.load(self.path).read("a/config.json"), "{}")
+
+    def test_rejects_other_files(self):
+        bogus = os.path.join(self.tmp.name, "bogus.img")
+        with open(bogus, "wb") as output:
+            output.write(b"not an image")
+        with self.assertRaises(FileSystemError):
+            FileSystem.load(bogus)
+
+if __name__ == "__main__":
+    unittest.main()
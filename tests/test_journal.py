@@ -0,0 +1,119 @@
+import os
+import tempfile
+import unittest
+from src.file_system.filesystem import FileSystem
+from src.file_system.journal import Journal
+
+class TestJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.journal_path = os.path.join(self.tmp.name, "fs.journal")
+        self.image_path = os.path.join(self.tmp.name, "fs.img")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open(self, **kwargs):
+        fs = FileSystem.load(self.image_path) if os.path.exists(self.image_path) else FileSystem()
+        journal = Journal(self.journal_path, fsync=False, **kwargs)
+        replayed = fs.attach_journal(journal, checkpoint_path=self.image_path)
+        return fs, journal, replayed
+
+    def populate(self, fs):
+        fs.mkdir("a/b", "c")
+        fs.cd("a")
+        fs.touch("b/log.txt", content="one")
+        fs.write("b/log.txt", content=",two")
+        fs.write("~/a/b/log.txt", content=",three")
+        fs.touch("gone.txt")
+        fs.del_("gone.txt")
+        fs.del_("~/c", recurse=True)
+        fs.cd("..")
+
+    def test_replay(self):
+        fs, journal, _ = self.open()
+        self.populate(fs)
+        journal.close()
+
+        restored, journal, replayed = self.open()
+        self.assertEqual(replayed, 8)
+        self.assertEqual(restored.read("a/b/log.txt"), "one,two,three")
+        self.assertEqual(restored.ls(recurse=True), fs.ls(recurse=True))
+        journal.close()
+
+    def test_group_commit(self):
+        fs, journal, _ = self.open(group_commit_ops=3)
+        fs.mkdir("x")
+        fs.mkdir("y")
+        self.assertEqual(os.path.getsize(self.journal_path), 0)  # Still buffered
+        fs.mkdir("z")
+        self.assertGreater(os.path.getsize(self.journal_path), 0)
+        self.assertEqual(journal.commits, 1)
+        journal.close()
+
+    def test_torn_record_is_dropped(self):
+        fs, journal, _ = self.open()
+        fs.mkdir("kept")
+        fs.mkdir("torn")
+        journal.close()
+        with open(self.journal_path, "r+b") as raw:
+            raw.truncate(os.path.getsize(self.journal_path) - 3)
+
+        restored, journal, replayed = self.open()
+        self.assertEqual(replayed, 1)
+        self.assertIsNotNone(restored.root.find_child("kept"))
+        self.assertIsNone(restored.root.find_child("torn"))
+        restored.mkdir("after")
+        journal.close()
+        self.assertEqual(self.open()[2], 2)
+
+    def test_checkpoint_truncates_and_bounds_replay(self):
+        fs, journal, _ = self.open()
+        self.populate(fs)
+        fs.checkpoint()
+        self.assertEqual(os.path.getsize(self.journal_path), 0)
+        fs.write("a/b/log.txt", content=",four")
+        journal.close()
+
+        restored, journal, replayed = self.open()
+        self.assertEqual(replayed, 1)
+        self.assertEqual(restored.read("a/b/log.txt"), "one,two,three,four")
+        journal.close()
+
+    def test_checkpoint_is_idempotent_after_crash(self):
+        fs, journal, _ = self.open()
+        fs.touch("log.txt", content="a")
+        fs.write("log.txt", content="b")
+        journal.commit()
+        fs.save(self.image_path)  # Crash before the journal was truncated
+        journal.close()
+
+        restored, journal, replayed = self.open()
+        self.assertEqual(replayed, 0)
+        self.assertEqual(restored.read("log.txt"), "ab")
+        journal.close()
+
+    def test_automatic_checkpoint(self):
+        fs, journal, _ = self.open(group_commit_ops=1)
+        fs._checkpoint_every = 3
+        for name in ("x", "y", "z", "w"):
+            fs.mkdir(name)
+        self.assertTrue(os.path.exists(self.image_path))
+        journal.close()
+        restored, journal, replayed = self.open()
+        self.assertEqual(replayed, 1)
+        self.assertEqual(restored.root.count, 4)
+        journal.close()
+
+    def test_timed_group_commit(self):
+        fs, journal, _ = self.open(group_commit_ops=1000, group_commit_ms=5)
+        fs.mkdir("x")
+        for _ in range(200):
+            if os.path.getsize(self.journal_path):
+                break
+            journal._closed.wait(0.01)
+        self.assertGreater(os.path.getsize(self.journal_path), 0)
+        journal.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import threading
+import unittest
+from src.file_system.filesystem import FileSystem
+from src.file_system.concurrent_filesystem import ConcurrentFileSystem
+from src.file_system.exceptions import NotADirectoryError
+from src.file_system.name_index import NameIndex, _literal_runs
+
+class TestNameIndex(unittest.TestCase):
+    def setUp(self):
+        self.fs = FileSystem()
+        self.fs.mkdir("etc/app", "home/alice/src", "home/bob")
+        self.fs.touch("etc/app/config.json", "home/alice/config.json", "home/alice/src/main.py",
+                      "home/alice/src/util.py", "home/bob/notes.txt")
+
+    def test_exact_and_glob(self):
+        self.assertEqual(self.fs.find("config.json"), ["~/etc/app/config.json", "~/home/alice/config.json"])
+        self.assertEqual(self.fs.find("*.py"), ["~/home/alice/src/main.py", "~/home/alice/src/util.py"])
+        self.assertEqual(self.fs.find("[!c]*.???", "home"), ["~/home/bob/notes.txt"])
+        self.assertEqual(self.fs.find("a*"), ["~/etc/app", "~/home/alice"])
+        self.assertEqual(self.fs.find("CONFIG.json"), [])
+        self.assertEqual(self.fs.find("config.json", "home/alice/src"), [])
+        with self.assertRaises(NotADirectoryError):
+            self.fs.find("x", "home/bob/notes.txt")
+
+    def test_tracks_changes(self):
+        self.fs.find("x")  # Builds the index
+        self.fs.touch("home/bob/config.json")
+        self.fs.del_("home/alice", recurse=True)
+        self.fs.root.find_child("etc").find_child("app").rename("service")
+        self.assertEqual(self.fs.find("config.json"), ["~/etc/service/config.json", "~/home/bob/config.json"])
+        self.assertEqual(self.fs.find("*.py"), [])
+        self.assertEqual(self.fs.find("app"), [])
+
+        self.fs.reclaim()
+        self.assertEqual(self.fs.names.stats(), {'names': 6, 'nodes': 7, 'trigrams': 25})
+
+    def test_snapshots_and_images(self):
+        self.fs.find("x")
+        snapshot = self.fs.snapshot()
+        self.fs.write("home/alice/src/main.py", "print()")  # Copies the file and its ancestors
+        self.assertEqual(self.fs.find("main.py"), ["~/home/alice/src/main.py"])
+        self.assertIs(self.fs.names.match("main.py")[0], self.fs.root.find_child("home").find_child("alice")
+                      .find_child("src").find_child("main.py"))
+        self.assertEqual(snapshot.read("home/alice/src/main.py"), "")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tree.img")
+            self.fs.save(path)
+            loaded = FileSystem.load(path)
+            self.assertEqual(loaded.find("*.py"), self.fs.find("*.py"))
+            loaded.mkdir("home/alice/src/lib")
+            self.assertEqual(loaded.find("lib"), ["~/home/alice/src/lib"])
+
+    def test_literal_runs(self):
+        self.assertEqual(_literal_runs("config.json"), ["config.json"])
+        self.assertEqual(_literal_runs("*.py"), ["", ".py"])
+        self.assertEqual(_literal_runs("ab[!]x]cd?e*"), ["ab", "cd", "e", ""])
+        self.assertEqual(_literal_runs("a[bc"), ["a[bc"])
+
+    def test_glob_only_matches_candidate_names(self):
+        index = NameIndex()
+        for name in ("report.txt", "readme.md", "rep", "notes.txt"):  # Nodes only need a name
+            index.add(_Named(name))
+        self.assertEqual(sorted(index._candidates("*.txt")), ["notes.txt", "report.txt"])
+        self.assertEqual(sorted(index._candidates("re*")), ["readme.md", "rep", "report.txt"])
+        self.assertEqual(sorted(node.name for node in index.match("re?")), ["rep"])
+
+    def test_concurrent_index(self):
+        fs = ConcurrentFileSystem()
+        fs.mkdir(*(f"d{i}" for i in range(4)))
+        fs.find("x")
+
+        def worker(i):
+            for j in range(50):
+                fs.touch(f"d{i}/f{j}.log")
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(fs.find("*.log")), 200)
+        self.assertEqual(fs.find("f7.log", "d2"), ["~/d2/f7.log"])
+
+class _Named:
+    def __init__(self, name):
+        self.name = name
+
+if __name__ == "__main__":
+    unittest.main()
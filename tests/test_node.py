@@ -1,5 +1,4 @@
 import unittest
-from datetime import datetime, timedelta
 from src.file_system.node import FSNode
 from src.file_system.validation import InvalidNameError
 from time import sleep
@@ -15,7 +14,7 @@ class TestFSNode(unittest.TestCase):
         """Test that FSNode initializes correctly."""
         self.assertEqual(self.node.name, "test_node")
         self.assertEqual(self.node.entity_type, "FSNode")
-        self.assertIsInstance(self.node.ctime, datetime)
+        self.assertIsInstance(self.node.ctime, int)
         self.assertEqual(self.node.ctime, self.node.mtime)
 
     def test_str_representation(self):
@@ -28,7 +27,13 @@ class TestFSNode(unittest.TestCase):
         sleep(0.01)
         self.node.modify()
         self.assertGreater(self.node.mtime, old_mtime)
-        self.assertLess(self.node.mtime - old_mtime, timedelta(seconds=1))
+        self.assertLess(self.node.mtime - old_mtime, 10 ** 9)  # Nanoseconds
+
+    def test_slots(self):
+        """Test that nodes carry no per-instance __dict__."""
+        self.assertFalse(hasattr(self.node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.node.missing_attribute
 
     def test_validate_valid_name(self):
         """Test that validate() accepts valid names."""
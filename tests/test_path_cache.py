@@ -0,0 +1,62 @@
+import unittest
+from src.file_system.filesystem import FileSystem
+from src.file_system.path_resolver import PathResolver
+from src.file_system.exceptions import NotADirectoryError, NotFoundError
+
+class TestPathCache(unittest.TestCase):
+    def setUp(self):
+        self.fs = FileSystem(path_cache_size=2)
+        self.fs.mkdir("a/b/c")
+        self.fs.touch("a/b/c/file.txt", content="data")
+
+    def test_hits_and_misses(self):
+        first = PathResolver.resolve(self.fs, "~/a/b/c/file.txt")
+        second = PathResolver.resolve(self.fs, "~/a/b/c/file.txt")
+        self.assertIs(first, second)
+        stats = self.fs.path_cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertGreaterEqual(stats['misses'], 1)
+
+    def test_invalidated_by_remove(self):
+        PathResolver.resolve(self.fs, "~/a/b/c/file.txt")
+        self.fs.del_("a/b/c/file.txt")
+        with self.assertRaises(NotFoundError):
+            PathResolver.resolve(self.fs, "~/a/b/c/file.txt")
+        self.assertEqual(self.fs.path_cache.stats()['stale'], 1)
+
+    def test_invalidated_by_rename(self):
+        b = PathResolver.resolve(self.fs, "~/a/b")
+        b.rename("renamed")
+        with self.assertRaises(NotFoundError):
+            PathResolver.resolve(self.fs, "~/a/b")
+        self.assertIs(PathResolver.resolve(self.fs, "~/a/renamed"), b)
+
+    def test_keyed_by_start_directory(self):
+        self.fs.mkdir("b")
+        self.fs.cd("a")
+        nested = PathResolver.resolve(self.fs, "b")
+        self.fs.cd("..")
+        top = PathResolver.resolve(self.fs, "b")
+        self.assertIsNot(nested, top)
+
+    def test_equivalent_spellings_share_an_entry(self):
+        node = PathResolver.resolve(self.fs, "~/a/b/c/file.txt")
+        self.assertIs(PathResolver.resolve(self.fs, "~/a/./b//c/file.txt"), node)
+        self.assertIs(PathResolver.resolve(self.fs, "./a/b/c/./file.txt"), node)
+        self.assertEqual(self.fs.path_cache.stats()['hits'], 1)
+        self.assertEqual(self.fs.path_cache.stats()['size'], 2)  # The relative path is an entry of its own
+        directory = PathResolver.resolve(self.fs, "~/a//b/")
+        self.assertIs(PathResolver.resolve(self.fs, "~/a/b/"), directory)
+        self.assertEqual(self.fs.path_cache.stats()['hits'], 2)
+        with self.assertRaises(NotADirectoryError):
+            PathResolver.resolve(self.fs, "~/a/b/c/file.txt/.")
+
+    def test_lru_eviction(self):
+        for path in ("~/a", "~/a/b", "~/a/b/c"):
+            PathResolver.resolve(self.fs, path)
+        stats = self.fs.path_cache.stats()
+        self.assertEqual(stats['size'], 2)
+        self.assertGreaterEqual(stats['evictions'], 1)
+
+if __name__ == "__main__":
+    unittest.main()
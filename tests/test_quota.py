@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+from src.file_system.filesystem import FileSystem
+from src.file_system.concurrent_filesystem import ConcurrentFileSystem
+from src.file_system.exceptions import QuotaExceededError, NotADirectoryError
+
+class TestQuota(unittest.TestCase):
+    def setUp(self):
+        self.fs = FileSystem()
+        self.fs.mkdir("home/alice", "home/bob")
+
+    def tearDown(self):
+        for path in ("home", "home/alice"):
+            self.fs.set_quota(path)
+        self.assertEqual(self.fs.ledger.quotas, 0)
+
+    def test_byte_quota_covers_subtree(self):
+        self.fs.set_quota("home", max_bytes=10)
+        self.fs.touch("home/alice/a.txt", content="12345")
+        self.fs.touch("home/bob/b.txt", content="1234")
+        with self.assertRaises(QuotaExceededError):
+            self.fs.write("home/alice/a.txt", "xx")
+        with self.assertRaises(QuotaExceededError):
+            self.fs.touch("home/bob/c.txt", content="xx")
+        # Nothing changed on the way to the failing ancestor
+        self.assertEqual(self.fs.read("home/alice/a.txt"), "12345")
+        self.assertIsNone(self.fs.root.find_child("home").find_child("bob").find_child("c.txt"))
+        self.assertEqual((self.fs.size("home/alice"), self.fs.size("home"), self.fs.get_size()), (5, 9, 9))
+
+        self.fs.write("home/alice/a.txt", "1", overwrite=True)  # Shrinking is always allowed
+        self.fs.write("home/alice/a.txt", "x")
+        self.assertEqual(self.fs.size("home"), 6)
+
+    def test_entry_quota(self):
+        self.fs.set_quota("home/alice", max_entries=2)
+        self.fs.touch("home/alice/a", "home/alice/b")
+        with self.assertRaises(QuotaExceededError):
+            self.fs.mkdir("home/alice/c")
+        self.fs.del_("home/alice/a")
+        self.fs.mkdir("home/alice/c")
+        with self.assertRaises(NotADirectoryError):
+            self.fs.set_quota("home/alice/b", max_entries=1)
+
+    def test_deleted_quotas_stop_counting(self):
+        self.fs.mkdir("home/alice/tmp", "scratch")
+        self.fs.set_quota("home/alice/tmp", max_bytes=10)
+        self.fs.set_quota("scratch", max_entries=1)
+        self.assertEqual(self.fs.ledger.quotas, 2)
+        self.assertEqual(FileSystem().ledger.quotas, 0)
+        self.fs.del_("scratch", recurse=True)
+        self.assertEqual(self.fs.ledger.quotas, 1)
+        self.fs.del_("home/alice", recurse=True)
+        self.fs.reclaim()
+        self.assertEqual(self.fs.ledger.quotas, 0)
+        self.fs.mkdir("home/alice")
+
+    def test_import_is_all_or_nothing(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in "abc":
+                with open(os.path.join(tmp, name), "w") as f:
+                    f.write("x" * 10)
+            os.mkdir(os.path.join(tmp, "d"))
+            self.fs.set_quota("home/bob", max_bytes=15)
+            with self.assertRaises(QuotaExceededError):
+                self.fs.import_tree(tmp, "home/bob")
+            self.fs.set_quota("home/bob", max_entries=3)
+            with self.assertRaises(QuotaExceededError):
+                self.fs.import_tree(tmp, "home/bob")
+            self.fs.set_quota("home/bob")
+        self.assertEqual(self.fs.ls(), "~/\n└──  home/\n")
+        self.assertEqual(self.fs.size("home/bob"), 0)
+        self.assertEqual(self.fs.root.find_child("home").find_child("bob").count, 0)
+
+    def test_deferred_sizes_are_checked_exactly(self):
+        self.fs.set_deferred_sizes(True)
+        try:
+            self.fs.touch("home/alice/a.txt", content="12345")
+            self.fs.set_quota("home", max_bytes=6)
+            with self.assertRaises(QuotaExceededError):
+                self.fs.touch("home/bob/b.txt", content="xx")
+            self.assertEqual(self.fs.size("home"), 5)
+        finally:
+            self.fs.set_deferred_sizes(False)
+
+    def test_concurrent_quota(self):
+        fs = ConcurrentFileSystem()
+        fs.mkdir("d")
+        fs.set_quota("d", max_bytes=3)
+        fs.touch("d/a", content="123")
+        with self.assertRaises(QuotaExceededError):
+            fs.write("d/a", "4")
+        self.assertEqual(fs.size("d"), 3)
+        fs.set_quota("d")
+
+if __name__ == "__main__":
+    unittest.main()
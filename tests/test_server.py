@@ -0,0 +1,102 @@
+import asyncio
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from src.client import Client
+from src.file_system.filesystem import FileSystem
+from src.file_system.exceptions import FileSystemError, RemoteError
+from src.protocol import STATUS_OK, STATUS_ERROR, parse_address
+from src.server import FileSystemServer
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.address = os.path.join(self.tmp.name, "fs.sock")
+        self.fs = FileSystem()
+        self.loop = asyncio.new_event_loop()
+        self.server = self.loop.run_until_complete(FileSystemServer(self.fs).start(self.address))
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        async def shutdown():
+            self.server.close()
+            await self.server.wait_closed()
+            # Let handlers of closed connections finish before the loop stops
+            handlers = asyncio.all_tasks() - {asyncio.current_task()}
+            await asyncio.gather(*handlers, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(timeout=5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        self.tmp.cleanup()
+
+    def test_operations(self):
+        with Client(self.address, timeout=5) as client:
+            client.call("mkdir", paths=["logs"])
+            client.call("touch", paths=["logs/app.log"], content="boot")
+            client.call("write", path="logs/app.log", content="!")
+            self.assertEqual(client.call("read", path="logs/app.log"), "boot!")
+            self.assertEqual(client.call("size", path="logs"), "5")
+            self.assertIn("app.log", client.call("ls", recurse=True))
+            with self.assertRaises(RemoteError) as context:
+                client.call("read", path="missing")
+            self.assertTrue(str(context.exception).startswith("[NotFoundError]"))
+        self.assertEqual(self.fs.read("logs/app.log"), "boot!")
+
+    def test_each_connection_has_its_own_cwd(self):
+        self.fs.mkdir("a", "b")
+        with Client(self.address, timeout=5) as first, Client(self.address, timeout=5) as second:
+            first.call("cd", path="a")
+            second.call("cd", path="b")
+            first.call("touch", paths=["f"])
+            self.assertEqual(first.call("pwd", recurse=True), "~/a")
+            self.assertEqual(second.call("pwd", recurse=True), "~/b")
+        self.assertIsNotNone(self.fs.root.find_child("a").find_child("f"))
+
+    def test_pipelining_keeps_order(self):
+        with Client(self.address, timeout=5) as client:
+            client.PIPELINE_WINDOW = 16
+            requests = [("touch", {"paths": ["f"]})]
+            requests += [("write", {"path": "f", "content": str(i % 10)}) for i in range(100)]
+            requests += [("read", {"path": "f"}), ("bogus", {}), ("size", {"path": "f", "extra": 1})]
+            results = client.pipeline(requests)
+        self.assertEqual(len(results), len(requests))
+        self.assertEqual(results[-3], (STATUS_OK, "0123456789" * 10))
+        self.assertEqual(results[-2][0], STATUS_ERROR)
+        self.assertTrue(results[-1][1].startswith("[BadRequest]"))
+
+    def test_refuses_socket_paths_in_use(self):
+        with self.assertRaises(FileSystemError):
+            asyncio.run(FileSystemServer(FileSystem()).start(self.address))  # The server of setUp listens there
+        with Client(self.address, timeout=5) as client:
+            self.assertEqual(client.call("pwd", recurse=True), "~")
+
+        stale = os.path.join(self.tmp.name, "stale.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as dead:
+            dead.bind(stale)  # Leaves the socket file behind, with nobody listening
+
+        async def start_and_close():
+            server = await FileSystemServer(FileSystem()).start(stale)
+            server.close()
+            await server.wait_closed()
+
+        asyncio.run(start_and_close())
+
+        path = os.path.join(self.tmp.name, "notes.txt")
+        with open(path, "w") as f:
+            f.write("keep")
+        with self.assertRaises(FileSystemError):
+            asyncio.run(FileSystemServer(FileSystem()).start(path))
+        with open(path) as f:
+            self.assertEqual(f.read(), "keep")
+
+    def test_parse_address(self):
+        self.assertEqual(parse_address("127.0.0.1:7000"), ("127.0.0.1", 7000))
+        self.assertEqual(parse_address("/tmp/fs.sock"), "/tmp/fs.sock")
+
+if __name__ == "__main__":
+    unittest.main()
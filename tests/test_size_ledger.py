@@ -0,0 +1,51 @@
+import unittest
+from src.file_system.filesystem import FileSystem
+
+class TestSizeLedger(unittest.TestCase):
+    def setUp(self):
+        self.fs = FileSystem()
+        self.fs.mkdir("a/b/c", "a/d")
+        self.fs.touch("a/b/c/log.txt", "a/d/log.txt")
+
+    def tearDown(self):
+        self.fs.set_deferred_sizes(False)
+
+    def test_batch_coalesces_deltas(self):
+        a = self.fs.root.find_child("a")
+        with self.fs.batch():
+            for _ in range(100):
+                self.fs.write("a/b/c/log.txt", content="xy")
+                self.fs.write("a/d/log.txt", content="z")
+            self.assertEqual(a._size, 0)  # Nothing propagated yet
+            self.assertEqual(len(self.fs.ledger._pending), 2)
+        self.assertFalse(self.fs.ledger.dirty)
+        self.assertEqual(a._size, 300)
+        self.assertEqual(self.fs.get_size(), 300)
+
+    def test_deferred_mode_flushes_on_read(self):
+        self.fs.set_deferred_sizes(True)
+        self.fs.write("a/b/c/log.txt", content="hello")
+        self.assertTrue(self.fs.ledger.dirty)
+        self.assertEqual(self.fs.size("a/b"), 5)
+        self.assertEqual(self.fs.get_size(), 5)
+
+    def test_deferred_mode_is_per_file_system(self):
+        other = FileSystem(deferred_sizes=True)
+        other.touch("log.txt")
+        self.fs.write("a/d/log.txt", content="abc")
+        self.assertFalse(self.fs.ledger.dirty)
+        self.assertEqual(self.fs.root.find_child("a")._size, 3)
+        other.write("log.txt", content="abc")
+        self.assertTrue(other.ledger.dirty)
+        other.set_deferred_sizes(False)
+        self.assertEqual(other.get_size(), 3)
+
+    def test_structural_change_flushes(self):
+        with self.fs.batch():
+            self.fs.write("a/d/log.txt", content="12345")
+            self.fs.del_("a/d/log.txt")
+        self.assertEqual(self.fs.get_size(), 0)
+        self.assertEqual(self.fs.size("a/d"), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+from src.file_system.filesystem import FileSystem
+from src.file_system.exceptions import NotFoundError
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.fs = FileSystem()
+        self.fs.mkdir("logs", "static/css")
+        self.fs.touch("logs/app.log", content="boot\n")
+        self.fs.touch("static/css/site.css", content="body {}")
+        self.snap = self.fs.snapshot()
+
+    def test_view_is_frozen(self):
+        self.fs.write("logs/app.log", content="request\n")
+        self.fs.touch("logs/new.log")
+        self.fs.del_("static", recurse=True)
+        self.fs.mkdir("tmp")
+
+        self.assertEqual(self.snap.read("logs/app.log"), "boot\n")
+        self.assertEqual(self.snap.read("~/static/css/site.css"), "body {}")
+        self.assertNotIn("new.log", self.snap.ls("logs"))
+        self.assertNotIn("tmp", self.snap.ls())
+        self.assertEqual(self.snap.size(), len("boot\n") + len("body {}"))
+
+        self.assertEqual(self.fs.read("logs/app.log"), "boot\nrequest\n")
+        self.assertIsNone(self.fs.root.find_child("static"))
+        self.assertEqual(self.fs.get_size(), len("boot\nrequest\n"))
+
+    def test_unchanged_subtrees_are_shared(self):
+        self.fs.write("logs/app.log", content="request\n")
+        self.assertIsNot(self.fs.root, self.snap.root)
+        self.assertIsNot(self.fs.root.find_child("logs"), self.snap.resolve("logs"))
+        self.assertIs(self.fs.root.find_child("static"), self.snap.resolve("static"))
+
+    def test_file_content_is_shared(self):
+        self.fs.touch("big.log", content="x" * 10000)
+        snap = self.fs.snapshot()
+        self.fs.write("big.log", content="y" * 10000)
+        live_file = self.fs.root.find_child("big.log")
+        frozen_file = snap.resolve("big.log")
+        self.assertIsNot(live_file, frozen_file)
+        self.assertIs(live_file._store._chunks[0], frozen_file._store._chunks[0])  # Content is not copied
+        self.assertEqual(frozen_file.size, 10000)
+        self.assertEqual(live_file.size, 20000)
+
+    def test_live_tree_stays_consistent(self):
+        self.fs.cd("logs")
+        self.fs.write("app.log", content="x")
+        self.assertEqual(self.fs.pwd(recurse=True), "~/logs")
+        self.fs.touch("../static/css/extra.css", content="p {}")
+        self.assertEqual(self.fs.size("~/static"), len("body {}p {}"))
+        self.assertNotIn("extra.css", self.snap.ls("static/css"))
+        self.assertIs(self.fs.root.find_child("static").parent, self.fs.root)
+
+    def test_snapshots_of_snapshots(self):
+        self.fs.write("logs/app.log", content="one\n")
+        second = self.fs.snapshot()
+        self.fs.write("logs/app.log", content="two\n")
+        self.assertEqual(self.snap.read("logs/app.log"), "boot\n")
+        self.assertEqual(second.read("logs/app.log"), "boot\none\n")
+        self.assertEqual(self.fs.read("logs/app.log"), "boot\none\ntwo\n")
+
+    def test_wide_directories_are_copied_by_chunk(self):
+        for i in range(3000):
+            self.fs.touch(f"logs/{i}.log")
+        snap = self.fs.snapshot()
+        frozen = snap.resolve("logs")
+        shared = frozen.find_child("5.log")
+        self.fs.touch("logs/new.log")
+
+        live = self.fs.root.find_child("logs")
+        self.assertIsNot(live, frozen)
+        self.assertIs(live.find_child("5.log"), shared)
+        self.assertIs(shared.parent, frozen)  # Shared children are not re-parented
+        copied = [chunk for chunk in live.children._chunks if not any(chunk is c for c in frozen.children._chunks)]
+        self.assertEqual(len(copied), 1)  # Only the chunk that changed
+        self.assertIs(snap.resolve("logs/5.log"), shared)
+        self.assertNotIn("new.log", snap.ls("logs"))
+
+        self.fs.write("logs/5.log", content="x")  # Reaches the live directory through the stale parent
+        self.fs.del_("logs/6.log")
+        self.assertIs(self.fs.root.find_child("logs"), live)
+        self.assertEqual(self.fs.size("logs"), len("boot\n") + 1)
+        self.assertEqual(snap.read("logs/5.log"), "")
+        self.assertIs(snap.resolve("logs/6.log"), frozen.find_child("6.log"))
+        self.assertEqual(self.fs.ls("logs").count(".log\n"), 3001)
+        self.assertEqual(snap.ls("logs").count(".log\n"), 3001)
+
+    def test_sessions_in_shared_directories(self):
+        self.fs.cd("static/css")
+        self.fs.touch("~/static/one")  # Copies static, but not css
+        second = self.fs.snapshot()
+        self.fs.touch("~/static/two")
+        self.assertEqual(self.fs.pwd(recurse=True), "~/static/css")
+        self.fs.del_("site.css")
+        self.fs.cd("..")
+        self.fs.touch("three")
+        self.assertEqual(self.fs.ls("~/static", sort=True), self.fs.ls(sort=True))
+        self.assertEqual([line.split()[-1] for line in self.fs.ls(sort=True).splitlines()[1:]],
+                         ["css/", "one", "three", "two"])
+        self.assertEqual(second.ls("static/css"), self.snap.ls("static/css"))
+        self.assertNotIn("two", second.ls("static"))
+        self.assertEqual(self.fs.get_size(), len("boot\n"))
+
+    def test_resolve_errors(self):
+        with self.assertRaises(NotFoundError):
+            self.snap.resolve("missing")
+        self.assertIs(self.snap.resolve("logs/.."), self.snap.root)
+
+if __name__ == "__main__":
+    unittest.main()
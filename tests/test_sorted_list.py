@@ -0,0 +1,99 @@
+import random
+import unittest
+from src.file_system.sorted_list.sorted_list import SortedList
+from src.file_system.sorted_list.sorted_map import SortedMap
+
+class TestSortedList(unittest.TestCase):
+    def setUp(self):
+        self.list = SortedList('pear', 'apple', 'fig', 'banana', 'apricot', load=2)
+
+    def test_sorted(self):
+        self.assertEqual(list(self.list), ['apple', 'apricot', 'banana', 'fig', 'pear'])
+        self.assertEqual(len(self.list), 5)
+
+    def test_remove(self):
+        self.assertTrue(self.list.remove('fig'))
+        self.assertFalse(self.list.remove('fig'))
+        self.assertFalse(self.list.remove('zzz'))
+        self.assertNotIn('fig', self.list)
+        self.assertEqual(len(self.list), 4)
+
+    def test_irange(self):
+        self.assertEqual(list(self.list.irange('apricot', 'fig')), ['apricot', 'banana'])
+        self.assertEqual(list(self.list.irange('apricot', 'fig', inclusive=(False, True))), ['banana', 'fig'])
+        self.assertEqual(list(self.list.irange('b')), ['banana', 'fig', 'pear'])
+        self.assertEqual(list(self.list.irange('q')), [])
+
+    def test_iprefix(self):
+        self.assertEqual(list(self.list.iprefix('ap')), ['apple', 'apricot'])
+        self.assertEqual(list(self.list.iprefix('x')), [])
+
+    def test_iselect(self):
+        self.assertEqual(list(self.list.iselect()), list(self.list))
+        self.assertEqual(list(self.list.iselect('ap')), ['apple', 'apricot'])
+        self.assertEqual(list(self.list.iselect('ap', after='apple')), ['apricot'])
+        self.assertEqual(list(self.list.iselect(after='banana')), ['fig', 'pear'])
+        self.assertEqual(list(self.list.iselect('b', after='c')), [])
+
+    def test_random_against_sorted(self):
+        keys = random.sample(range(10000), 2000)
+        sorted_list = SortedList(load=8)
+        for key in keys:
+            sorted_list.add(key)
+        for key in keys[::3]:
+            self.assertTrue(sorted_list.remove(key))
+        expected = sorted(set(keys) - set(keys[::3]))
+        self.assertEqual(list(sorted_list), expected)
+        self.assertEqual(list(sorted_list.irange(5000, 6000)), [k for k in expected if 5000 <= k < 6000])
+
+class TestSortedMap(unittest.TestCase):
+    def setUp(self):
+        self.map = SortedMap([('pear', 5), ('apple', 1), ('fig', 4), ('banana', 3), ('apricot', 2)], load=2)
+
+    def test_sorted(self):
+        self.assertEqual(list(self.map), ['apple', 'apricot', 'banana', 'fig', 'pear'])
+        self.assertEqual(list(self.map.values()), [1, 2, 3, 4, 5])
+        self.assertEqual(list(self.map.iprefix('ap')), ['apple', 'apricot'])
+        self.assertEqual((self.map.get('fig'), self.map.get('kiwi')), (4, None))
+        self.assertEqual(self.map.max_key(), 'pear')
+
+    def test_add_and_pop(self):
+        self.map.add('fig', 40)
+        self.map.add('kiwi', 6)
+        self.assertEqual(len(self.map), 6)
+        self.assertEqual(self.map.pop('fig'), 40)
+        self.assertFalse(self.map.remove('fig'))
+        self.assertIsNone(self.map.pop('fig', None))
+        with self.assertRaises(KeyError):
+            self.map.pop('zzz')
+        self.assertEqual(list(self.map.items()), [('apple', 1), ('apricot', 2), ('banana', 3), ('kiwi', 6), ('pear', 5)])
+
+    def test_copies_are_independent(self):
+        clone = self.map.copy()
+        self.assertIs(clone._chunks[0], self.map._chunks[0])  # Nothing is copied up front
+        clone.add('apple', 10)
+        clone.pop('pear')
+        self.map.add('cherry', 7)
+        self.assertEqual(dict(self.map.items()), {'apple': 1, 'apricot': 2, 'banana': 3, 'cherry': 7, 'fig': 4, 'pear': 5})
+        self.assertEqual(dict(clone.items()), {'apple': 10, 'apricot': 2, 'banana': 3, 'fig': 4})
+        self.assertIsNot(clone._chunks[0], self.map._chunks[0])
+
+    def test_random_against_dict(self):
+        expected = {}
+        sorted_map = SortedMap(load=8)
+        copies = []
+        for step in range(3000):
+            key = random.randrange(500)
+            if random.random() < 0.6:
+                sorted_map.add(key, step)
+                expected[key] = step
+            else:
+                self.assertEqual(sorted_map.pop(key, None), expected.pop(key, None))
+            if step % 500 == 0:
+                copies.append((sorted_map.copy(), dict(expected)))
+        self.assertEqual(list(sorted_map.items()), sorted(expected.items()))
+        for copy, frozen in copies:
+            self.assertEqual(list(copy.items()), sorted(frozen.items()))
+
+if __name__ == '__main__':
+    unittest.main()
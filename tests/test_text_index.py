@@ -0,0 +1,117 @@
+import os
+import tempfile
+import threading
+import unittest
+from src.file_system.filesystem import FileSystem
+from src.file_system.concurrent_filesystem import ConcurrentFileSystem
+from src.file_system.exceptions import FileSystemError, NotADirectoryError
+from src.file_system.text_index import matches, parse_query, tokenize
+
+class TestTextIndex(unittest.TestCase):
+    def setUp(self):
+        self.fs = FileSystem(search_budget=1000)
+        self.fs.mkdir("logs/old", "docs")
+        self.fs.touch("logs/app.log", content="ERROR: disk full\nretrying")
+        self.fs.touch("logs/old/app.log", content="disk check passed")
+        self.fs.touch("docs/readme.md", content="Full disk? See the timeout_ms setting.")
+
+    def test_queries(self):
+        self.assertEqual(self.fs.search("disk"), ["~/docs/readme.md", "~/logs/app.log", "~/logs/old/app.log"])
+        self.assertEqual(self.fs.search('"disk full"'), ["~/logs/app.log"])
+        self.assertEqual(self.fs.search("full disk"), ["~/docs/readme.md", "~/logs/app.log"])
+        self.assertEqual(self.fs.search("time*"), ["~/docs/readme.md"])
+        self.assertEqual(self.fs.search('"check pass"*'), ["~/logs/old/app.log"])
+        self.assertEqual(self.fs.search("disk", "logs/old"), ["~/logs/old/app.log"])
+        self.assertEqual(self.fs.search("missing"), [])
+        with self.assertRaises(FileSystemError):
+            self.fs.search('"" *')
+        with self.assertRaises(NotADirectoryError):
+            self.fs.search("disk", "docs/readme.md")
+
+    def test_tracks_writes_and_deletes(self):
+        self.fs.search("disk")  # Builds the index
+        self.fs.write("logs/app.log", "ing")  # Extends "retrying"
+        self.fs.write("docs/readme.md", "nothing here", overwrite=True)
+        self.fs.touch("docs/new.md", content="disk")
+        self.fs.del_("logs/old", recurse=True)
+        self.assertEqual(self.fs.search("disk"), ["~/docs/new.md", "~/logs/app.log"])
+        self.assertEqual(self.fs.search("retryinging"), ["~/logs/app.log"])
+        self.assertEqual(self.fs.search("retrying"), [])
+        self.assertEqual(self.fs.search("timeout_ms"), [])
+
+        self.fs.reclaim()
+        self.assertEqual(self.fs.search_stats()['postings'], 7)
+
+    def test_budget_falls_back_to_scanning(self):
+        fs = FileSystem(search_budget=4)
+        fs.mkdir("small", "big")
+        fs.touch("small/a", content="one two")
+        fs.touch("big/b", content="one two three four five")
+        self.assertEqual(fs.search("one"), ["~/big/b", "~/small/a"])
+        stats = fs.search_stats()
+        self.assertEqual((stats['unindexed_directories'], stats['postings']), (1, 2))
+        fs.touch("big/c", content="two")
+        fs.write("small/a", " three")
+        self.assertEqual(fs.search("two three"), ["~/big/b", "~/small/a"])
+        self.assertEqual(fs.search("two", "big"), ["~/big/b", "~/big/c"])
+
+    def test_snapshots_and_images(self):
+        self.fs.search("disk")
+        snapshot = self.fs.snapshot()
+        self.fs.write("logs/app.log", "healthy", overwrite=True)  # Copies the file and its ancestors
+        self.assertEqual(self.fs.search("disk full"), ["~/docs/readme.md"])
+        self.assertEqual(self.fs.search("healthy"), ["~/logs/app.log"])
+        self.assertEqual(snapshot.read("logs/app.log"), "ERROR: disk full\nretrying")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tree.img")
+            self.fs.save(path)
+            loaded = FileSystem.load(path, search_budget=1000)
+            self.assertEqual(loaded.search("disk"), ["~/docs/readme.md", "~/logs/old/app.log"])
+            self.assertEqual(self.fs.search("disk"), ["~/docs/readme.md", "~/logs/old/app.log"])
+
+    def test_appends_that_lowercase_into_several_tokens(self):
+        fs = FileSystem(search_budget=1000)
+        fs.touch("f", content="hello abcİ")
+        self.assertEqual(fs.search("abci"), ["~/f"])
+        fs.write("f", "x")
+        self.assertEqual(fs.search("x"), ["~/f"])
+        fs.write("f", content="done", overwrite=True)
+        self.assertEqual(fs.search("abci"), [])
+        self.assertEqual(fs.search_stats()["postings"], 1)
+        self.assertEqual(fs.size("f"), fs.get_size())
+
+    def test_without_index_scans(self):
+        fs = FileSystem()
+        fs.touch("a", content="Disk full")
+        self.assertEqual(fs.search('"disk full"'), ["~/a"])
+        with self.assertRaises(FileSystemError):
+            fs.search_stats()
+
+    def test_concurrent_index(self):
+        fs = ConcurrentFileSystem(search_budget=1000)
+        fs.mkdir(*(f"d{i}" for i in range(4)))
+        fs.search("x")
+
+        def worker(i):
+            for j in range(25):
+                fs.touch(f"d{i}/f{j}", content=f"worker{i} item{j}")
+                fs.write(f"d{i}/f{j}", " done")
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(fs.search("done")), 100)
+        self.assertEqual(fs.search("worker2 item7"), ["~/d2/f7"])
+
+    def test_parse_and_match(self):
+        self.assertEqual(tokenize("Hello, World_1!"), ["hello", "world_1"])
+        self.assertEqual(parse_query('a.b "c d"* e* *'), [(["a", "b"], False), (["c", "d"], True), (["e"], True)])
+        tokens = tokenize("the quick brown fox")
+        self.assertTrue(matches(parse_query('"quick br"* fox'), tokens))
+        self.assertFalse(matches(parse_query('"quick fox"'), tokens))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import sys
+import unittest
+from src.file_system.filesystem import FileSystem
+from src.file_system.tree_renderer import iter_tree_lines
+
+class TestTreeRenderer(unittest.TestCase):
+    def setUp(self):
+        self.fs = FileSystem()
+        self.fs.mkdir("a/b/c", "d")
+        self.fs.touch("a/file1.txt", "a/b/file2.txt")
+
+    def test_streams_lines(self):
+        lines = iter_tree_lines(self.fs.root, recurse=True)
+        self.assertEqual(next(lines), "~/\n")
+        self.assertIn("a/", next(lines))
+        self.assertEqual(len(list(lines)), 5)
+
+    def test_max_depth(self):
+        output = self.fs.ls(recurse=True, max_depth=2)
+        self.assertIn("b/", output)
+        self.assertIn("file1.txt", output)
+        self.assertNotIn("c/", output)
+        self.assertNotIn("file2.txt", output)
+
+    def test_max_entries(self):
+        lines = list(self.fs.iter_ls(recurse=True, max_entries=2))
+        self.assertEqual(len(lines), 4)  # Header, two entries and the truncation notice
+        self.assertIn("truncated", lines[-1])
+
+    def test_deeper_than_recursion_limit(self):
+        depth = sys.getrecursionlimit() + 100
+        for _ in range(depth):
+            self.fs.mkdir("x")
+            self.fs.cd("x")
+        self.fs.cd("~")
+        lines = sum(1 for _ in self.fs.iter_ls(recurse=True))
+        self.assertEqual(lines, 1 + 6 + depth)
+
+if __name__ == "__main__":
+    unittest.main()